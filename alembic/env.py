@@ -9,8 +9,10 @@ from app.models import *  # noqa: F403
 from app.db_triggers import (
     exercise_plan_id_validation_func,
     exercise_set_plan_id_validation_func,
-    exercise_plan_id_validation_trigger,
-    exercise_set_plan_id_validation_trigger,
+    exercise_plan_id_insert_validation_trigger,
+    exercise_plan_id_update_validation_trigger,
+    exercise_set_plan_id_insert_validation_trigger,
+    exercise_set_plan_id_update_validation_trigger,
 )
 from alembic import context
 
@@ -18,8 +20,10 @@ register_entities(
     [
         exercise_plan_id_validation_func,
         exercise_set_plan_id_validation_func,
-        exercise_plan_id_validation_trigger,
-        exercise_set_plan_id_validation_trigger,
+        exercise_plan_id_insert_validation_trigger,
+        exercise_plan_id_update_validation_trigger,
+        exercise_set_plan_id_insert_validation_trigger,
+        exercise_set_plan_id_update_validation_trigger,
     ]
 )
 # this is the Alembic Config object, which provides
@@ -0,0 +1,104 @@
+"""sparse_plan_positions
+
+Revision ID: 9c2f4e7a1d36
+Revises: e4c71a9b3d52
+Create Date: 2026-10-17 19:12:08.402113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c2f4e7a1d36'
+down_revision: Union[str, None] = 'e4c71a9b3d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# keep in line with app.models.POSITION_GAP
+POSITION_GAP = 1024
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('exercise_plans', sa.Column('position', sa.BigInteger(), nullable=True))
+    op.add_column('exercise_set_plans', sa.Column('position', sa.BigInteger(), nullable=True))
+
+    # space the existing dense orders POSITION_GAP apart (ties broken by id)
+    op.execute(
+        f"""
+        UPDATE exercise_plans AS ep
+        SET position = ranked.position
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY workout_plan_id ORDER BY order_in_plan, id
+            ) * {POSITION_GAP} AS position
+            FROM exercise_plans
+        ) AS ranked
+        WHERE ep.id = ranked.id
+        """
+    )
+    op.execute(
+        f"""
+        UPDATE exercise_set_plans AS esp
+        SET position = ranked.position
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY exercise_plan_id ORDER BY set_number, id
+            ) * {POSITION_GAP} AS position
+            FROM exercise_set_plans
+        ) AS ranked
+        WHERE esp.id = ranked.id
+        """
+    )
+
+    op.alter_column('exercise_plans', 'position', nullable=False)
+    op.alter_column('exercise_set_plans', 'position', nullable=False)
+    op.drop_column('exercise_plans', 'order_in_plan')
+    op.drop_column('exercise_set_plans', 'set_number')
+
+    op.create_unique_constraint('exercise_plan_position_uc', 'exercise_plans', ['workout_plan_id', 'position'], deferrable=True, initially='DEFERRED')
+    op.create_unique_constraint('exercise_set_plan_position_uc', 'exercise_set_plans', ['exercise_plan_id', 'position'], deferrable=True, initially='DEFERRED')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('exercise_set_plan_position_uc', 'exercise_set_plans', type_='unique')
+    op.drop_constraint('exercise_plan_position_uc', 'exercise_plans', type_='unique')
+
+    op.add_column('exercise_set_plans', sa.Column('set_number', sa.INTEGER(), autoincrement=False, nullable=True))
+    op.add_column('exercise_plans', sa.Column('order_in_plan', sa.INTEGER(), autoincrement=False, nullable=True))
+
+    op.execute(
+        """
+        UPDATE exercise_plans AS ep
+        SET order_in_plan = ranked.dense_order
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY workout_plan_id ORDER BY position, id
+            ) AS dense_order
+            FROM exercise_plans
+        ) AS ranked
+        WHERE ep.id = ranked.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE exercise_set_plans AS esp
+        SET set_number = ranked.dense_order
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY exercise_plan_id ORDER BY position, id
+            ) AS dense_order
+            FROM exercise_set_plans
+        ) AS ranked
+        WHERE esp.id = ranked.id
+        """
+    )
+
+    op.alter_column('exercise_plans', 'order_in_plan', nullable=False)
+    op.alter_column('exercise_set_plans', 'set_number', nullable=False)
+    op.drop_column('exercise_set_plans', 'position')
+    op.drop_column('exercise_plans', 'position')
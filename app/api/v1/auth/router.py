@@ -2,7 +2,12 @@ from fastapi import APIRouter, Depends, Response
 
 from app.api.v1.auth.service import AuthService, get_auth_service
 from app.core.auth.jwt import validate_jwt
-from app.core.auth.schema import UserRead, UserSigninRequest, UserSignupRequest
+from app.core.auth.schema import (
+    UserPasswordChangeRequest,
+    UserRead,
+    UserSigninRequest,
+    UserSignupRequest,
+)
 from app.core.common.app_response import AppResponse
 from app.core.exceptions import UnauthorizedException
 
@@ -38,4 +43,18 @@ async def signup(payload: UserSignupRequest, auth_service: AuthService = Depends
     data = await auth_service.sign_up_user(payload)
     if data is None:
         raise UnauthorizedException("Credentials invalid")
-    return AppResponse(data=data, message="User created successfully", success=True)
\ No newline at end of file
+    return AppResponse(data=data, message="User created successfully", success=True)
+
+
+@router.post("/password")
+async def change_password(
+    payload: UserPasswordChangeRequest,
+    response: Response,
+    user_data: UserRead = Depends(validate_jwt),
+    auth_service: AuthService = Depends(get_auth_service),
+):
+    data = await auth_service.change_password(user_id=user_data.id, payload=payload)
+    response.set_cookie(
+        "ath", data.token, httponly=True, samesite="lax", max_age=60000
+    )
+    return AppResponse(data=data, message="Password changed successfully")
@@ -1,10 +1,14 @@
 from datetime import datetime, timedelta, timezone
 from fastapi import Depends
 import jwt
+from sqlalchemy import update
 
+from app.core.auth.password_hasher import PasswordHasher
+from app.core.auth.principal_cache import PrincipalCache
 from app.core.auth.repository import UserRepository, get_user_repo
 from app.core.auth.schema import (
     AccessToken,
+    UserPasswordChangeRequest,
     UserRead,
     UserReadWithPw,
     UserSigninRequest,
@@ -17,41 +21,63 @@ from app.core.config import AppSettings, get_settings
 from app.core.exceptions import (
     ForbiddenException,
 )
-from passlib.context import CryptContext
+from app.dependencies.cache import get_principal_cache
+from app.dependencies.password_hasher import get_password_hasher
+from app.models import User
 import logging
 
 logger = logging.getLogger("uvicorn")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 def get_auth_service(
     user_repo: UserRepository = Depends(get_user_repo),
     settings: AppSettings = Depends(get_settings),
+    principal_cache: PrincipalCache = Depends(get_principal_cache),
+    password_hasher: PasswordHasher = Depends(get_password_hasher),
 ):
-    return AuthService(user_repo=user_repo, settings=settings)
+    return AuthService(
+        user_repo=user_repo,
+        settings=settings,
+        principal_cache=principal_cache,
+        password_hasher=password_hasher,
+    )
 
 
 class AuthService:
-    def __init__(self, user_repo: UserRepository, settings: AppSettings):
+    def __init__(
+        self,
+        user_repo: UserRepository,
+        settings: AppSettings,
+        principal_cache: PrincipalCache,
+        password_hasher: PasswordHasher,
+    ):
         self.user_repo = user_repo
         self.settings = settings
+        self.principal_cache = principal_cache
+        self.password_hasher = password_hasher
 
-    def _create_password_hash(self, password: str):
-        return pwd_context.hash(password)
+    async def _create_password_hash(self, password: str):
+        return await self.password_hasher.hash(password)
 
-    def _verify_password(self, plain_password: str, hashed_password: str):
-        return pwd_context.verify(plain_password, hashed_password)
+    async def _verify_password(self, plain_password: str, hashed_password: str):
+        return await self.password_hasher.verify(plain_password, hashed_password)
 
-    def _create_access_token(self, data: dict, expires_delta: timedelta | None = None):
+    def _create_access_token(
+        self,
+        data: dict,
+        token_version: int = 0,
+        expires_delta: timedelta | None = None,
+    ):
         to_encode = data.copy()
+        issued_at = datetime.now(timezone.utc)
         if expires_delta:
-            expire = datetime.now(timezone.utc) + expires_delta
+            expire = issued_at + expires_delta
         else:
-            expire = datetime.now(timezone.utc) + timedelta(
+            expire = issued_at + timedelta(
                 minutes=self.settings.ACCESS_TOKEN_EXPIRE_MINUTES
             )
-        to_encode.update({"exp": expire})
+        # `iat` and `ver` let JwtAuth serve the principal from PrincipalCache
+        to_encode.update({"exp": expire, "iat": issued_at, "ver": token_version})
         encoded_jwt = jwt.encode(
             to_encode, self.settings.SECRET_KEY, algorithm=self.settings.ALGORITHM
         )
@@ -62,7 +88,7 @@ class AuthService:
             await self.user_repo.get_one(val=payload.email, field="email")
             return None
         except Exception:
-            encrypted_pw = self._create_password_hash(payload.password)
+            encrypted_pw = await self._create_password_hash(payload.password)
 
             signup_data = UserSignupData(
                 email=payload.email,
@@ -85,20 +111,22 @@ class AuthService:
         logger.debug(f"User Data: {user_data}")
 
         if not user_data:
-            raise ForbiddenException(detail="Invalid credentials")
+            raise ForbiddenException("Invalid credentials")
 
-        password_match = self._verify_password(
+        password_match = await self._verify_password(
             plain_password=payload.password, hashed_password=user_data.hashed_password
         )
 
         if not password_match:
-            raise ForbiddenException(detail="Invalid credentials")
+            raise ForbiddenException("Invalid credentials")
 
         jwt_data = UserRead(
             id=user_data.id, full_name=user_data.full_name, email=user_data.email
         ).model_dump()
 
-        token: AccessToken = self._create_access_token(data=jwt_data)
+        token: AccessToken = self._create_access_token(
+            data=jwt_data, token_version=user_data.token_version
+        )
 
         login_data = UserSigninResponse(
             token=token,
@@ -108,3 +136,47 @@ class AuthService:
         )
 
         return login_data
+
+    async def change_password(
+        self, user_id: int, payload: UserPasswordChangeRequest
+    ) -> UserSigninResponse:
+        """
+        Replaces the user's password and revokes every token issued before the change.
+        A fresh token is returned so the current client stays signed in.
+        """
+        user_data: UserReadWithPw = await self.user_repo.get_one(
+            val=user_id, field="id", return_model=UserReadWithPw
+        )
+
+        password_match = await self._verify_password(
+            plain_password=payload.current_password,
+            hashed_password=user_data.hashed_password,
+        )
+
+        if not password_match:
+            raise ForbiddenException("Invalid credentials")
+
+        hashed_password = await self._create_password_hash(payload.new_password)
+
+        session = self.user_repo.session
+        token_version = await session.scalar(
+            update(User)
+            .where(User.id == user_id)
+            .values(
+                hashed_password=hashed_password,
+                token_version=User.token_version + 1,
+            )
+            .returning(User.token_version)
+        )
+        await session.commit()
+
+        await self.principal_cache.revoke(user_id=user_id, token_version=token_version)
+
+        user = UserRead(
+            id=user_data.id, full_name=user_data.full_name, email=user_data.email
+        )
+        token: AccessToken = self._create_access_token(
+            data=user.model_dump(), token_version=token_version
+        )
+
+        return UserSigninResponse(token=token, user=user)
@@ -1,25 +1,43 @@
-
-
+from pydantic import TypeAdapter
 from app.api.v1.categories.schema import ExerciseByCategoryResponse
+from app.api.v1.schema.category import CategoryBase
+from app.core.common.cache import TieredCache
 from app.models import Exercise, ExerciseCategory
 from app.repositories import Repos
 
+category_adapter = TypeAdapter(CategoryBase)
+category_list_adapter = TypeAdapter(list[CategoryBase])
+exercise_by_category_list_adapter = TypeAdapter(list[ExerciseByCategoryResponse])
+
 
 class CategoryService:
-    def __init__(self, repos: Repos):
+    def __init__(self, repos: Repos, cache: TieredCache):
         self.repos = repos
+        self.cache = cache
 
     async def get_all_categories(self):
-        return await self.repos.category.get_all()
+        return await self.cache.get_or_load(
+            key="categories",
+            loader=lambda: self.repos.category.get_all(),
+            adapter=category_list_adapter,
+        )
 
     async def get_one_category(self, category_id: int):
-        return await self.repos.category.get_one(val=category_id)
+        return await self.cache.get_or_load(
+            key=f"category:{category_id}",
+            loader=lambda: self.repos.category.get_one(val=category_id),
+            adapter=category_adapter,
+        )
 
     async def get_exercises_by_category(self, category_id: int):
-        return await self.repos.exercise.get_all(
-            where_clause=[
-                ExerciseCategory.category_id == category_id,
-                ExerciseCategory.exercise_id == Exercise.id
-            ],
-            return_model=ExerciseByCategoryResponse
+        return await self.cache.get_or_load(
+            key=f"category:{category_id}:exercises",
+            loader=lambda: self.repos.exercise.get_all(
+                where_clause=[
+                    ExerciseCategory.category_id == category_id,
+                    ExerciseCategory.exercise_id == Exercise.id
+                ],
+                return_model=ExerciseByCategoryResponse
+            ),
+            adapter=exercise_by_category_list_adapter,
         )
@@ -1,39 +1,65 @@
+from pydantic import TypeAdapter
 from app.api.v1.exercises.schema import ExercisePagination
+from app.api.v1.schema.exercise import ExerciseBase
+from app.core.common.cache import TieredCache
+from app.core.database.base_repo import PaginatedResponse
 from app.models import Exercise
 from app.repositories import Repos
 
 from sqlalchemy.orm import selectinload
 
+exercise_list_adapter = TypeAdapter(list[ExerciseBase])
+exercise_page_adapter = TypeAdapter(PaginatedResponse[ExerciseBase])
+exercise_adapter = TypeAdapter(ExerciseBase)
+
 
 class ExerciseService:
-    def __init__(self, repos: Repos):
+    def __init__(self, repos: Repos, cache: TieredCache):
         self.repos = repos
+        self.cache = cache
 
     async def get_many_exercises(self, pagination: ExercisePagination):
         if pagination.skip:
-            return await self.repos.exercise.get_all(
-                options=[
-                    selectinload(Exercise.categories),
-                    selectinload(Exercise.muscle_groups),
-                ]
+            return await self.cache.get_or_load(
+                key=f"exercises:{pagination.cache_key()}",
+                loader=lambda: self.repos.exercise.get_all(
+                    options=[
+                        selectinload(Exercise.categories),
+                        selectinload(Exercise.muscle_groups),
+                    ]
+                ),
+                adapter=exercise_list_adapter,
             )
 
-        return await self.repos.exercise.get_many(
-            page=pagination.page,
-            size=pagination.size,
-            order_clause=pagination.sort_fields,
-            where_clause=pagination.filter_fields,
-            relations=[
-                selectinload(Exercise.categories),
-                selectinload(Exercise.muscle_groups),
-            ],
+        return await self.cache.get_or_load(
+            key=f"exercises:{pagination.cache_key()}",
+            loader=lambda: self.repos.exercise.get_many(
+                page=pagination.page,
+                size=pagination.size,
+                order_clause=pagination.sort_fields,
+                where_clause=pagination.filter_fields,
+                relations=[
+                    selectinload(Exercise.categories),
+                    selectinload(Exercise.muscle_groups),
+                ],
+                count_mode=pagination.count_mode,
+            ),
+            adapter=exercise_page_adapter,
         )
 
     async def get_one_exercise(self, exercise_id: int):
-        return await self.repos.exercise.get_one(
-            val=exercise_id,
-            options=[
-                selectinload(Exercise.categories),
-                selectinload(Exercise.muscle_groups),
-            ],
+        return await self.cache.get_or_load(
+            key=f"exercise:{exercise_id}",
+            loader=lambda: self.repos.exercise.get_one(
+                val=exercise_id,
+                options=[
+                    selectinload(Exercise.categories),
+                    selectinload(Exercise.muscle_groups),
+                ],
+            ),
+            adapter=exercise_adapter,
         )
+
+    async def invalidate_catalog(self):
+        """Drops cached catalog reads, call after writing custom exercises."""
+        await self.cache.invalidate()
@@ -1,32 +1,52 @@
-
-
+from pydantic import TypeAdapter
 from app.api.v1.muscle_groups.schema import MuscleGroupPagination, ExerciseByMuscleResponse
+from app.api.v1.schema.exercise import MuscleGroupBase
+from app.core.common.cache import TieredCache
+from app.core.database.base_repo import PaginatedResponse
 from app.models import Exercise, ExerciseMuscleGroup
 from app.repositories import Repos
 from sqlalchemy.orm import selectinload
 
+muscle_group_adapter = TypeAdapter(MuscleGroupBase)
+muscle_group_page_adapter = TypeAdapter(PaginatedResponse[MuscleGroupBase])
+exercise_by_muscle_list_adapter = TypeAdapter(list[ExerciseByMuscleResponse])
+
 
 class MuscleGroupService:
-    def __init__(self, repos: Repos):
+    def __init__(self, repos: Repos, cache: TieredCache):
         self.repos = repos
+        self.cache = cache
 
     async def get_muscle_groups_by_id(self, muscle_group_id: int):
-        return await self.repos.muscle_group.get_one(
-            val=muscle_group_id
+        return await self.cache.get_or_load(
+            key=f"muscle_group:{muscle_group_id}",
+            loader=lambda: self.repos.muscle_group.get_one(
+                val=muscle_group_id
+            ),
+            adapter=muscle_group_adapter,
         )
 
     async def get_many_muscle_groups(self, pagination: MuscleGroupPagination):
-        return await self.repos.muscle_group.get_many(
-            page=pagination.page,
-            size=pagination.size,
-            order_clause=pagination.sort_fields,
-            where_clause=pagination.filter_fields)
+        return await self.cache.get_or_load(
+            key=f"muscle_groups:{pagination.cache_key()}",
+            loader=lambda: self.repos.muscle_group.get_many(
+                page=pagination.page,
+                size=pagination.size,
+                order_clause=pagination.sort_fields,
+                where_clause=pagination.filter_fields,
+                count_mode=pagination.count_mode),
+            adapter=muscle_group_page_adapter,
+        )
 
     async def get_exercises_by_muscle_group(self, muscle_group_id: int):
         # implicit joins
-        return await self.repos.exercise.get_all(
-            where_clause=[ExerciseMuscleGroup.exercise_id == Exercise.id,
-                          ExerciseMuscleGroup.muscle_group_id == muscle_group_id],
-            options=[selectinload(Exercise.categories)],
-            return_model=ExerciseByMuscleResponse
+        return await self.cache.get_or_load(
+            key=f"muscle_group:{muscle_group_id}:exercises",
+            loader=lambda: self.repos.exercise.get_all(
+                where_clause=[ExerciseMuscleGroup.exercise_id == Exercise.id,
+                              ExerciseMuscleGroup.muscle_group_id == muscle_group_id],
+                options=[selectinload(Exercise.categories)],
+                return_model=ExerciseByMuscleResponse
+            ),
+            adapter=exercise_by_muscle_list_adapter,
         )
@@ -5,7 +5,7 @@ from app.core.auth.jwt import validate_jwt
 from app.dependencies.services import get_exercise_result_service
 from app.api.v1.sessions.services import ExerciseResultService
 from app.api.v1.schema.workout_session import ExerciseResultBase
-from app.core.common.app_response import AppResponse
+from app.core.common.app_response import AppResponse, AppStreamingResponse
 from app.api.v1.sessions.schema import ExerciseResultPagination
 from ..exercise_set_results.router import router as set_result_router
 
@@ -99,6 +99,8 @@ async def get_exercise_results(
         user_id=user_data.id, session_id=session_id, pagination=pagination
     )
 
+    if pagination.stream:
+        return AppStreamingResponse(result, session=exercise_result_service.repos.session)
     return AppResponse(data=result)
 
 
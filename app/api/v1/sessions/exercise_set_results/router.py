@@ -4,7 +4,7 @@ from app.api.v1.sessions.validate_session_status import is_session_status_valid
 from app.dependencies.services import get_exercise_set_result_service
 from app.api.v1.sessions.services import ExerciseSetResultService
 from app.core.auth.schema import UserRead
-from app.core.common.app_response import AppResponse
+from app.core.common.app_response import AppResponse, AppStreamingResponse
 from app.core.auth.jwt import validate_jwt
 from app.api.v1.sessions.schema import ExerciseSetResultPagination
 
@@ -50,6 +50,8 @@ async def get_exercise_set_results(
         user_id=user_data.id,
     )
 
+    if pagination.stream:
+        return AppStreamingResponse(result, session=exercise_set_service.repos.session)
     return AppResponse(data=result)
 
 
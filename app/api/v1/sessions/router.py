@@ -1,4 +1,8 @@
+import os
+
+from celery.result import AsyncResult
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import FileResponse, StreamingResponse
 
 from app.api.v1.sessions.schema import (
     WorkoutSessionPagination,
@@ -7,8 +11,12 @@ from app.api.v1.sessions.schema import (
 from app.api.v1.sessions.services.workout_session_service import WorkoutSessionService
 from app.core.auth.jwt import validate_jwt
 from app.core.auth.schema import UserRead
-from app.core.common.app_response import AppResponse
+from app.core.common.app_response import AppResponse, AppStreamingResponse
+from app.core.exceptions import NotFoundException
 from app.dependencies.services import get_session_service
+from app.utils.history_export import ExportFormat
+from app.worker.tasks import export_training_history
+from app.worker.tasks.export_history import export_path
 from .schema import WorkoutSessionResultCreate
 from app.api.v1.sessions.exercise_results.router import router as exercise_result_router
 
@@ -24,9 +32,97 @@ async def get_workout_sessions(
     result = await session_service.get_many_sessions(
         user_id=user_data.id, pagination=pagination
     )
+    if pagination.stream:
+        return AppStreamingResponse(result, session=session_service.repos.session)
     return AppResponse(data=result)
 
 
+@router.get("/export")
+async def export_workout_history(
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    compress: bool = Query(True),
+    user_data: UserRead = Depends(validate_jwt),
+    session_service: WorkoutSessionService = Depends(get_session_service),
+):
+    exporter = session_service.export_history(
+        user_id=user_data.id, export_format=export_format
+    )
+    session = session_service.repos.session
+
+    async def body():
+        # the body is sent after the request's dependencies exit, so close the session here
+        try:
+            async for data in exporter.stream(compress=compress):
+                yield data
+        finally:
+            await session.close()
+
+    return StreamingResponse(
+        body(),
+        media_type="application/gzip" if compress else exporter.media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{exporter.filename(compress)}"'
+        },
+    )
+
+
+@router.post("/export")
+async def schedule_workout_history_export(
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    user_data: UserRead = Depends(validate_jwt),
+):
+    task = export_training_history.apply_async((user_data.id, export_format.value))
+    return AppResponse(data={"task_id": task.id})
+
+
+def _owned_export(task: AsyncResult, user_id: int) -> dict | None:
+    """The result of a finished export task, or None while it is not done. Other users' exports are not found."""
+    if not task.successful():
+        return None
+
+    export = task.result
+    if not isinstance(export, dict) or export.get("user_id") != user_id:
+        raise NotFoundException("Export not found")
+    return export
+
+
+# plain `def`: reading the task state is a blocking call to the result backend,
+# FastAPI runs these in its threadpool
+@router.get("/export/{task_id}")
+def get_workout_history_export(
+    task_id: str,
+    user_data: UserRead = Depends(validate_jwt),
+):
+    task = AsyncResult(task_id, app=export_training_history.app)
+    export = _owned_export(task, user_data.id)
+
+    return AppResponse(
+        data={
+            "task_id": task_id,
+            # PENDING is also the state of unknown task ids
+            "status": task.state,
+            "filename": export["filename"] if export else None,
+        }
+    )
+
+
+@router.get("/export/{task_id}/download")
+def download_workout_history_export(
+    task_id: str,
+    user_data: UserRead = Depends(validate_jwt),
+):
+    export = _owned_export(AsyncResult(task_id, app=export_training_history.app), user_data.id)
+    if export is None:
+        raise NotFoundException("Export is not ready")
+
+    path = export_path(user_data.id, export["filename"])
+    if not os.path.isfile(path):
+        # removed, or written to an EXPORT_DIR this process cannot see
+        raise NotFoundException("Export file not found")
+
+    return FileResponse(path, media_type="application/gzip", filename=export["filename"])
+
+
 @router.get("/{session_id}")
 async def get_workout_session(
     session_id: int,
@@ -77,6 +173,19 @@ async def record_session_results(
     return AppResponse(data=result)
 
 
+@router.post("/{session_id}/results/bulk")
+async def ingest_session_results(
+    session_id: int,
+    workout_results: WorkoutSessionResultCreate,
+    user_data: UserRead = Depends(validate_jwt),
+    session_service: WorkoutSessionService = Depends(get_session_service),
+):
+    result = await session_service.ingest_session_results(
+        user_id=user_data.id, session_id=session_id, workout_results=workout_results
+    )
+    return AppResponse(data=result)
+
+
 router.include_router(exercise_result_router)
 
 
@@ -3,6 +3,7 @@
 from app.core.common.pagination_factory import PaginationFactory
 from app.models import WorkoutSession, ExerciseResult, ExerciseSetResult
 from app.core.common.app_response import AppBaseModel
+from datetime import datetime
 from typing import Optional
 
 # --- Read Paginated Session Schema ---
@@ -70,3 +71,41 @@ class SetResultCreate(AppBaseModel):
         orm_model = ExerciseSetResult
 
 
+
+
+# --- Workout Report Schema ---
+# Represents a planned-vs-achieved report of a completed workout session
+class SetReportItem(AppBaseModel):
+    exercise_set_plan_id: Optional[int] = None
+    set_number: Optional[int] = None
+    target_reps: Optional[int] = None
+    reps_achieved: Optional[int] = None
+    reps_delta: Optional[int] = None
+    target_weight: Optional[float] = None
+    weight_achieved: Optional[float] = None
+    weight_delta: Optional[float] = None
+    target_duration_seconds: Optional[int] = None
+    duration_seconds: Optional[int] = None
+    duration_seconds_delta: Optional[int] = None
+    rpe: Optional[int] = None
+
+
+class ExerciseReportItem(AppBaseModel):
+    exercise_plan_id: Optional[int] = None
+    exercise_id: int
+    order_in_plan: Optional[int] = None
+    target_sets: Optional[int] = None
+    sets_achieved: Optional[int] = None
+    sets_delta: Optional[int] = None
+    target_duration_minutes: Optional[float] = None
+    duration_minutes_achieved: Optional[float] = None
+    duration_minutes_delta: Optional[float] = None
+    sets: list[SetReportItem] = []
+
+
+class WorkoutReportResponse(AppBaseModel):
+    workout_session_id: int
+    workout_plan_id: Optional[int] = None
+    started_at: Optional[datetime] = None
+    ended_at: Optional[datetime] = None
+    exercises: list[ExerciseReportItem] = []
@@ -3,6 +3,7 @@ from app.api.v1.sessions.schema import (
     ExerciseResultPagination,
 )
 from app.api.v1.schema.workout_session import ExerciseResultBase
+from app.core.common.pagination_factory import PaginationMode
 from app.models import WorkoutSession, ExerciseResult
 from sqlalchemy.orm import selectinload
 
@@ -75,11 +76,21 @@ class ExerciseResultService:
             WorkoutSession.id == session_id,
             WorkoutSession.user_id == user_id,
         ]
+        if pagination.stream:
+            return self.repos.exercise_result.stream_all(where_clause=base_where)
         if pagination.skip:
             return await self.repos.exercise_result.get_all(where_clause=base_where)
+        if pagination.mode is PaginationMode.cursor:
+            return await self.repos.exercise_result.get_many_by_cursor(
+                size=pagination.size,
+                cursor=pagination.cursor,
+                where_clause=[*base_where, *pagination.filter_fields],
+                sort_keys=pagination.sort_keys,
+            )
         return await self.repos.exercise_result.get_many(
             page=pagination.page,
             size=pagination.size,
             where_clause=[*base_where, *pagination.filter_fields],
             order_clause=pagination.sort_fields,
+            count_mode=pagination.count_mode,
         )
@@ -1,6 +1,7 @@
 from app.dependencies.repositories import Repos
 from app.api.v1.schema.workout_session import ExerciseSetResultBase
 from app.api.v1.sessions.schema import ExerciseSetResultPagination
+from app.core.common.pagination_factory import PaginationMode
 
 from app.models import ExerciseResult, ExerciseSetResult, WorkoutSession
 
@@ -38,14 +39,26 @@ class ExerciseSetResultService:
             ExerciseResult.id == exercise_result_id,
             WorkoutSession.user_id == user_id,
         ]
+        if pagination.stream:
+            return self.repos.exercise_set_result.stream_all(where_clause=base_where)
+
         if pagination.skip:
             return await self.repos.exercise_set_result.get_all(where_clause=base_where)
 
+        if pagination.mode is PaginationMode.cursor:
+            return await self.repos.exercise_set_result.get_many_by_cursor(
+                size=pagination.size,
+                cursor=pagination.cursor,
+                where_clause=[*base_where, *pagination.filter_fields],
+                sort_keys=pagination.sort_keys,
+            )
+
         return await self.repos.exercise_set_result.get_many(
             page=pagination.page,
             size=pagination.size,
             where_clause=[*base_where, *pagination.filter_fields],
             order_clause=pagination.sort_fields,
+            count_mode=pagination.count_mode,
         )
 
     async def get_one_exercise_set_result(
@@ -3,10 +3,14 @@ from app.api.v1.sessions.schema import (
     WorkoutSessionCreate,
 )
 from app.api.v1.schema import (
+    ExerciseResultBase,
     WorkoutSessionBase,
 )
+from app.core.common.pagination_factory import PaginationMode
+from app.core.exceptions import BadRequestException, NotFoundException
 from app.models import (
     ExercisePlan,
+    ExerciseSetPlan,
     User,
     WorkoutSession,
     ExerciseResult,
@@ -20,6 +24,8 @@ from app.api.v1.sessions.schema import (
     WorkoutSessionResultCreate,
     ExerciseResultCreate,
 )
+from app.utils.history_export import ExportFormat, HistoryExporter
+from app.api.v1.sessions.utils.report_builder import WorkoutReportBuilder
 from sqlalchemy.orm import selectinload
 from sqlalchemy import select
 
@@ -36,18 +42,34 @@ class WorkoutSessionService:
                 ExerciseResult.exercise_set_results
             )
         ]
+        if pagination.stream:
+            return self.repos.workout_session.stream_all(
+                where_clause=[WorkoutSession.user_id == user_id],
+                options=base_options,
+            )
+
         if pagination.skip:
             return await self.repos.workout_session.get_all(
                 where_clause=[WorkoutSession.user_id == user_id],
                 options=base_options,
             )
 
+        if pagination.mode is PaginationMode.cursor:
+            return await self.repos.workout_session.get_many_by_cursor(
+                size=pagination.size,
+                cursor=pagination.cursor,
+                where_clause=[*pagination.filter_fields, WorkoutSession.user_id == user_id],
+                sort_keys=pagination.sort_keys,
+                relations=base_options,
+            )
+
         return await self.repos.workout_session.get_many(
             page=pagination.page,
             size=pagination.size,
             where_clause=[*pagination.filter_fields, WorkoutSession.user_id == user_id],
             order_clause=pagination.sort_fields,
             relations=base_options,
+            count_mode=pagination.count_mode,
         )
 
     async def get_one_session(self, user_id: int, session_id: int):
@@ -135,6 +157,133 @@ class WorkoutSessionService:
             ],
         )
 
+    async def ingest_session_results(
+        self, user_id: int, session_id: int, workout_results: WorkoutSessionResultCreate
+    ) -> WorkoutSessionBase:
+        """
+        Bulk path for recording many results at once (e.g. a wearable sync).
+
+        Ownership and plan consistency are validated once for the whole payload, exercise
+        results and set results are each written with batched multi-row INSERT ... RETURNING
+        statements in a single transaction, and the response tree is assembled from the
+        returned rows instead of being reloaded.
+        """
+        session = self.repos.session
+
+        found_session = await session.scalar(
+            select(WorkoutSession).where(
+                WorkoutSession.user_id == user_id,
+                WorkoutSession.id == session_id,
+            )
+        )
+
+        if not found_session:
+            raise NotFoundException("Workout session not found")
+        if found_session.status == WorkoutSessionStatus.scheduled:
+            raise BadRequestException("Workout session has not yet started!")
+        if found_session.status == WorkoutSessionStatus.cancelled:
+            raise BadRequestException("Workout session has been cancelled!")
+
+        exercise_results = workout_results.workout_session_results
+
+        # 1. every exercise plan must belong to the session's workout plan
+        exercise_plan_ids = {ex_result.exercise_plan_id for ex_result in exercise_results}
+        if len(exercise_plan_ids) != len(exercise_results):
+            raise BadRequestException("Each exercise plan can only be recorded once per session")
+
+        owned_exercise_plan_ids = set(
+            (
+                await session.scalars(
+                    select(ExercisePlan.id).where(
+                        ExercisePlan.id.in_(exercise_plan_ids),
+                        ExercisePlan.workout_plan_id == found_session.workout_plan_id,
+                    )
+                )
+            ).all()
+        )
+        unknown_exercise_plan_ids = exercise_plan_ids - owned_exercise_plan_ids
+        if unknown_exercise_plan_ids:
+            raise BadRequestException(
+                f"Exercise plans {sorted(unknown_exercise_plan_ids)} are not part of the session's workout plan"
+            )
+
+        # 2. every set plan must belong to the exercise plan of its parent result
+        set_plan_ids = {
+            set_result.exercise_set_plan_id
+            for ex_result in exercise_results
+            for set_result in ex_result.exercise_set_results or []
+        }
+        set_plan_parents = dict(
+            (
+                await session.execute(
+                    select(ExerciseSetPlan.id, ExerciseSetPlan.exercise_plan_id).where(
+                        ExerciseSetPlan.id.in_(set_plan_ids)
+                    )
+                )
+            ).all()
+        ) if set_plan_ids else {}
+
+        for ex_result in exercise_results:
+            for set_result in ex_result.exercise_set_results or []:
+                if set_plan_parents.get(set_result.exercise_set_plan_id) != ex_result.exercise_plan_id:
+                    raise BadRequestException(
+                        f"Set plan {set_result.exercise_set_plan_id} is not part of exercise plan {ex_result.exercise_plan_id}"
+                    )
+
+        # 3. batched inserts, parents first so set rows can reference their ids
+        try:
+            created_results = await self.repos.exercise_result.insert_many_rows(
+                [
+                    {
+                        "sets_achieved": ex_result.sets_achieved,
+                        "duration_minutes_achieved": ex_result.duration_minutes_achieved,
+                        "exercise_plan_id": ex_result.exercise_plan_id,
+                        "exercise_id": ex_result.exercise_id,
+                        "workout_session_id": found_session.id,
+                    }
+                    for ex_result in exercise_results
+                ]
+            )
+
+            set_rows = [
+                {
+                    "set_number": set_result.set_number,
+                    "reps_achieved": set_result.reps_achieved,
+                    "weight_achieved": set_result.weight_achieved,
+                    "duration_seconds": set_result.duration_seconds,
+                    "rpe": set_result.rpe,
+                    "exercise_set_plan_id": set_result.exercise_set_plan_id,
+                    "exercise_result_id": created_result.id,
+                }
+                for ex_result, created_result in zip(exercise_results, created_results)
+                for set_result in ex_result.exercise_set_results or []
+            ]
+            created_sets = await self.repos.exercise_set_result.insert_many_rows(set_rows)
+
+            if workout_results.session_comments:
+                found_session.session_comments = workout_results.session_comments
+
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+        # 4. assemble the response tree from the returned rows
+        sets_by_result_id: dict[int, list] = {}
+        for created_set in created_sets:
+            sets_by_result_id.setdefault(created_set.exercise_result_id, []).append(created_set)
+
+        return WorkoutSessionBase(
+            **found_session.dict(),
+            workout_session_results=[
+                ExerciseResultBase(
+                    **created_result.model_dump(exclude={"exercise_set_results"}, by_alias=False),
+                    exercise_set_results=sets_by_result_id.get(created_result.id, []),
+                )
+                for created_result in created_results
+            ],
+        )
+
     async def get_workout_report(
         self,
         session_id: int,
@@ -158,6 +307,8 @@ class WorkoutSessionService:
                 "message": "Session is not yet completed, please end it to get a report"
             }
 
+        # results of this session and the targets of its plan are fetched in bounded
+        # queries, then joined in memory by exercise_plan_id/exercise_set_plan_id
         exercise_plans = await self.repos.exercise_plan.get_all(
             where_clause=[
                 ExercisePlan.workout_plan_id == workout_session.workout_plan_id
@@ -165,14 +316,11 @@ class WorkoutSessionService:
             options=[selectinload(ExercisePlan.exercise_set_plans)],
         )
 
-        results = []
-
-        for ex_plan in exercise_plans:
-            ex_results = await self.repos.exercise_result.get_all(
-                where_clause=[ExerciseResult.exercise_plan_id == ex_plan.id],
-                options=[selectinload(ExerciseResult.exercise_set_results)],
-            )
+        return WorkoutReportBuilder.build(
+            workout_session=workout_session, exercise_plans=exercise_plans
+        )
 
-            for ex_result in ex_results:
-                results.append({"plan": ex_plan, "outcome": ex_result})
-        return results
+    def export_history(self, user_id: int, export_format: ExportFormat) -> HistoryExporter:
+        return HistoryExporter(
+            session=self.repos.session, user_id=user_id, export_format=export_format
+        )
@@ -0,0 +1,135 @@
+from typing import Optional
+
+from app.api.v1.schema import (
+    ExercisePlanBase,
+    ExerciseResultBase,
+    ExerciseSetPlanBase,
+    ExerciseSetResultBase,
+    WorkoutSessionBase,
+)
+from app.api.v1.sessions.schema import (
+    ExerciseReportItem,
+    SetReportItem,
+    WorkoutReportResponse,
+)
+
+
+def _delta(achieved: Optional[float], target: Optional[float]) -> Optional[float]:
+    if achieved is None or target is None:
+        return None
+    return achieved - target
+
+
+class WorkoutReportBuilder:
+    """
+    Joins the results of a single workout session with the targets of its workout plan
+    in memory, keyed by `exercise_plan_id` and `exercise_set_plan_id`.
+    """
+
+    @staticmethod
+    def _build_set_item(
+        set_plan: Optional[ExerciseSetPlanBase],
+        set_result: Optional[ExerciseSetResultBase],
+    ) -> SetReportItem:
+        target_reps = set_plan.target_reps if set_plan else None
+        target_weight = set_plan.target_weight if set_plan else None
+        target_duration_seconds = set_plan.target_duration_seconds if set_plan else None
+
+        reps_achieved = set_result.reps_achieved if set_result else None
+        weight_achieved = set_result.weight_achieved if set_result else None
+        duration_seconds = set_result.duration_seconds if set_result else None
+
+        return SetReportItem(
+            exercise_set_plan_id=(
+                set_plan.id if set_plan else set_result.exercise_set_plan_id
+            ),
+            set_number=set_plan.set_number if set_plan else set_result.set_number,
+            target_reps=target_reps,
+            reps_achieved=reps_achieved,
+            reps_delta=_delta(reps_achieved, target_reps),
+            target_weight=target_weight,
+            weight_achieved=weight_achieved,
+            weight_delta=_delta(weight_achieved, target_weight),
+            target_duration_seconds=target_duration_seconds,
+            duration_seconds=duration_seconds,
+            duration_seconds_delta=_delta(duration_seconds, target_duration_seconds),
+            rpe=set_result.rpe if set_result else None,
+        )
+
+    @classmethod
+    def _build_exercise_item(
+        cls,
+        ex_plan: Optional[ExercisePlanBase],
+        ex_result: Optional[ExerciseResultBase],
+    ) -> ExerciseReportItem:
+        set_plans = (ex_plan.exercise_set_plans or []) if ex_plan else []
+        set_results = (ex_result.exercise_set_results or []) if ex_result else []
+
+        set_results_by_plan_id = {
+            set_result.exercise_set_plan_id: set_result for set_result in set_results
+        }
+
+        sets: list[SetReportItem] = []
+        for set_plan in sorted(set_plans, key=lambda item: item.set_number):
+            sets.append(
+                cls._build_set_item(
+                    set_plan=set_plan,
+                    set_result=set_results_by_plan_id.pop(set_plan.id, None),
+                )
+            )
+        # results recorded against set plans that no longer exist in the plan
+        for set_result in set_results_by_plan_id.values():
+            sets.append(cls._build_set_item(set_plan=None, set_result=set_result))
+
+        target_sets = ex_plan.target_sets if ex_plan else None
+        target_duration_minutes = ex_plan.target_duration_minutes if ex_plan else None
+        sets_achieved = ex_result.sets_achieved if ex_result else None
+        duration_minutes_achieved = (
+            ex_result.duration_minutes_achieved if ex_result else None
+        )
+
+        return ExerciseReportItem(
+            exercise_plan_id=ex_plan.id if ex_plan else ex_result.exercise_plan_id,
+            exercise_id=ex_plan.exercise_id if ex_plan else ex_result.exercise_id,
+            order_in_plan=ex_plan.order_in_plan if ex_plan else None,
+            target_sets=target_sets,
+            sets_achieved=sets_achieved,
+            sets_delta=_delta(sets_achieved, target_sets),
+            target_duration_minutes=target_duration_minutes,
+            duration_minutes_achieved=duration_minutes_achieved,
+            duration_minutes_delta=_delta(
+                duration_minutes_achieved, target_duration_minutes
+            ),
+            sets=sets,
+        )
+
+    @classmethod
+    def build(
+        cls,
+        workout_session: WorkoutSessionBase,
+        exercise_plans: list[ExercisePlanBase],
+    ) -> WorkoutReportResponse:
+        ex_results_by_plan_id = {
+            ex_result.exercise_plan_id: ex_result
+            for ex_result in workout_session.workout_session_results or []
+        }
+
+        exercises: list[ExerciseReportItem] = []
+        for ex_plan in sorted(exercise_plans, key=lambda item: item.order_in_plan):
+            exercises.append(
+                cls._build_exercise_item(
+                    ex_plan=ex_plan,
+                    ex_result=ex_results_by_plan_id.pop(ex_plan.id, None),
+                )
+            )
+        # results whose exercise plan was removed after the session was recorded
+        for ex_result in ex_results_by_plan_id.values():
+            exercises.append(cls._build_exercise_item(ex_plan=None, ex_result=ex_result))
+
+        return WorkoutReportResponse(
+            workout_session_id=workout_session.id,
+            workout_plan_id=workout_session.workout_plan_id,
+            started_at=workout_session.started_at,
+            ended_at=workout_session.ended_at,
+            exercises=exercises,
+        )
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, Query
 from app.api.v1.schema.workout_plan import ExercisePlanBase
-from app.api.v1.workouts.schema import ExercisePlanPagination
+from app.api.v1.workouts.schema import ExercisePlanPagination, ReorderExercisePlansRequest
 from app.api.v1.workouts.services import ExercisePlanService
 
 
@@ -31,6 +31,22 @@ async def get_exercise_plans(
     return AppResponse(data=workout_exercise_plans)
 
 
+@router.put("/order")
+async def reorder_exercise_plans(
+    workout_plan_id: int,
+    payload: ReorderExercisePlansRequest,
+    user_data: UserRead = Depends(validate_jwt),
+    exercise_plan_service: ExercisePlanService = Depends(get_exercise_plan_service),
+):
+    workout_exercise_plans = await exercise_plan_service.reorder_exercise_plans(
+        workout_plan_id=workout_plan_id,
+        user_id=user_data.id,
+        payload=payload,
+    )
+
+    return AppResponse(data=workout_exercise_plans)
+
+
 @router.get("/{exercise_plan_id}")
 async def get_exercise_plan(
     workout_plan_id: int,
@@ -1,9 +1,5 @@
-from datetime import timedelta
 from fastapi import APIRouter, Depends, Query
-import pytz
 
-from app.api.v1.schema import WorkoutSessionBase
-from app.api.v1.sessions.services.workout_session_service import WorkoutSessionService
 from app.api.v1.workouts.schema import (
     CreateWorkoutScheduleRequest,
     GetScheduleReminderSuggestionsRequest,
@@ -16,10 +12,8 @@ from app.api.v1.workouts.utils.schedule_time_validator import TimeReminderSugges
 from app.core.auth.jwt import validate_jwt
 from app.core.auth.schema import UserRead
 from app.core.common.app_response import AppResponse
-from app.dependencies.services import get_schedule_service, get_session_service
-from app.models import ScheduleStatus, WorkoutSessionStatus
-from app.worker.tasks import reminder_email
-from app.worker.tasks.auto_start_session import start_scheduled_session
+from app.dependencies.services import get_schedule_service
+from app.models import ScheduleStatus
 
 router: APIRouter = APIRouter(
     prefix="/{workout_plan_id}/schedules", dependencies=[Depends(validate_jwt)]
@@ -71,12 +65,13 @@ async def create_workout_plan_schedule(
     payload: CreateWorkoutScheduleRequest,
     user_data: UserRead = Depends(validate_jwt),
     workout_plan_service: WorkoutScheduleService = Depends(get_schedule_service),
-    session_service: WorkoutSessionService = Depends(get_session_service),
 ):
     should_remind = payload.remind_before_minutes is not None
 
-    if not should_remind:
-        payload.reminder_status = ScheduleStatus.unset
+    # pending reminders are picked up by the sweep_due_reminders beat task
+    payload.reminder_status = (
+        ScheduleStatus.pending if should_remind else ScheduleStatus.unset
+    )
 
     result = await workout_plan_service.create_workout_schedule(
         user_id=user_data.id,
@@ -86,29 +81,4 @@ async def create_workout_plan_schedule(
 
     result = ScheduleCreateResponse(**result.model_dump())
 
-    start_at_utc = (
-        pytz.UTC.localize(payload.start_at)
-        if not payload.start_at.tzinfo
-        else payload.start_at
-    )
-    if should_remind:
-        # send reminder email
-        reminder_email.apply_async(
-            (result.id,),
-            eta=start_at_utc - timedelta(minutes=payload.remind_before_minutes),
-        )
-
-    created_workout_session = await session_service.schedule_session(
-        payload=WorkoutSessionBase(
-            workout_plan_id=workout_plan_id,
-            user_id=user_data.id,
-            schedule_id=result.id,
-            status=WorkoutSessionStatus.scheduled,
-        ),
-    )
-
-    if payload.auto_start_session:
-        session_id = created_workout_session.id
-        start_scheduled_session.apply_async((session_id,), eta=start_at_utc)
-
     return AppResponse(data=result)
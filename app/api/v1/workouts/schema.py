@@ -28,11 +28,14 @@ class WorkoutPlanPagination(WorkoutPlanPaginationBase):
     pass
 
 
-exercise_plan_cols = ExercisePlan.columns()
+# `position` stays internal; the dense order it ranks is sortable (by position) but,
+# not being stored, not filterable
+exercise_plan_cols = ExercisePlan.columns() - {"position"}
 ExercisePlanPaginationBase = PaginationFactory.create_pagination(
     ExercisePlan,
-    sortable_fields=exercise_plan_cols,
+    sortable_fields=exercise_plan_cols | {"order_in_plan"},
     filterable_fields=exercise_plan_cols,
+    sort_aliases={"order_in_plan": ExercisePlan.position},
 )
 
 
@@ -40,11 +43,12 @@ class ExercisePlanPagination(ExercisePlanPaginationBase):
     pass
 
 
-exercise_set_plan_cols = ExerciseSetPlan.columns()
+exercise_set_plan_cols = ExerciseSetPlan.columns() - {"position"}
 ExerciseSetPlanPaginationBase = PaginationFactory.create_pagination(
     ExerciseSetPlan,
-    sortable_fields=exercise_set_plan_cols,
+    sortable_fields=exercise_set_plan_cols | {"set_number"},
     filterable_fields=exercise_set_plan_cols,
+    sort_aliases={"set_number": ExerciseSetPlan.position},
 )
 
 
@@ -179,6 +183,31 @@ class UpdateWorkoutPlanRequest(WorkoutPlanBase):
     exercise_plans: Optional[list[ExercisePlanUpdate]] = []
 
 
+# --- Reorder Exercise Plans Schema ---
+# Represents the full desired order of a workout plan's exercise plans (and optionally their set plans)
+class ExercisePlanOrderItem(AppBaseModel):
+    id: int
+    # ids of all the exercise plan's set plans in their new order, left as is when omitted
+    set_plan_ids: Optional[list[int]] = None
+
+    @model_validator(mode="after")
+    def validate_unique_set_plan_ids(self) -> Self:
+        if self.set_plan_ids and len(set(self.set_plan_ids)) != len(self.set_plan_ids):
+            raise ValueError(f"set_plan_ids of exercise plan {self.id} has duplicates")
+        return self
+
+
+class ReorderExercisePlansRequest(AppBaseModel):
+    exercise_plans: list[ExercisePlanOrderItem]
+
+    @model_validator(mode="after")
+    def validate_unique_exercise_plan_ids(self) -> Self:
+        ids = [item.id for item in self.exercise_plans]
+        if len(set(ids)) != len(ids):
+            raise ValueError("exercise_plans has duplicate ids")
+        return self
+
+
 # --- Get Schedule Suggestion Schema ---
 # Represents fetching suggestions for a schedule given a start date/time
 class GetScheduleReminderSuggestionsRequest(AppBaseModel):
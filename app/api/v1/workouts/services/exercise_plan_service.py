@@ -1,9 +1,15 @@
-from sqlalchemy import asc, select, update
+from fastapi import HTTPException
+from sqlalchemy import asc, select
 from sqlalchemy.orm import selectinload
 from app.api.v1.schema.workout_plan import ExercisePlanBase
-from app.api.v1.workouts.schema import ExercisePlanPagination
+from app.api.v1.workouts.schema import ExercisePlanPagination, ReorderExercisePlansRequest
 from app.api.v1.workouts.utils.order_decorator import validate_order_in_plan_number
-from app.models import ExercisePlan, User, WorkoutPlan
+from app.api.v1.workouts.utils.ordering import (
+    exercise_plan_ordering,
+    moved_positions,
+    set_plan_ordering,
+)
+from app.models import ExercisePlan, ExerciseSetPlan, User, WorkoutPlan
 from app.repositories import Repos
 
 
@@ -23,7 +29,7 @@ class ExercisePlanService:
             User.id == user_id,
             WorkoutPlan.id == workout_plan_id,
         ]
-        base_order_clause = [asc(ExercisePlan.order_in_plan)]
+        base_order_clause = [asc(ExercisePlan.position)]
 
         if pagination.skip:
             return await self.repos.exercise_plan.get_all(
@@ -35,6 +41,7 @@ class ExercisePlanService:
             size=pagination.size,
             where_clause=[*pagination.filter_fields, *base_where_clause],
             order_clause=[*pagination.sort_fields, *base_order_clause],
+            count_mode=pagination.count_mode,
         )
 
     @validate_order_in_plan_number
@@ -45,6 +52,11 @@ class ExercisePlanService:
         user_id: int,
         payload: ExercisePlanBase,
     ):
+        if payload.exercise_set_plans:
+            # nested set numbers move set plans, lock their list before reading the positions
+            # (ownership was checked by the decorator)
+            await set_plan_ordering.lock(self.repos.session, exercise_plan_id)
+
         exercise_plan = await self.repos.session.scalar(
             select(ExercisePlan)
             .where(ExercisePlan.id == exercise_plan_id)
@@ -54,9 +66,11 @@ class ExercisePlanService:
                 WorkoutPlan.id == workout_plan_id,
             )
             .options(selectinload(ExercisePlan.exercise_set_plans))
+            .execution_options(populate_existing=True)
         )
         ExercisePlanBase.update_entity(payload, entity=exercise_plan)
-        
+        await self._move_set_plans(exercise_plan, payload)
+
         await self.repos.session.commit()
 
         return await self.repos.exercise_plan.get_one(
@@ -64,6 +78,38 @@ class ExercisePlanService:
             options=[selectinload(ExercisePlan.exercise_set_plans)],
         )
 
+    async def _move_set_plans(
+        self, exercise_plan: ExercisePlan, payload: ExercisePlanBase
+    ) -> None:
+        """
+        Applies the `set_number` of the nested set plans of an update, which `update_entity`
+        does not write (it is computed from `position`): the set plans are respaced in the
+        requested order. The caller holds the exercise plan's set ordering lock.
+        """
+        set_plans = {set_plan.id: set_plan for set_plan in exercise_plan.exercise_set_plans}
+        requested_set_numbers = {
+            set_item.id: set_item.set_number
+            for set_item in payload.exercise_set_plans or []
+            if set_item.id in set_plans and set_item.set_number is not None
+        }
+        if not requested_set_numbers:
+            return
+
+        for set_plan_id, set_number in requested_set_numbers.items():
+            if not 1 <= set_number <= len(set_plans):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"set_number passed {set_number} for set plan {set_plan_id} is not valid, "
+                    f"set_number should be between 1 and {len(set_plans)}.",
+                )
+
+        rows = [
+            {"id": set_plan.id, "position": set_plan.position}
+            for set_plan in set_plans.values()
+        ]
+        for set_plan_id, position in moved_positions(rows, requested_set_numbers).items():
+            set_plans[set_plan_id].position = position
+
     async def get_one_exercise_plan(
         self, workout_plan_id: int, user_id: int, exercise_plan_id: int
     ) -> ExercisePlanBase:
@@ -75,10 +121,14 @@ class ExercisePlanService:
 
     @validate_order_in_plan_number
     async def add_exercise_plan_to_workout(
-        self, workout_plan_id: int, payload: ExercisePlanBase, **kwargs
+        self, workout_plan_id: int, payload: ExercisePlanBase, position: int, **kwargs
     ):
         payload.workout_plan_id = workout_plan_id
         created_plan = ExercisePlanBase.create_entity(payload)
+        created_plan.position = position
+        set_plan_ordering.place_new(
+            created_plan.exercise_set_plans, payload.exercise_set_plans or []
+        )
         self.repos.session.add(created_plan)
         await self.repos.session.commit()
         return await self.repos.exercise_plan.get_one(
@@ -93,17 +143,69 @@ class ExercisePlanService:
             exercise_plan_id=exercise_plan_id,
             user_id=user_id,
         )
+        # siblings keep their positions, their dense order closes the gap on its own
+        return deleted_exercise
+
+    async def reorder_exercise_plans(
+        self, workout_plan_id: int, user_id: int, payload: ReorderExercisePlansRequest
+    ) -> list[ExercisePlanBase]:
+        """
+        Applies the full desired order of a workout plan's exercise plans, and of the set plans
+        of any exercise plan listing `set_plan_ids`, in one statement per table.
+        """
         session = self.repos.session
-        old_order = deleted_exercise.order_in_plan
-        # Shift remaining items down (decrement order_in_plan by 1)
-        # This fills the gap left by the deleted exercise.
-        await session.execute(
-            update(ExercisePlan)
-            .where(
-                ExercisePlan.workout_plan_id == workout_plan_id,
-                ExercisePlan.order_in_plan > old_order,
+
+        await self.repos.workout_plan.get_one(
+            val=workout_plan_id,
+            where_clause=[WorkoutPlan.user_id == user_id],
+        )
+        await exercise_plan_ordering.lock(session, workout_plan_id)
+
+        exercise_plan_ids = set(
+            await session.scalars(
+                select(ExercisePlan.id).where(
+                    ExercisePlan.workout_plan_id == workout_plan_id
+                )
             )
-            .values(order_in_plan=ExercisePlan.order_in_plan - 1)
         )
+        requested_ids = {item.id for item in payload.exercise_plans}
+        if requested_ids != exercise_plan_ids:
+            raise HTTPException(
+                status_code=400,
+                detail="exercise_plans should list every exercise plan of the workout plan exactly once, "
+                f"expected ids {sorted(exercise_plan_ids)}",
+            )
 
-        return deleted_exercise
+        set_orders = [item for item in payload.exercise_plans if item.set_plan_ids is not None]
+        if set_orders:
+            await set_plan_ordering.lock(session, *[item.id for item in set_orders])
+            set_plan_ids: dict[int, set[int]] = {item.id: set() for item in set_orders}
+            rows = await session.execute(
+                select(ExerciseSetPlan.id, ExerciseSetPlan.exercise_plan_id).where(
+                    ExerciseSetPlan.exercise_plan_id.in_(set_plan_ids.keys())
+                )
+            )
+            for set_plan_id, exercise_plan_id in rows:
+                set_plan_ids[exercise_plan_id].add(set_plan_id)
+
+            for item in set_orders:
+                if set(item.set_plan_ids) != set_plan_ids[item.id]:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"set_plan_ids of exercise plan {item.id} should list each of its set plans "
+                        f"exactly once, expected ids {sorted(set_plan_ids[item.id])}",
+                    )
+
+        await exercise_plan_ordering.apply_order(
+            session, [[item.id for item in payload.exercise_plans]]
+        )
+        await set_plan_ordering.apply_order(
+            session, [item.set_plan_ids for item in set_orders]
+        )
+        await session.commit()
+
+        return await self.repos.exercise_plan.get_all(
+            where_clause=[ExercisePlan.workout_plan_id == workout_plan_id],
+            order_clause=[asc(ExercisePlan.position)],
+            options=[selectinload(ExercisePlan.exercise_set_plans)],
+        )
@@ -1,9 +1,10 @@
+from app.api.v1.schema import WorkoutSessionBase
 from app.api.v1.schema.workout_plan import ScheduleBase
 from app.api.v1.workouts.schema import (
     CreateWorkoutScheduleRequest,
     WorkoutPlanSchedulePagination,
 )
-from app.models import WorkoutPlanSchedule
+from app.models import WorkoutPlanSchedule, WorkoutSessionStatus
 from app.repositories import Repos
 
 
@@ -14,12 +15,34 @@ class WorkoutScheduleService:
     async def create_workout_schedule(
         self, user_id: int, workout_plan_id: int, payload: CreateWorkoutScheduleRequest
     ):
+        """
+        Creates the schedule and its scheduled workout session in one commit. Reminders and
+        auto-start are derived from these rows by the beat tasks, so nothing is enqueued here.
+        """
         data = ScheduleBase(
             **payload.model_dump(by_alias=False, exclude_unset=True),
             workout_plan_id=workout_plan_id,
             user_id=user_id,
         )
-        return await self.repos.workout_schedule.create(data=data)
+        try:
+            created_schedule = await self.repos.workout_schedule.create(
+                data=data, commit=False
+            )
+            await self.repos.workout_session.create(
+                data=WorkoutSessionBase(
+                    workout_plan_id=workout_plan_id,
+                    user_id=user_id,
+                    schedule_id=created_schedule.id,
+                    status=WorkoutSessionStatus.scheduled,
+                ),
+                commit=False,
+            )
+            await self.repos.session.commit()
+        except Exception:
+            await self.repos.session.rollback()
+            raise
+
+        return created_schedule
 
     async def get_many_workout_schedules(
         self,
@@ -43,6 +66,7 @@ class WorkoutScheduleService:
                 WorkoutPlanSchedule.user_id == user_id,
             ],
             order_clause=pagination.sort_fields,
+            count_mode=pagination.count_mode,
         )
 
     async def get_workout_schedule(
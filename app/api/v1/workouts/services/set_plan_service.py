@@ -13,10 +13,14 @@ class ExerciseSetPlanService:
 
     @validate_set_number
     async def add_set_to_exercise_plan(
-        self, exercise_plan_id: int, payload: ExerciseSetPlanBase, **kwargs
+        self, exercise_plan_id: int, payload: ExerciseSetPlanBase, position: int, **kwargs
     ):
         payload.exercise_plan_id = exercise_plan_id
-        return await self.repos.exercise_set_plan.create(data=payload)
+        created_set = ExerciseSetPlanBase.create_entity(payload)
+        created_set.position = position
+        self.repos.session.add(created_set)
+        await self.repos.session.commit()
+        return await self.repos.exercise_set_plan.get_one(val=created_set.id)
 
     async def get_one_set_plan(
         self,
@@ -47,7 +51,7 @@ class ExerciseSetPlanService:
             WorkoutPlan.id == workout_plan_id,
             ExercisePlan.id == exercise_plan_id,
         ]
-        base_order_clause = [asc(ExerciseSetPlan.set_number)]
+        base_order_clause = [asc(ExerciseSetPlan.position)]
 
         if pagination.skip:
             return await self.repos.exercise_set_plan.get_all(
@@ -59,6 +63,7 @@ class ExerciseSetPlanService:
             size=pagination.size,
             where_clause=[*pagination.filter_fields, *base_where_clause],
             order_clause=[*pagination.sort_fields, *base_order_clause],
+            count_mode=pagination.count_mode,
         )
 
     async def delete_set_plan(
@@ -76,17 +81,8 @@ class ExerciseSetPlanService:
             commit=False,
         )
 
+        # siblings keep their positions, their dense set number closes the gap on its own
         session = self.repos.session
-        old_set_number = deleted_set.set_number
-
-        await session.execute(
-            update(ExerciseSetPlan)
-            .where(
-                ExerciseSetPlan.exercise_plan_id == exercise_plan_id,
-                ExerciseSetPlan.set_number > old_set_number,
-            )
-            .values(set_number=ExerciseSetPlan.set_number - 1)
-        )
         await session.commit()
 
         return deleted_set
@@ -98,7 +94,16 @@ class ExerciseSetPlanService:
         payload: ExerciseSetPlanBase,
         **kwargs,
     ):
-        return await self.repos.exercise_set_plan.update_one(
-            data=payload,
-            where_clause=[ExerciseSetPlan.id == exercise_set_plan_id],
+        # set_number is derived from position, which the decorator has already moved
+        await self.repos.session.execute(
+            update(ExerciseSetPlan)
+            .where(ExerciseSetPlan.id == exercise_set_plan_id)
+            .values(
+                payload.model_dump(
+                    exclude_none=True, exclude={"id", "set_number", "created_at", "updated_at"}, by_alias=False
+                )
+            )
         )
+        await self.repos.session.commit()
+
+        return await self.repos.exercise_set_plan.get_one(val=exercise_set_plan_id)
@@ -8,9 +8,18 @@ from app.api.v1.workouts.schema import (
     WorkoutPlanReadPaginatedItem,
     WorkoutPlanPagination,
 )
+from app.api.v1.schema.workout_plan import ExercisePlanBase, ExerciseSetPlanBase
+from app.api.v1.workouts.utils.ordering import (
+    dense_orders,
+    exercise_plan_ordering,
+    moved_positions,
+    place_new_plans,
+    set_plan_ordering,
+)
 from app.core.auth.schema import UserRead
-from app.models import ExercisePlan, WorkoutPlan
-from sqlalchemy import select
+from app.models import ExercisePlan, ExerciseSetPlan, WorkoutPlan
+from fastapi import HTTPException
+from sqlalchemy import delete, select
 
 
 class WorkoutPlanService:
@@ -33,17 +42,19 @@ class WorkoutPlanService:
                     WorkoutPlan.user_id == user_data.id,
                 ],
                 order_clause=pagination.sort_fields,
+                count_mode=pagination.count_mode,
             )
             workout_ls = workout_pagination.result
 
+        summaries = await self.repos.workout_plan.get_summaries_for_workouts(
+            [item.id for item in workout_ls]
+        )
+
         workout_plans: list[WorkoutPlanReadPaginatedItem] = []
 
         for item in workout_ls:
-            exercise_count = (
-                await self.repos.workout_plan.get_exercise_count_for_workout(item.id)
-            )
-            target_workout_plan_muscles = (
-                await self.repos.workout_plan.get_muscles_for_workout(item.id)
+            exercise_count, target_workout_plan_muscles = summaries.get(
+                item.id, (0, [])
             )
             item_result = WorkoutPlanReadPaginatedItem(
                 **item.model_dump(exclude_none=True, by_alias=False),
@@ -74,40 +85,157 @@ class WorkoutPlanService:
     async def update_workout_plan(
         self, user_data: UserRead, data: UpdateWorkoutPlanRequest
     ) -> WorkoutPlanBase:
-        workout_data = await self.repos.session.scalar(
-            select(WorkoutPlan)
-            .where(WorkoutPlan.id == data.id, WorkoutPlan.user_id == user_data.id)
-            .options(
-                selectinload(WorkoutPlan.exercise_plans).selectinload(
-                    ExercisePlan.exercise_set_plans
-                )
-            )
+        """
+        Diffs the request against the stored plan tree and writes only what changed: one
+        `UPDATE ... RETURNING` per table for the changed rows (positions included when orders
+        move) and one `DELETE` for cleared lists. The response is built from the rows read
+        up front merged with the returned ones, so the tree is not loaded a second time.
+
+        Child lists are only touched when sent: an omitted (or null) `exercise_plans` or
+        `exercise_set_plans` leaves the children as they are, an explicitly empty one removes them.
+        """
+        session = self.repos.session
+        update_children = (
+            "exercise_plans" in data.model_fields_set and data.exercise_plans is not None
         )
-        workout_plan = WorkoutPlanBase(
-            id=workout_data.id,
-            title=data.title,
-            description=data.description,
-            user_id=user_data.id,
-            comments=data.comments,
+        clear_exercise_plans = update_children and not data.exercise_plans
+
+        workout_plan = await self.repos.workout_plan.get_one(
+            val=data.id, where_clause=[WorkoutPlan.user_id == user_data.id]
         )
 
-        if data.exercise_plans is not None and len(data.exercise_plans) > 0:
-            workout_plan.exercise_plans = data.exercise_plans
+        if update_children:
+            # positions are renumbered below, lock the lists (once owned) before reading them
+            await exercise_plan_ordering.lock(session, data.id)
 
-        WorkoutPlanBase.update_entity(schema=workout_plan, entity=workout_data)
+        exercise_plans = {
+            row["id"]: dict(row)
+            for row in (
+                await session.execute(
+                    select(*ExercisePlan.table().c).where(
+                        ExercisePlan.workout_plan_id == data.id
+                    )
+                )
+            ).mappings()
+        }
 
-        await self.repos.session.commit()
+        if update_children:
+            await set_plan_ordering.lock(session, *exercise_plans.keys())
 
-        return await self.repos.workout_plan.get_one(
-            val=data.id,
-            where_clause=[WorkoutPlan.user_id == user_data.id],
-            options=[
-                selectinload(WorkoutPlan.exercise_plans).selectinload(
-                    ExercisePlan.exercise_set_plans
+        set_plans: dict[int, dict[int, dict]] = {plan_id: {} for plan_id in exercise_plans}
+        for row in (
+            await session.execute(
+                select(*ExerciseSetPlan.table().c).where(
+                    ExerciseSetPlan.exercise_plan_id.in_(exercise_plans.keys())
                 )
-            ],
+            )
+        ).mappings():
+            set_plans[row["exercise_plan_id"]][row["id"]] = dict(row)
+
+        workout_changes = _changed_columns(
+            data.model_dump(include={"title", "description", "comments"}, by_alias=False),
+            workout_plan.model_dump(by_alias=False),
         )
 
+        exercise_plan_updates: dict[int, dict] = {}
+        set_plan_updates: dict[int, dict] = {}
+        cleared_set_lists: list[int] = []
+
+        if update_children:
+            requested_orders: dict[int, int] = {}
+            for item in data.exercise_plans:
+                current = exercise_plans.get(item.id)
+                if current is None:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Integrity Error: passed an unknown id to relation: {item.id}",
+                    )
+
+                changes = _changed_columns(
+                    item.model_dump(exclude=_NOT_WRITTEN, by_alias=False), current
+                )
+                if changes:
+                    exercise_plan_updates[item.id] = changes
+                if item.order_in_plan is not None:
+                    requested_orders[item.id] = item.order_in_plan
+
+                if (
+                    "exercise_set_plans" not in item.model_fields_set
+                    or item.exercise_set_plans is None
+                ):
+                    continue
+                if not item.exercise_set_plans:
+                    # an explicitly empty list replaces the exercise plan's sets with none
+                    if set_plans[item.id]:
+                        cleared_set_lists.append(item.id)
+                    continue
+
+                requested_set_numbers: dict[int, int] = {}
+                for set_item in item.exercise_set_plans:
+                    current_set = set_plans[item.id].get(set_item.id)
+                    if current_set is None:
+                        raise HTTPException(
+                            status_code=400,
+                            detail=f"Integrity Error: passed an unknown id to relation: {set_item.id}",
+                        )
+
+                    set_changes = _changed_columns(
+                        set_item.model_dump(exclude=_NOT_WRITTEN, by_alias=False),
+                        current_set,
+                    )
+                    if set_changes:
+                        set_plan_updates[set_item.id] = set_changes
+                    if set_item.set_number is not None:
+                        requested_set_numbers[set_item.id] = set_item.set_number
+
+                for set_id, position in moved_positions(
+                    list(set_plans[item.id].values()), requested_set_numbers
+                ).items():
+                    set_plan_updates.setdefault(set_id, {})["position"] = position
+
+            for plan_id, position in moved_positions(
+                list(exercise_plans.values()), requested_orders
+            ).items():
+                exercise_plan_updates.setdefault(plan_id, {})["position"] = position
+
+        if workout_changes:
+            [workout_row] = await self.repos.workout_plan.update_rows(
+                [{"id": data.id, **workout_changes}], commit=False
+            )
+            workout_plan = WorkoutPlanBase(**workout_row)
+
+        if clear_exercise_plans and exercise_plans:
+            # their set plans go with them (ON DELETE CASCADE)
+            await session.execute(
+                delete(ExercisePlan).where(ExercisePlan.workout_plan_id == data.id)
+            )
+            exercise_plans, set_plans = {}, {}
+
+        if cleared_set_lists:
+            await session.execute(
+                delete(ExerciseSetPlan).where(
+                    ExerciseSetPlan.exercise_plan_id.in_(cleared_set_lists)
+                )
+            )
+            for plan_id in cleared_set_lists:
+                set_plans[plan_id] = {}
+
+        for row in await self.repos.exercise_plan.update_rows(
+            [{"id": plan_id, **changes} for plan_id, changes in exercise_plan_updates.items()],
+            commit=False,
+        ):
+            exercise_plans[row["id"]] = row
+
+        for row in await self.repos.exercise_set_plan.update_rows(
+            [{"id": set_id, **changes} for set_id, changes in set_plan_updates.items()],
+            commit=False,
+        ):
+            set_plans[row["exercise_plan_id"]][row["id"]] = row
+
+        await session.commit()
+
+        return _plan_tree(workout_plan, exercise_plans, set_plans)
+
     async def add_workout_plan(
         self, user_data: UserRead, create_data: CreateWorkoutPlanRequest
     ) -> WorkoutPlanBase:
@@ -121,6 +249,9 @@ class WorkoutPlanService:
         )
 
         parsed_workout_data = WorkoutPlanBase.create_entity(workout_data_create)
+        place_new_plans(
+            parsed_workout_data.exercise_plans, workout_data_create.exercise_plans or []
+        )
 
         try:
             self.repos.session.add(parsed_workout_data)
@@ -152,3 +283,50 @@ class WorkoutPlanService:
                 WorkoutPlan.user_id == user_data.id,
             ],
         )
+
+
+# request fields that are not written as columns by a nested update
+_NOT_WRITTEN = {
+    "id",
+    "order_in_plan",
+    "set_number",
+    "exercise_set_plans",
+    "workout_plan_id",
+    "exercise_plan_id",
+    "created_at",
+    "updated_at",
+}
+
+
+def _changed_columns(requested: dict, current: dict) -> dict:
+    # like `AppBaseModel.update_entity`: None leaves a column as is, unknown fields are ignored
+    return {
+        key: value
+        for key, value in requested.items()
+        if key in current and value is not None and value != current[key]
+    }
+
+
+def _plan_tree(
+    workout_plan: WorkoutPlanBase,
+    exercise_plans: dict[int, dict],
+    set_plans: dict[int, dict[int, dict]],
+) -> WorkoutPlanBase:
+    orders = dense_orders(list(exercise_plans.values()))
+    tree = []
+    for plan_id, plan_row in sorted(exercise_plans.items(), key=lambda item: orders[item[0]]):
+        set_numbers = dense_orders(list(set_plans[plan_id].values()))
+        tree.append(
+            ExercisePlanBase(
+                **plan_row,
+                order_in_plan=orders[plan_id],
+                exercise_set_plans=[
+                    ExerciseSetPlanBase(**set_row, set_number=set_numbers[set_id])
+                    for set_id, set_row in sorted(
+                        set_plans[plan_id].items(), key=lambda item: set_numbers[item[0]]
+                    )
+                ],
+            )
+        )
+
+    return workout_plan.model_copy(update={"exercise_plans": tree})
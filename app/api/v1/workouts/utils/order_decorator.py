@@ -2,9 +2,10 @@
 import functools
 from typing import TYPE_CHECKING, Any, Callable, Coroutine, Optional
 from fastapi import HTTPException
-from sqlalchemy import select, func as sqlfunc, update
+from sqlalchemy import update
 
 from app.api.v1.schema.workout_plan import ExercisePlanBase, ExerciseSetPlanBase
+from app.api.v1.workouts.utils.ordering import exercise_plan_ordering, set_plan_ordering
 from app.models import ExercisePlan, ExerciseSetPlan, WorkoutPlan
 
 if TYPE_CHECKING:
@@ -45,12 +46,14 @@ def validate_order_in_plan_number(func: Callable) -> Coroutine[Any, Any, Any]:
                 where_clause=[WorkoutPlan.user_id == user_id],
             )
 
-        # 2. Get the current maximum order in plan order.
-        max_order_in_plan = await self.repos.session.scalar(
-            select(sqlfunc.max(ExercisePlan.order_in_plan)).where(
-                ExercisePlan.workout_plan_id == workout_plan_id
-            )
-        )
+        # 2. Serialize ordering writes to this workout plan until the transaction ends, so the
+        # reads below cannot be raced by a concurrent insert or move. Taken once ownership is
+        # checked, so nobody can hold the lock on a workout plan they do not own.
+        session = self.repos.session
+        await exercise_plan_ordering.lock(session, workout_plan_id)
+
+        # 2.a Get the current maximum order in plan order (orders are dense, 1..N).
+        max_order_in_plan = await exercise_plan_ordering.count(session, workout_plan_id)
 
         new_order = payload.order_in_plan
         # 3.a Update Scenario: we are updating an existing exercise plan
@@ -76,46 +79,22 @@ def validate_order_in_plan_number(func: Callable) -> Coroutine[Any, Any, Any]:
                 detail=f"order_in_plan passed {payload.order_in_plan} is larger than 1",
             )
 
-        session = self.repos.session
+        # 4. Place the exercise plan, only its own position is written (siblings keep theirs).
         if old_exercise:
-            old_order = old_exercise.order_in_plan
-            if new_order < old_order:
-                # Moving item up (e.g., from order 5 to order 2)
-                # Increment order_in_plan for items that were between new_order and old_order-1
-                await session.execute(
-                    update(ExercisePlan)
-                    .where(
-                        ExercisePlan.workout_plan_id == workout_plan_id,
-                        ExercisePlan.order_in_plan >= new_order,
-                        ExercisePlan.order_in_plan < old_order,
-                        ExercisePlan.id
-                        != exercise_plan_id,  # Exclude the target item itself
-                    )
-                    .values(order_in_plan=ExercisePlan.order_in_plan + 1)
+            if new_order != old_exercise.order_in_plan:
+                position = await exercise_plan_ordering.position_for(
+                    session, workout_plan_id, new_order, exclude_id=exercise_plan_id
                 )
-            elif new_order > old_order:  # new_order > old_order
-                # Moving item down (e.g., from order 2 to order 5)
-                # Decrement order_in_plan for items that were between old_order+1 and new_order
                 await session.execute(
                     update(ExercisePlan)
-                    .where(
-                        ExercisePlan.workout_plan_id == workout_plan_id,
-                        ExercisePlan.order_in_plan > old_order,
-                        ExercisePlan.order_in_plan <= new_order,
-                        ExercisePlan.id
-                        != exercise_plan_id,  # Exclude the target item itself
-                    )
-                    .values(order_in_plan=ExercisePlan.order_in_plan - 1)
+                    .where(ExercisePlan.id == exercise_plan_id)
+                    .values(position=position)
                 )
         else:
-            await session.execute(
-                update(ExercisePlan)
-                .where(
-                    ExercisePlan.workout_plan_id == workout_plan_id,
-                    ExercisePlan.order_in_plan >= new_order,
-                )
-                .values(order_in_plan=ExercisePlan.order_in_plan + 1)
+            kwargs["position"] = await exercise_plan_ordering.position_for(
+                session, workout_plan_id, new_order
             )
+
         return await func(
             self,
             *args,
@@ -163,12 +142,13 @@ def validate_set_number(func: Callable) -> Coroutine[Any, Any, Any]:
                 exercise_plan_id=exercise_plan_id,
             )
 
-        # 2. Get the current maximum order in set number.
-        max_set_number = await self.repos.session.scalar(
-            select(sqlfunc.max(ExerciseSetPlan.set_number)).where(
-                ExerciseSetPlan.exercise_plan_id == exercise_plan_id
-            )
-        )
+        # 2. Serialize ordering writes to this exercise plan until the transaction ends, once
+        # ownership is checked.
+        session = self.repos.session
+        await set_plan_ordering.lock(session, exercise_plan_id)
+
+        # 2.a Get the current maximum order in set number (set numbers are dense, 1..N).
+        max_set_number = await set_plan_ordering.count(session, exercise_plan_id)
 
         # 3. Validate the new set number.
         new_set_number = payload.set_number
@@ -193,49 +173,23 @@ def validate_set_number(func: Callable) -> Coroutine[Any, Any, Any]:
                 detail=f"set_number passed {new_set_number} is larger than 1",
             )
 
-        # when updating, fix order for others
-        session = self.repos.session
+        # 4. Place the set plan, only its own position is written (siblings keep theirs).
         if old_set_plan:
-            old_order = old_set_plan.set_number
-            if new_set_number < old_order:
-                # Moving item up (e.g., from order 5 to order 2)
-                # Increment order_in_plan for items that were between new_order and old_order-1
-                await session.execute(
-                    update(ExerciseSetPlan)
-                    .where(
-                        ExerciseSetPlan.exercise_plan_id == exercise_plan_id,
-                        ExerciseSetPlan.set_number >= new_set_number,
-                        ExerciseSetPlan.set_number < old_order,
-                        ExerciseSetPlan.id
-                        != exercise_set_plan_id,  # Exclude the target item itself
-                    )
-                    .values(set_number=ExerciseSetPlan.set_number + 1)
+            if new_set_number != old_set_plan.set_number:
+                position = await set_plan_ordering.position_for(
+                    session, exercise_plan_id, new_set_number, exclude_id=exercise_set_plan_id
                 )
-            elif new_set_number > old_order:  # new_order > old_order
-                # Moving item down (e.g., from order 2 to order 5)
-                # Decrement order_in_plan for items that were between old_order+1 and new_order
                 await session.execute(
                     update(ExerciseSetPlan)
-                    .where(
-                        ExerciseSetPlan.exercise_plan_id == exercise_plan_id,
-                        ExerciseSetPlan.set_number > old_order,
-                        ExerciseSetPlan.set_number <= new_set_number,
-                        ExerciseSetPlan.id
-                        != exercise_set_plan_id,  # Exclude the target item itself
-                    )
-                    .values(set_number=ExerciseSetPlan.set_number - 1)
+                    .where(ExerciseSetPlan.id == exercise_set_plan_id)
+                    .values(position=position)
                 )
         else:
-            await session.execute(
-                update(ExerciseSetPlan)
-                .where(
-                    ExerciseSetPlan.exercise_plan_id == exercise_plan_id,
-                    ExerciseSetPlan.set_number >= payload.set_number,
-                )
-                .values(set_number=ExerciseSetPlan.set_number + 1)
+            kwargs["position"] = await set_plan_ordering.position_for(
+                session, exercise_plan_id, new_set_number
             )
+
         # If all validations pass, call the original function.
-        print("All validations passed. Proceeding with original function logic.")
         return await func(
             self,
             *args,
@@ -0,0 +1,272 @@
+from bisect import bisect_left
+from typing import Any, Optional, Sequence
+
+from pydantic import BaseModel
+from sqlalchemy import BigInteger, Integer, column, func, inspect, select, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import InstrumentedAttribute, set_committed_value
+
+from app.models import POSITION_GAP, ExercisePlan, ExerciseSetPlan
+
+
+class SparseOrdering:
+    """
+    Places rows of an ordered list (the exercise plans of a workout plan, the set plans of an
+    exercise plan) by a sparse `position` key. Inserting or moving a row picks a position
+    between its new neighbours, so only that row is written; the siblings are renumbered
+    POSITION_GAP apart only once two neighbours have no room left between them.
+
+    The dense 1..N order seen by the API (`order_in_plan`, `set_number`) is not stored: reads
+    fill it in on the loaded entities with `attach_orders`, from their lists' positions.
+
+    Writers of one list are serialized with `lock`, a transaction-scoped advisory lock on the
+    parent; otherwise two concurrent inserts could pick the same position.
+
+    Example:
+        await exercise_plan_ordering.lock(session, workout_plan_id)
+        position = await exercise_plan_ordering.position_for(session, workout_plan_id, order=2)
+    """
+
+    def __init__(
+        self,
+        model,
+        parent_column: InstrumentedAttribute,
+        order_attribute: str,
+        lock_namespace: int,
+    ):
+        self.model = model
+        self.parent_column = parent_column
+        # name of the dense order, on the model (a `query_expression`) and on its schemas
+        self.order_attribute = order_attribute
+        # first key of the two-key advisory lock, so parent ids of different lists never collide
+        self.lock_namespace = lock_namespace
+
+    async def lock(self, session: AsyncSession, *parent_ids: int) -> None:
+        """
+        Blocks until this transaction holds the ordering lock of every list in `parent_ids`.
+        The locks are released on commit or rollback. Ids are taken in ascending order so
+        writers locking several lists cannot deadlock each other.
+        """
+        for parent_id in sorted(set(parent_ids)):
+            await session.execute(
+                select(func.pg_advisory_xact_lock(self.lock_namespace, parent_id))
+            )
+
+    async def count(self, session: AsyncSession, parent_id: int) -> int:
+        return await session.scalar(
+            select(func.count(self.model.id)).where(self.parent_column == parent_id)
+        )
+
+    async def attach_orders(self, session: AsyncSession, entities: Sequence[Any]) -> None:
+        """
+        Fills in the dense order of loaded entities, with one query over the positions of
+        their lists (served by the `(parent, position)` unique index). Entities no longer in
+        their list, e.g. the ones returned by a DELETE, get the order they had.
+        """
+        if not entities:
+            return
+
+        parent_key = self.parent_column.key
+        positions: dict[int, list[int]] = {
+            getattr(entity, parent_key): [] for entity in entities
+        }
+        orders: dict[int, int] = {}
+        rows = await session.execute(
+            select(self.model.id, self.parent_column, self.model.position)
+            .where(self.parent_column.in_(positions.keys()))
+            .order_by(self.parent_column, self.model.position)
+        )
+        for row_id, parent_id, position in rows:
+            positions[parent_id].append(position)
+            orders[row_id] = len(positions[parent_id])
+
+        for entity in entities:
+            order = orders.get(entity.id)
+            if order is None:
+                order = bisect_left(positions[getattr(entity, parent_key)], entity.position) + 1
+            set_committed_value(entity, self.order_attribute, order)
+
+    def place_new(self, entities: Sequence[Any], schemas: Sequence[BaseModel]) -> None:
+        """
+        Sets the positions of a list created in memory (e.g. the exercise plans of a new
+        workout plan), POSITION_GAP apart in the dense order its `schemas` request.
+        `entities[i]` is the entity built from `schemas[i]`; ties keep their given order.
+        """
+        ranked = sorted(
+            range(len(entities)),
+            key=lambda index: (getattr(schemas[index], self.order_attribute), index),
+        )
+        for rank, index in enumerate(ranked, start=1):
+            entities[index].position = rank * POSITION_GAP
+
+    async def _neighbours(
+        self,
+        session: AsyncSession,
+        parent_id: int,
+        order: int,
+        exclude_id: Optional[int] = None,
+    ) -> tuple[int, Optional[int]]:
+        """Positions of the rows that end up right before and right after `order`."""
+        stmt = select(self.model.position).where(self.parent_column == parent_id)
+        if exclude_id is not None:
+            stmt = stmt.where(self.model.id != exclude_id)
+        stmt = stmt.order_by(self.model.position)
+
+        if order == 1:
+            positions = (await session.scalars(stmt.limit(1))).all()
+            return 0, positions[0] if positions else None
+
+        positions = (await session.scalars(stmt.offset(order - 2).limit(2))).all()
+        return positions[0], positions[1] if len(positions) > 1 else None
+
+    async def rebalance(self, session: AsyncSession, parent_id: int) -> None:
+        """Renumbers every row of the list POSITION_GAP apart, keeping their order."""
+        ranked = (
+            select(
+                self.model.id,
+                (
+                    func.row_number().over(order_by=(self.model.position, self.model.id))
+                    * POSITION_GAP
+                ).label("position"),
+            )
+            .where(self.parent_column == parent_id)
+            .subquery()
+        )
+        await session.execute(
+            update(self.model)
+            .where(self.model.id == ranked.c.id)
+            .values(position=ranked.c.position)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def apply_order(self, session: AsyncSession, ordered_ids: list[list[int]]) -> None:
+        """
+        Writes whole lists in one statement (`UPDATE ... FROM (VALUES ...)`): every list in
+        `ordered_ids` holds the ids of one parent's rows in their new order, and is renumbered
+        POSITION_GAP apart. Rows swapping positions rely on the unique constraint being deferred.
+        """
+        rows = [
+            (row_id, index * POSITION_GAP)
+            for ids in ordered_ids
+            for index, row_id in enumerate(ids, start=1)
+        ]
+        if not rows:
+            return
+
+        new_positions = values(
+            column("id", Integer), column("position", BigInteger), name="new_positions"
+        ).data(rows)
+        await session.execute(
+            update(self.model)
+            .where(self.model.id == new_positions.c.id)
+            .values(position=new_positions.c.position)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def position_for(
+        self,
+        session: AsyncSession,
+        parent_id: int,
+        order: int,
+        exclude_id: Optional[int] = None,
+    ) -> int:
+        """
+        Returns the position that places a row at the 1-based `order` of the list.
+
+        Args:
+            parent_id: id of the list's parent row.
+            order: the dense order the row should end up at.
+            exclude_id: id of the row being moved, if it is already in the list.
+        """
+        previous, following = await self._neighbours(session, parent_id, order, exclude_id)
+
+        if following is None:
+            return previous + POSITION_GAP
+
+        if following - previous < 2:
+            await self.rebalance(session, parent_id)
+            previous, following = await self._neighbours(session, parent_id, order, exclude_id)
+            if following is None:
+                return previous + POSITION_GAP
+
+        return (previous + following) // 2
+
+
+def respace(rows: list[dict[str, Any]], requested_orders: dict[int, int]) -> dict[int, int]:
+    """
+    New positions for a whole list of siblings (rows with `id` and `position`), spaced
+    POSITION_GAP apart in the requested dense order, e.g. after a nested update asked for new
+    `order_in_plan` values. Rows with a requested order take that slot (the next free one when
+    another requested row already has it), the others fill the remaining slots in their current
+    order. Only the rows whose position changes are returned.
+    """
+    current = sorted(rows, key=lambda row: row["position"])
+    slots: list[Optional[dict[str, Any]]] = [None] * len(current)
+
+    requested = sorted(
+        (row for row in current if row["id"] in requested_orders),
+        key=lambda row: (requested_orders[row["id"]], row["position"]),
+    )
+    for row in requested:
+        slot = min(max(requested_orders[row["id"]], 1), len(slots)) - 1
+        free = [index for index in range(slot, len(slots)) if slots[index] is None] or [
+            index for index in range(slot, -1, -1) if slots[index] is None
+        ]
+        slots[free[0]] = row
+
+    unplaced = iter(row for row in current if row["id"] not in requested_orders)
+    ordered = [row if row is not None else next(unplaced) for row in slots]
+
+    return {
+        row["id"]: index * POSITION_GAP
+        for index, row in enumerate(ordered, start=1)
+        if row["position"] != index * POSITION_GAP
+    }
+
+
+def moved_positions(rows: list[dict[str, Any]], requested_orders: dict[int, int]) -> dict[int, int]:
+    """`respace`, or no changes at all when every requested order is already the current one."""
+    current_orders = dense_orders(rows)
+    if all(current_orders[row_id] == order for row_id, order in requested_orders.items()):
+        return {}
+    return respace(rows, requested_orders)
+
+
+def dense_orders(rows: list[dict[str, Any]]) -> dict[int, int]:
+    """The 1-based order of each row (by id) among its siblings, as `SparseOrdering.attach_orders` counts it."""
+    return {
+        row["id"]: index
+        for index, row in enumerate(sorted(rows, key=lambda row: row["position"]), start=1)
+    }
+
+
+# a writer needing both kinds of lock takes the exercise plan one (its workout plan) first
+exercise_plan_ordering = SparseOrdering(
+    ExercisePlan, ExercisePlan.workout_plan_id, "order_in_plan", lock_namespace=1
+)
+set_plan_ordering = SparseOrdering(
+    ExerciseSetPlan, ExerciseSetPlan.exercise_plan_id, "set_number", lock_namespace=2
+)
+
+
+async def attach_plan_orders(session: AsyncSession, exercise_plans: Sequence[ExercisePlan]) -> None:
+    """`order_in_plan` of the exercise plans, and `set_number` of their loaded set plans."""
+    await exercise_plan_ordering.attach_orders(session, exercise_plans)
+    await set_plan_ordering.attach_orders(
+        session,
+        [
+            set_plan
+            for exercise_plan in exercise_plans
+            if "exercise_set_plans" not in inspect(exercise_plan).unloaded
+            for set_plan in exercise_plan.exercise_set_plans
+        ],
+    )
+
+
+def place_new_plans(exercise_plans: Sequence[ExercisePlan], schemas: Sequence[BaseModel]) -> None:
+    """Positions of new exercise plans built by `create_entity`, and of their set plans."""
+    exercise_plan_ordering.place_new(exercise_plans, schemas)
+    for exercise_plan, schema in zip(exercise_plans, schemas):
+        set_plan_ordering.place_new(
+            exercise_plan.exercise_set_plans, schema.exercise_set_plans or []
+        )
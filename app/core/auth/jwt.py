@@ -1,9 +1,12 @@
+from typing import Optional
 from fastapi import Depends, Request
 from fastapi.security import HTTPBearer, APIKeyCookie
 import jwt
+from app.core.auth.principal_cache import PrincipalCache
 from app.core.auth.repository import UserRepository, get_user_repo
-from app.core.auth.schema import AccessToken, UserRead
+from app.core.auth.schema import AccessToken, UserPrincipal, UserRead
 from app.core.config import AppSettings, get_settings
+from app.dependencies.cache import get_principal_cache
 
 from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
 from app.core.exceptions import UnauthorizedException
@@ -14,9 +17,15 @@ logger = logging.getLogger("uvicorn")
 
 
 class JwtAuth:
-    def __init__(self, user_repo: UserRepository, settings: AppSettings):
+    def __init__(
+        self,
+        user_repo: UserRepository,
+        settings: AppSettings,
+        principal_cache: Optional[PrincipalCache] = None,
+    ):
         self.user_repo = user_repo
         self.settings = settings
+        self.principal_cache = principal_cache
 
     async def validate_token(self, token: AccessToken) -> UserRead:
         """Validate JWT token and return user with decoded payload"""
@@ -32,11 +41,37 @@ class JwtAuth:
             if not user_id:
                 raise UnauthorizedException("Token payload is invalid")
 
-            user_found = await self.user_repo.get_one(val=user_id, field="id")
+            # tokens issued before `iat`/`ver` were added are always resolved from the database
+            issued_at = payload.get("iat")
+            token_version = payload.get("ver", 0)
+
+            if self.principal_cache and issued_at is not None:
+                cached_user = await self.principal_cache.get(
+                    user_id=user_id, issued_at=issued_at, token_version=token_version
+                )
+                if cached_user:
+                    return cached_user
+
+            user_found = await self.user_repo.get_one(
+                val=user_id, field="id", return_model=UserPrincipal
+            )
             if not user_found:
                 raise UnauthorizedException
 
-            return user_found
+            if user_found.token_version != token_version:
+                raise UnauthorizedException("Token has been revoked")
+
+            user = UserRead(**user_found.model_dump(exclude={"token_version"}))
+
+            if self.principal_cache and issued_at is not None:
+                await self.principal_cache.set(
+                    user_id=user_id,
+                    issued_at=issued_at,
+                    token_version=user_found.token_version,
+                    user=user,
+                )
+
+            return user
 
         except ExpiredSignatureError as e:
             logger.info("[BaseJwtAuth]: Token has expired")
@@ -61,6 +96,9 @@ async def validate_jwt(
     user_repo: UserRepository = Depends(get_user_repo),
     settings: AppSettings = Depends(get_settings),
     credentials: str = Depends(get_token_cookie),
+    principal_cache: PrincipalCache = Depends(get_principal_cache),
 ):
-    jwt_auth = JwtAuth(user_repo=user_repo, settings=settings)
+    jwt_auth = JwtAuth(
+        user_repo=user_repo, settings=settings, principal_cache=principal_cache
+    )
     return await jwt_auth.validate_token(credentials)
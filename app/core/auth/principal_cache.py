@@ -0,0 +1,60 @@
+from typing import Optional
+
+from pydantic import TypeAdapter
+
+from app.core.auth.schema import UserRead
+from app.core.common.cache import TieredCache
+
+_user_adapter = TypeAdapter(UserRead)
+_version_adapter = TypeAdapter(int)
+
+
+class PrincipalCache:
+    """
+    Caches the user resolved from a JWT, so an authenticated request does not need a `users` query.
+
+    Principals are keyed on the user id and the token's `iat`, next to a per-user token version.
+    A cached principal is only served while the version carried by the token (`ver` claim) still
+    equals the cached version of the user; `revoke` moves the version forward, so tokens issued
+    before a password change fall through to the database and get rejected there. Only `revoke`
+    replaces a cached version: `set` may run with a version read before a concurrent revoke, so
+    it only records one when none is cached.
+
+    Revocation is immediate for the worker that performs it and for workers reading the Redis tier;
+    a worker holding the old version in its in-process tier accepts old tokens for at most
+    `PRINCIPAL_CACHE_TTL_SECONDS`.
+    """
+
+    def __init__(self, cache: TieredCache):
+        self.cache = cache
+
+    @staticmethod
+    def _principal_key(user_id: int | str, issued_at: int) -> str:
+        return f"principal:{user_id}:{issued_at}"
+
+    @staticmethod
+    def _version_key(user_id: int | str) -> str:
+        return f"version:{user_id}"
+
+    async def get(
+        self, user_id: int | str, issued_at: int, token_version: int
+    ) -> Optional[UserRead]:
+        current_version = await self.cache.get(
+            self._version_key(user_id), _version_adapter
+        )
+        if current_version is None or current_version != token_version:
+            return None
+
+        return await self.cache.get(
+            self._principal_key(user_id, issued_at), _user_adapter
+        )
+
+    async def set(
+        self, user_id: int | str, issued_at: int, token_version: int, user: UserRead
+    ) -> None:
+        await self.cache.add(self._version_key(user_id), token_version)
+        await self.cache.set(self._principal_key(user_id, issued_at), user)
+
+    async def revoke(self, user_id: int | str, token_version: int) -> None:
+        """Records `token_version` as the only version still accepted for `user_id`."""
+        await self.cache.set(self._version_key(user_id), token_version)
@@ -21,6 +21,11 @@ class UserReadWithPw(BaseModel):
     full_name: Optional[str] = None
     email: str
     hashed_password: str
+    token_version: int = 0
+
+
+class UserPrincipal(UserRead):
+    token_version: int = 0
 
 
 class UserData(AppBaseModel):
@@ -45,4 +50,9 @@ class UserSigninRequest(BaseModel):
 
 class UserSigninResponse(UserData):
     pass
+
+
+class UserPasswordChangeRequest(AppBaseModel):
+    current_password: str
+    new_password: str
     
\ No newline at end of file
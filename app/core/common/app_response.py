@@ -1,9 +1,14 @@
-from typing import Generic, Optional, TypeVar, Self, Type
+from dataclasses import dataclass
+import functools
+from typing import AsyncIterator, Generic, Optional, TypeVar, Self
 from pydantic import AliasGenerator, BaseModel, ConfigDict, Field
 from pydantic.alias_generators import to_camel
 from app.core.database.base_model import Base
-from sqlalchemy import inspect
+from sqlalchemy import Column, inspect
+from sqlalchemy.orm import ONETOMANY
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
 
 T = TypeVar("T")
 
@@ -21,9 +26,7 @@ class AppBaseModel(BaseModel):
 
     @classmethod
     def update_entity(cls, schema: Self, entity: Base) -> Base:
-        print(f"Checking schema: {schema.__class__.__name__}")
         if not cls.Meta.orm_model:
-            print("No ORM model configed in Meta")
             raise ValueError(
                 f"No ORM model configured for this pydantic class: {cls.__name__}"
             )
@@ -33,34 +36,15 @@ class AppBaseModel(BaseModel):
         if "id" not in dumped.keys():
             raise ValueError("Id is required for an update")
 
-        def get_subentity_parent_fk_name(
-            subentity_model: Type[Base], parent_model: Type[Base]
-        ) -> Optional[str]:
-            # print(f"subentity_model: {subentity_model}")
-            for _, relationship in inspect(subentity_model).relationships.items():
-                # print(
-                #     f"Relations for entity: {relationship.entity.class_} {parent_model.__class__}"
-                # )
-                if relationship.entity.class_ is parent_model.__class__:
-                    # print("Here it is matched!!")
-                    # Found the relationship, get the local foreign key column name
-                    fk_column = relationship.local_remote_pairs[0][0]
-                    fk_name = fk_column.name
-                    # print(f"fk_name: {fk_name}")
-                    return fk_name
-            return None
+        plan = entity_conversion_plan(type(schema), cls.Meta.orm_model)
 
         for key, value in dumped.items():
-            # print(f"Checking key, value for: {key} - {value}")
             if isinstance(value, list) and len(value) > 0:
                 if isinstance(value[0], BaseModel):
-                    # print(f"list found, key is: {key}")
-                    # subentity = None
-                    if value is not None and value[0].Meta.orm_model is not None:
-                        # print(f"accessing submodel key: {key}")
-                        # subentity = getattr(entity, key)
-                        # print(f"Got subentity: {subentity}")
-                        # set_subentity_parent_id_name(subentity=subentity[0])
+                    if key in plan.relationships and value[0].Meta.orm_model is not None:
+                        fk_name = plan.relationships[key]
+                        if not fk_name:
+                            continue
 
                         parent_relation_attr: list[Base] = getattr(entity, key)
                         existing_children_by_id = {
@@ -74,15 +58,9 @@ class AppBaseModel(BaseModel):
                                     detail=f"Integrity Error: passed an unknown id to relation: {schema.id}",
                                 )
 
-                            fk_name = get_subentity_parent_fk_name(
-                                subentity_model=schema.Meta.orm_model,
-                                parent_model=entity,
-                            )
-
-                            if fk_name:
-                                setattr(child_entity, fk_name, entity.id)
-                                setattr(schema, fk_name, entity.id)
-                                schema.update_entity(schema=schema, entity=child_entity)
+                            setattr(child_entity, fk_name, entity.id)
+                            setattr(schema, fk_name, entity.id)
+                            schema.update_entity(schema=schema, entity=child_entity)
 
             elif isinstance(value, AppBaseModel) and value.Meta.orm_model:
                 setattr(
@@ -90,7 +68,7 @@ class AppBaseModel(BaseModel):
                 )
 
             elif (
-                hasattr(entity, key)
+                key in plan.writable
                 and value is not None
                 and value != getattr(entity, key)
             ):
@@ -100,8 +78,6 @@ class AppBaseModel(BaseModel):
 
     @classmethod
     def create_entity(cls, schema: Self) -> Base:
-        print(f"Checking schema: {schema.__class__.__name__}")
-
         if not cls.Meta.orm_model:
             raise ValueError(
                 f"No ORM model configed in Meta for schema: {schema.__class__.__name__}"
@@ -109,9 +85,14 @@ class AppBaseModel(BaseModel):
 
         parsed = dict(schema)
 
+        plan = entity_conversion_plan(type(schema), cls.Meta.orm_model)
+
         entity = cls.Meta.orm_model()
 
         for key, value in parsed.items():
+            if key not in plan.writable:
+                continue
+
             if isinstance(value, list) and len(value):
                 if isinstance(value[0], AppBaseModel):
                     setattr(
@@ -127,9 +108,92 @@ class AppBaseModel(BaseModel):
         return entity
 
 
+@dataclass(frozen=True)
+class EntityConversionPlan:
+    """
+    How the fields of a schema map onto its ORM model, see `entity_conversion_plan`.
+
+    Attributes:
+        columns: Fields backed by a table column. Computed attributes (the dense
+            `order_in_plan`/`set_number` query expressions) are read-only and left out.
+        relationships: Fields backed by a relationship, mapped to the name of the child's
+            foreign key pointing back at the parent (None unless the relationship is one-to-many).
+    """
+
+    columns: frozenset[str]
+    relationships: dict[str, Optional[str]]
+
+    @property
+    def writable(self) -> frozenset[str]:
+        return self.columns | self.relationships.keys()
+
+
+@functools.cache
+def entity_conversion_plan(schema_cls: type[BaseModel], orm_model: type[Base]) -> EntityConversionPlan:
+    """
+    Builds, once per (schema class, ORM model) pair, the field map used by
+    `AppBaseModel.create_entity`/`update_entity`, so converting a nested plan does not
+    inspect the mapper for every child row.
+    """
+    mapper = inspect(orm_model)
+    fields = schema_cls.model_fields.keys()
+
+    relationships: dict[str, Optional[str]] = {}
+    for key, relationship in mapper.relationships.items():
+        if key not in fields:
+            continue
+        relationships[key] = (
+            relationship.local_remote_pairs[0][1].name
+            if relationship.direction is ONETOMANY
+            else None
+        )
+
+    return EntityConversionPlan(
+        columns=frozenset(
+            key
+            for key, attribute in mapper.column_attrs.items()
+            if key in fields and isinstance(attribute.expression, Column)
+        ),
+        relationships=relationships,
+    )
+
+
 class AppResponse(AppBaseModel, Generic[T]):
     success: bool = Field(description="Is operation success", default=True)
     status_code: int = Field(description="status code", default=200)
     internal_code: Optional[int] = Field(description="Internal code", default=None)
     message: str = Field(description="Message back to client", default="done")
     data: Optional[T] = None
+
+
+class AppStreamingResponse(StreamingResponse):
+    """
+    Writes the `AppResponse` envelope incrementally, with `data` as a JSON array filled
+    chunk by chunk from `chunks` (e.g. `BaseRepo.stream_all`), so the full list is never
+    built in memory. The body is identical to `AppResponse(data=[...])`.
+
+    Since the body is sent after the request's dependencies have exited, `session` (the
+    one `chunks` reads from) is closed here once the stream ends.
+    """
+
+    def __init__(self, chunks: AsyncIterator[list[BaseModel]], session: AsyncSession):
+        super().__init__(self._body(chunks, session), media_type="application/json")
+
+    @staticmethod
+    async def _body(chunks: AsyncIterator[list[BaseModel]], session: AsyncSession):
+        envelope = AppResponse(data=[]).model_dump_json(by_alias=True)
+        head, _, tail = envelope.rpartition("[]")
+
+        try:
+            yield head + "["
+            first = True
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+                yield ("" if first else ",") + ",".join(
+                    item.model_dump_json(by_alias=True) for item in chunk
+                )
+                first = False
+            yield "]" + tail
+        finally:
+            await session.close()
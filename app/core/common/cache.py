@@ -0,0 +1,205 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger("uvicorn")
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    An in-process LRU cache whose entries expire after `ttl_seconds`.
+    Once `max_entries` is reached, the least recently used entry is evicted.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TieredCache:
+    """
+    A read-through cache with an in-process `TTLCache` tier and an optional Redis tier
+    shared between workers. Redis failures are logged and treated as cache misses, so
+    the cache never fails a request that the loader could have served.
+
+    Example:
+        exercise = await cache.get_or_load(
+            key="exercise:1",
+            loader=lambda: repo.get_one(val=1),
+            adapter=TypeAdapter(ExerciseBase),
+        )
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        max_entries: int,
+        ttl_seconds: float,
+        redis_url: Optional[str] = None,
+        enabled: bool = True,
+    ):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.local = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._redis_url = redis_url
+        self._redis: Optional[Redis] = None
+
+    @property
+    def redis(self) -> Optional[Redis]:
+        if self._redis_url and self._redis is None:
+            self._redis = Redis.from_url(self._redis_url)
+        return self._redis
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str, adapter: TypeAdapter[T]) -> T | None:
+        if not self.enabled:
+            return None
+
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        if self.redis is None:
+            return None
+
+        try:
+            raw = await self.redis.get(self._redis_key(key))
+        except RedisError as e:
+            logger.warning(f"[TieredCache:{self.namespace}] Redis read failed: {e}")
+            return None
+
+        if raw is None:
+            return None
+
+        value = adapter.validate_json(raw)
+        self.local.set(key, value)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+
+        self.local.set(key, value)
+
+        if self.redis is None:
+            return
+
+        try:
+            await self.redis.set(
+                self._redis_key(key),
+                to_json(value, by_alias=False),
+                ex=max(int(self.ttl_seconds), 1),
+            )
+        except RedisError as e:
+            logger.warning(f"[TieredCache:{self.namespace}] Redis write failed: {e}")
+
+    async def add(self, key: str, value: Any) -> bool:
+        """
+        Like `set`, but only writes `value` while `key` is not cached yet: an existing value,
+        in either tier, is never replaced. Returns whether the value was written.
+        """
+        if not self.enabled:
+            return False
+
+        if self.local.get(key, _MISSING) is not _MISSING:
+            return False
+
+        if self.redis is not None:
+            try:
+                added = await self.redis.set(
+                    self._redis_key(key),
+                    to_json(value, by_alias=False),
+                    ex=max(int(self.ttl_seconds), 1),
+                    nx=True,
+                )
+            except RedisError as e:
+                logger.warning(f"[TieredCache:{self.namespace}] Redis write failed: {e}")
+            else:
+                if not added:
+                    return False
+
+        self.local.set(key, value)
+        return True
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[T]],
+        adapter: TypeAdapter[T],
+    ) -> T:
+        value = await self.get(key, adapter)
+        if value is not None:
+            return value
+
+        value = await loader()
+        await self.set(key, value)
+        return value
+
+    async def delete(self, key: str) -> None:
+        self.local.delete(key)
+
+        if self.redis is None:
+            return
+
+        try:
+            await self.redis.delete(self._redis_key(key))
+        except RedisError as e:
+            logger.warning(f"[TieredCache:{self.namespace}] Redis delete failed: {e}")
+
+    async def invalidate(self) -> None:
+        """Drops every entry of this namespace from both tiers."""
+        self.local.clear()
+
+        if self.redis is None:
+            return
+
+        try:
+            keys = [key async for key in self.redis.scan_iter(match=f"{self.namespace}:*")]
+            if keys:
+                await self.redis.delete(*keys)
+        except RedisError as e:
+            logger.warning(f"[TieredCache:{self.namespace}] Redis invalidation failed: {e}")
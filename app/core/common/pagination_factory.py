@@ -1,8 +1,15 @@
+import base64
+import binascii
+from datetime import datetime
 import enum
-from functools import cached_property
+import json
+import operator as py_operator
+import re
+from functools import cached_property, lru_cache
 from typing import Any, ClassVar, Optional
 from pydantic import Field, field_validator, model_validator
-from sqlalchemy import Boolean, ColumnElement, DateTime, Float, Integer, asc, desc
+from sqlalchemy import Boolean, ColumnElement, DateTime, Float, Integer, String, any_, asc, desc, literal
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 
 
@@ -11,6 +18,18 @@ from app.core.database import Base
 from app.core.exceptions import BadRequestException
 
 
+class PaginationMode(str, enum.Enum):
+    offset = "offset"
+    cursor = "cursor"
+
+
+class CountMode(str, enum.Enum):
+    exact = "exact"
+    estimate = "estimate"
+    window = "window"
+    none = "none"
+
+
 class PaginationQuery(AppBaseModel):
     page: Optional[int] = Field(None, ge=1)
     size: Optional[int] = Field(None, ge=1)
@@ -18,12 +37,22 @@ class PaginationQuery(AppBaseModel):
     filter_by: Optional[str] = None
     skip: bool = Field(
         False, description="If true, pagination (page and size) is skipped, and all records are fetched.")
+    stream: bool = Field(
+        False, description="If true (requires skip), records are streamed to the client in chunks instead of built into one response.")
+    mode: PaginationMode = Field(
+        PaginationMode.offset, description="'offset' pages with page/size, 'cursor' pages with an opaque cursor (keyset).")
+    cursor: Optional[str] = Field(
+        None, description="Opaque cursor returned as 'next_cursor' by the previous page, only used when mode is 'cursor'.")
+    count_mode: CountMode = Field(
+        CountMode.exact, description="How total_count is computed: 'exact' (separate COUNT query), 'window' (counted in the page query), "
+        "'estimate' (planner row estimate) or 'none' (not computed).")
 
     @model_validator(mode='after')
     def validate_pagination_fields(self) -> 'PaginationQuery':
         if not self.skip:
             # If skip is False, page and size must be provided
-            if self.page is None:
+            # (page is not needed when paging by cursor)
+            if self.page is None and self.mode is PaginationMode.offset:
                 raise ValueError(
                     "Page is required when pagination is not skipped (skip=False).")
             if self.size is None:
@@ -33,8 +62,25 @@ class PaginationQuery(AppBaseModel):
             # If skip is True, page and size should be None (or effectively ignored if present)
             pass
 
+        if self.stream and not self.skip:
+            raise ValueError("Streaming is only supported when pagination is skipped (skip=True).")
+
         return self
 
+    def cache_key(self) -> str:
+        """
+        Normalized representation of the query, suitable as a cache key. Filters are
+        order-insensitive, so they are sorted; sort fields keep their order.
+        """
+        filters = sorted(PaginationParser.split_and_clean_fields(self.filter_by))
+        sorts = PaginationParser.split_and_clean_fields(self.sort_by)
+
+        if self.skip:
+            return f"skip|sort={','.join(sorts)}|filter={','.join(filters)}"
+
+        return (f"page={self.page}|size={self.size}|mode={self.mode.value}|cursor={self.cursor or ''}"
+                f"|count={self.count_mode.value}|sort={','.join(sorts)}|filter={','.join(filters)}")
+
 
 class InvalidDatetimeValue(Exception):
     def __init__(self, message='Type of field is datetime, value has to be in isoformat'):
@@ -53,6 +99,10 @@ class LogicalOperator(enum.Enum):
     GTE = '>='
     GT = '>'
     NOT = '!='
+    IN = 'in'
+    BETWEEN = 'between'
+    ISNULL = 'isnull'
+    STARTSWITH = 'startswith'
 
     def __str__(self):
         return self.value
@@ -63,45 +113,63 @@ class LogicalOperator(enum.Enum):
 
 
 class FieldOperation:
-    @classmethod
-    def determine_operator(cls, field_str: str) -> LogicalOperator:
-
-        if LogicalOperator.GTE.value in field_str:
-            return LogicalOperator.GTE
-
-        if LogicalOperator.GT.value in field_str:
-            return LogicalOperator.GT
-
-        if LogicalOperator.LTE.value in field_str:
-            return LogicalOperator.LTE
+    # a field name followed by the first operator; two-character operators are tried first
+    FILTER_PATTERN: ClassVar[re.Pattern] = re.compile(
+        r"^\s*(?P<field>\w+)\s*(?P<operator>>=|<=|!=|>|<|=)(?P<value>.*)$")
+    # word operators are written as '<field>:<op>:<value>', e.g. 'workout_plan_id:in:1|2|3'
+    WORD_FILTER_PATTERN: ClassVar[re.Pattern] = re.compile(
+        r"^\s*(?P<field>\w+):(?P<operator>in|between|isnull|startswith):(?P<value>.*)$")
+    # separates the values of 'in' and 'between', as ',' already separates filters
+    VALUE_SEPARATOR: ClassVar[str] = '|'
+
+    SQL_OPERATORS: ClassVar[dict[LogicalOperator, Any]] = {
+        LogicalOperator.EQ: py_operator.eq,
+        LogicalOperator.LTE: py_operator.le,
+        LogicalOperator.LT: py_operator.lt,
+        LogicalOperator.GTE: py_operator.ge,
+        LogicalOperator.GT: py_operator.gt,
+        LogicalOperator.NOT: py_operator.ne,
+    }
 
-        if LogicalOperator.LT.value in field_str:
-            return LogicalOperator.LT
+    @classmethod
+    def parse(cls, field_str: str) -> tuple[str, LogicalOperator, str]:
+        """
+        Splits a '<field><op><value>' filter into its parts in a single pass.
 
-        if LogicalOperator.NOT.value in field_str:
-            return LogicalOperator.NOT
+        :raises InvalidOperator: if no supported operator follows the field name
+        """
+        match = cls.WORD_FILTER_PATTERN.match(field_str) or cls.FILTER_PATTERN.match(field_str)
+        if not match:
+            raise InvalidOperator
 
-        if LogicalOperator.EQ.value in field_str:
-            return LogicalOperator.EQ
+        return match.group("field"), LogicalOperator(match.group("operator")), match.group("value")
 
-        raise InvalidOperator
+    @classmethod
+    def determine_operator(cls, field_str: str) -> LogicalOperator:
+        _, operator, _ = cls.parse(field_str)
+        return operator
 
     @classmethod
     def create_sql_expression(cls, column: str, operator: LogicalOperator, column_value: Any) -> list[ColumnElement]:
-        if operator is LogicalOperator.GTE:
-            return [column >= column_value]
-        if operator is LogicalOperator.GT:
-            return [column > column_value]
-        if operator is LogicalOperator.LTE:
-            return [column <= column_value]
-        if operator is LogicalOperator.LT:
-            return [column < column_value]
-        if operator is LogicalOperator.NOT:
-            return [column != column_value]
-        if operator is LogicalOperator.EQ:
-            return [column == column_value]
-
-        raise ValueError("No suppoerted oeprations were determined")
+        if operator is LogicalOperator.IN:
+            # a single array parameter: '= ANY($1)' keeps one statement shape for any list length
+            return [column == any_(literal(column_value, ARRAY(column.type)))]
+        if operator is LogicalOperator.BETWEEN:
+            lower, upper = column_value
+            return [column.between(lower, upper)]
+        if operator is LogicalOperator.ISNULL:
+            return [column.is_(None) if column_value else column.is_not(None)]
+        if operator is LogicalOperator.STARTSWITH:
+            # the pattern is built here so Postgres receives a plain 'x%' prefix; under a non-C collation only a
+            # `varchar_pattern_ops`/`text_pattern_ops` btree can serve it (see migration 5b8e2f4a9c17)
+            escaped = column_value.replace('/', '//').replace('%', '/%').replace('_', '/_')
+            return [column.like(f"{escaped}%", escape='/')]
+
+        sql_operator = cls.SQL_OPERATORS.get(operator)
+        if sql_operator is None:
+            raise ValueError("No suppoerted oeprations were determined")
+
+        return [sql_operator(column, column_value)]
 
 
 class PaginationParser:
@@ -144,23 +212,57 @@ class PaginationParser:
                         message=f"Expected type of '{field_name}' is '{str(column_type).lower()}', could not parse the value '{value}'")
             return value
         except InvalidDatetimeValue as e:
-            raise BadRequestException(detail=str(e))
+            raise BadRequestException(message=str(e))
         except Exception:
             raise ValueError(
                 f"Type of field '{field_name}' is '{str(column_type).lower()}' but value passed is: '{type(value).__name__}'")
 
 
+    @classmethod
+    def convert_operand(cls, *, operator: LogicalOperator, value: str, column_type: Any, field_name: str):
+        """
+        Convert the raw operand of a filter according to its operator and column type.
+
+        :return: a list of values for 'in', a (lower, upper) tuple for 'between',
+                 a bool for 'isnull' and a single converted value otherwise
+        """
+        if operator is LogicalOperator.IN:
+            return [cls.convert_value(value=item, column_type=column_type, field_name=field_name)
+                    for item in value.split(FieldOperation.VALUE_SEPARATOR)]
+
+        if operator is LogicalOperator.BETWEEN:
+            bounds = value.split(FieldOperation.VALUE_SEPARATOR)
+            if len(bounds) != 2:
+                raise ValueError(
+                    f"'between' on field '{field_name}' expects two values: '<lower>{FieldOperation.VALUE_SEPARATOR}<upper>'")
+            return tuple(cls.convert_value(value=bound, column_type=column_type, field_name=field_name)
+                         for bound in bounds)
+
+        if operator is LogicalOperator.ISNULL:
+            if value.lower() not in ('true', 'false'):
+                raise ValueError(f"'isnull' on field '{field_name}' expects 'true' or 'false'")
+            return value.lower() == 'true'
+
+        if operator is LogicalOperator.STARTSWITH and not isinstance(column_type, String):
+            raise ValueError(f"'startswith' is only supported on text fields, '{field_name}' is '{str(column_type).lower()}'")
+
+        return cls.convert_value(value=value, column_type=column_type, field_name=field_name)
+
+
 class PaginationSortParser(PaginationParser):
-    def _process_sort_fields(self, sort_by_str: str, model: Base) -> list[InstrumentedAttribute]:
+    def _process_sort_keys(self, sort_by_str: str, model: Base,
+                           allowed_fields: Optional[frozenset[str]] = None,
+                           aliases: tuple[tuple[str, InstrumentedAttribute], ...] = ()) -> list[tuple[InstrumentedAttribute, bool]]:
         """
-        Process and validate sort fields.
+        Process sort fields into (column, is_descending) pairs.
 
         :param model: SQLAlchemy model class
-        :return: List of sort expressions
+        :param allowed_fields: if passed, fields outside of it are rejected
+        :param aliases: (field, column) pairs of fields sorted by another column
+        :return: List of sort keys
         """
-        # print(f"sort_by is: {sort_by_str}")
         sort_fields = self.split_and_clean_fields(sort_by_str)
-        sort_by = []
+        sort_keys = []
 
         for field in sort_fields:
             if not field:
@@ -169,22 +271,82 @@ class PaginationSortParser(PaginationParser):
             clean_field = field.lstrip('-')
             is_descending = field.startswith('-')
 
+            if allowed_fields is not None:
+                self.validate_field(field=clean_field, allowed_fields=allowed_fields)
+
             try:
-                column = getattr(model, clean_field)
-                sort_expr = desc(column) if is_descending else asc(column)
-                sort_by.append(sort_expr)
+                column = dict(aliases).get(clean_field) or getattr(model, clean_field)
+                sort_keys.append((column, is_descending))
             except Exception as e:
                 print(f"Invalid sort field {clean_field}: {e}")
 
-        return sort_by
+        return sort_keys
+
+    def _process_sort_fields(self, sort_by_str: str, model: Base) -> list[InstrumentedAttribute]:
+        """
+        Process and validate sort fields.
+
+        :param model: SQLAlchemy model class
+        :return: List of sort expressions
+        """
+        return [desc(column) if is_descending else asc(column)
+                for column, is_descending in self._process_sort_keys(sort_by_str, model)]
+
+
+class PaginationCursor:
+    """
+    Encodes and decodes the opaque cursor used by keyset pagination. The cursor carries the
+    names of the sort keys and the values of the last row of a page for those keys.
+    """
+    @classmethod
+    def encode(cls, key_names: list[str], values: list[Any]) -> str:
+        payload = {
+            "k": key_names,
+            "v": [value.isoformat() if isinstance(value, datetime) else value for value in values],
+        }
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, cursor: str, keys: list[InstrumentedAttribute]) -> list[Any]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded))
+            key_names, values = payload["k"], payload["v"]
+        except (binascii.Error, ValueError, KeyError, TypeError) as e:
+            raise BadRequestException(message="Cursor is invalid") from e
+
+        if key_names != [key.key for key in keys]:
+            raise BadRequestException(
+                message="Cursor does not match the requested sort, restart paging without a cursor")
+
+        try:
+            # a short value list would silently drop keys from the keyset predicate
+            if not isinstance(values, list) or len(values) != len(keys):
+                raise ValueError("Cursor values do not match its keys")
+
+            decoded = []
+            for key, value in zip(keys, values):
+                if value is not None and isinstance(key.type, DateTime):
+                    value = datetime.fromisoformat(value)
+                decoded.append(value)
+        except (ValueError, TypeError) as e:
+            raise BadRequestException(message="Cursor is invalid") from e
+
+        return decoded
 
 
 class PaginationFilterParser(PaginationParser):
-    def _process_filter_fields(self, filter_by_str: str, model: Base) -> list[ColumnElement]:
+    FILTER_ERROR_MESSAGE: ClassVar[str] = \
+        "Filtering not allowed on field '{field}'. Allowed fields are {allowed_fields}"
+
+    def _process_filter_fields(self, filter_by_str: str, model: Base,
+                               allowed_fields: Optional[frozenset[str]] = None) -> list[ColumnElement]:
         """
         Process and validate filter fields with type conversion.
 
         :param model: SQLAlchemy model class
+        :param allowed_fields: if passed, fields outside of it are rejected
         :return: List of filter expressions
         """
         filter_fields = self.split_and_clean_fields(filter_by_str)
@@ -194,51 +356,95 @@ class PaginationFilterParser(PaginationParser):
             if not pair:
                 continue
 
-            operator: LogicalOperator = None
             try:
+                key, operator, value = FieldOperation.parse(pair)
+            except InvalidOperator:
+                raise ValueError(f"Invalid filter operator. Passed query is '{pair}'."
+                                 f" Use '<field><op><value>' format where op could be: {LogicalOperator.all_values()}."
+                                 f" Word operators are written as '<field>:<op>:<value>'")
 
-                operator = FieldOperation.determine_operator(pair)
-
-                key, value = pair.split(operator.value, 1)
+            if allowed_fields is not None:
+                self.validate_field(field=key, allowed_fields=allowed_fields,
+                                    error_message=self.FILTER_ERROR_MESSAGE)
 
+            try:
                 column = getattr(model, key)
 
-                column_type = column.type
+                converted_value = self.convert_operand(
+                    operator=operator, value=value, column_type=column.type, field_name=key)
 
-                converted_value = self.convert_value(
-                    value=value, column_type=column_type, field_name=key)
+                filter_by.extend(FieldOperation.create_sql_expression(
+                    column=column, operator=operator, column_value=converted_value))
+            except (ValueError, AttributeError) as e:
+                raise BadRequestException(message=str(e)) from e
 
-                sql_expr = FieldOperation.create_sql_expression(
-                    column=column, operator=operator, column_value=converted_value)
+        return filter_by
 
-                # print(f"sql_expr: {sql_expr}")
 
-                filter_by.extend(sql_expr)
-            except InvalidOperator:
-                print("Invalid oeprator passed")
-            except ValueError as e:
-                # print(f"Invalid filter: {pair} {operator}")
-                raise BadRequestException(detail=str(e)) from e
+class PaginationPlan:
+    """
+    Compiles `filter_by`/`sort_by` strings into SQLAlchemy expressions once per distinct
+    (model, raw string, allowed fields) and reuses the result for later requests.
+    Expressions are immutable, so sharing them between requests is safe.
+    """
+    filter_parser: ClassVar[PaginationFilterParser] = PaginationFilterParser()
+    sort_parser: ClassVar[PaginationSortParser] = PaginationSortParser()
 
-        return filter_by
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def compile_filters(model: Base, filter_by_str: str,
+                        allowed_fields: frozenset[str]) -> tuple[ColumnElement, ...]:
+        return tuple(PaginationPlan.filter_parser._process_filter_fields(
+            filter_by_str, model, allowed_fields))
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def compile_sort_keys(model: Base, sort_by_str: str, allowed_fields: frozenset[str],
+                          aliases: tuple[tuple[str, InstrumentedAttribute], ...] = ()) -> tuple[tuple[InstrumentedAttribute, bool], ...]:
+        return tuple(PaginationPlan.sort_parser._process_sort_keys(
+            sort_by_str, model, allowed_fields, aliases))
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def compile_sort_fields(model: Base, sort_by_str: str, allowed_fields: frozenset[str],
+                            aliases: tuple[tuple[str, InstrumentedAttribute], ...] = ()) -> tuple[ColumnElement, ...]:
+        return tuple(desc(column) if is_descending else asc(column)
+                     for column, is_descending in PaginationPlan.compile_sort_keys(model, sort_by_str, allowed_fields, aliases))
 
 
 class PaginationFactory:
     @staticmethod
-    def create_pagination(model: Base, sortable_fields: list[str] = [], filterable_fields: list[str] = []):
-        filter_parser = PaginationFilterParser()
-        sort_parser = PaginationSortParser()
+    def create_pagination(model: Base, sortable_fields: list[str] = [], filterable_fields: list[str] = [],
+                          sort_aliases: dict[str, InstrumentedAttribute] = {}):
+        """
+        :param sort_aliases: sortable fields that are not columns, mapped to the column they sort by
+                             (e.g. a computed dense order to the position it is ranked from)
+        """
+        sortable = frozenset(sortable_fields)
+        filterable = frozenset(filterable_fields)
+        # hashable, it is part of the cached plans' keys
+        aliases = tuple(sort_aliases.items())
 
         class CustomPaginationQuery(PaginationQuery):
             __model__: ClassVar[Base] = model
 
             @cached_property
             def sort_fields(self):
-                return sort_parser._process_sort_fields(self.sort_by, self.__model__)
+                if not self.sort_by:
+                    return []
+                return list(PaginationPlan.compile_sort_fields(self.__model__, self.sort_by, sortable, aliases))
+
+            @cached_property
+            def sort_keys(self):
+                if not self.sort_by:
+                    return []
+                return list(PaginationPlan.compile_sort_keys(self.__model__, self.sort_by, sortable, aliases))
 
             @cached_property
             def filter_fields(self):
-                return filter_parser._process_filter_fields(self.filter_by, self.__model__)
+                if not self.filter_by:
+                    return []
+                return list(PaginationPlan.compile_filters(self.__model__, self.filter_by, filterable))
 
             @field_validator('sort_by')
             @classmethod
@@ -246,13 +452,8 @@ class PaginationFactory:
                 if not v:
                     return v
 
-                sort_fields = sort_parser.split_and_clean_fields(v)
-
-                for field in sort_fields:
-                    clean_field = field.lstrip('-')
-
-                    sort_parser.validate_field(field=clean_field,
-                                               allowed_fields=sortable_fields)
+                # compiling validates the fields, the plan is then served from cache
+                PaginationPlan.compile_sort_fields(cls.__model__, v, sortable, aliases)
 
                 return v
 
@@ -261,23 +462,9 @@ class PaginationFactory:
             def validate_filter_fields(cls, v):
                 if not v:
                     return v
-                filter_pairs = filter_parser.split_and_clean_fields(v)
-
-                error_message = "Filtering not allowed on field '{field}'. Allowed fields are {allowed_fields}"
-
-                for pair in filter_pairs:
-                    field = None
-
-                    try:
-                        operator: LogicalOperator = FieldOperation.determine_operator(
-                            pair)
-                        field, _ = pair.split(operator.value, 1)
 
-                    except Exception:
-                        raise ValueError(f"Invalid filter operator. Passed query is '{pair}'."
-                                         f" Use '<field><op><value>' format where op could be: {LogicalOperator.all_values()}")
+                # compiling validates the fields, the plan is then served from cache
+                PaginationPlan.compile_filters(cls.__model__, v, filterable)
 
-                    filter_parser.validate_field(
-                        field=field, allowed_fields=filterable_fields, error_message=error_message)
                 return v
         return CustomPaginationQuery
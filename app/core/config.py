@@ -16,12 +16,36 @@ class JwtSettings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: float = 60.0
 
+class PasswordHashSettings(BaseSettings):
+    PASSWORD_HASH_ROUNDS: int = 12
+    PASSWORD_HASH_MAX_WORKERS: int = 2
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 16
+
 class ResendSettings(BaseSettings):
     EMAIL_SERVICE: str
-    
+    EMAIL_API_URL: str = "https://api.resend.com"
+    EMAIL_MAX_CONCURRENCY: int = 4
+
+class WorkerSettings(BaseSettings):
+    WORKER_DB_POOL_SIZE: int = 5
+    REMINDER_SWEEP_INTERVAL_SECONDS: float = 60.0
+    REMINDER_SWEEP_BATCH_SIZE: int = 100
+    AUTO_START_SWEEP_INTERVAL_SECONDS: float = 60.0
+
+class ExportSettings(BaseSettings):
+    EXPORT_DIR: str = "exports"
+
+class CacheSettings(BaseSettings):
+    CACHE_ENABLED: bool = True
+    CACHE_REDIS_ENABLED: bool = False
+    CATALOG_CACHE_TTL_SECONDS: float = 300.0
+    CATALOG_CACHE_MAX_ENTRIES: int = 512
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 4096
+
 # the only use case that I know of where multiple inheritance is acceptable, 
 # in general you should not do such a thing for your business-related code.
-class AppSettings(PostgresSettings, JwtSettings, RedisSettings, ResendSettings):
+class AppSettings(PostgresSettings, JwtSettings, PasswordHashSettings, RedisSettings, ResendSettings, CacheSettings, ExportSettings, WorkerSettings):
     ENV: str = "prod"
     model_config = SettingsConfigDict(
         env_file='.env', env_file_encoding='utf-8')
@@ -20,7 +20,7 @@ class Base(DeclarativeBase):
 
     @classmethod
     def columns(cls):
-        return {_column.name for _column in inspect(cls).c}
+        return {_column.name for _column in cls.__table__.columns}
 
     @classmethod
     def table(cls):
@@ -1,15 +1,23 @@
-from typing import Any, ClassVar, Generic, Optional, TypeVar
+import enum
+import json
+from functools import lru_cache
+from typing import Any, AsyncIterator, ClassVar, Generic, Optional, Sequence, TypeVar
 
 from sqlalchemy.orm.strategy_options import _AbstractLoad
-from pydantic import BaseModel
-from sqlalchemy import func, delete, insert, select, update
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import and_, asc, column, desc, func, delete, insert, or_, select, text, tuple_, update, values
 from sqlalchemy.exc import IntegrityError, ProgrammingError
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.dialects.postgresql import insert as pg_insert
-from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql import Executable, Select
+from sqlalchemy.sql.elements import ClauseElement, ColumnElement
+from sqlalchemy.sql.visitors import InternalTraversal
 
 from app.core.common.app_response import AppBaseModel
+from app.core.common.pagination_factory import CountMode, PaginationCursor
 
 from .base_model import Base
+from .identity_map import IdentityMap
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 
@@ -21,17 +29,61 @@ PydanticModel = TypeVar("M", bound=BaseModel)
 
 class PaginatedResponse(AppBaseModel, Generic[PydanticModel]):
     result: list[PydanticModel]
-    total_count: int
-    page: int
+    total_count: Optional[int] = None
+    page: Optional[int] = None
     size: int
+    next_cursor: Optional[str] = None
+
+
+class Materialization(str, enum.Enum):
+    """
+    How read queries without loader options turn rows into response models:
+        - orm: load ORM entities, then `return_model(**entity.dict())` (validated).
+        - adapter: select table columns, then validate all rows at once with a cached TypeAdapter.
+        - construct: select table columns, then `return_model.model_construct` without validation,
+          for repositories whose rows are trusted to already match their models.
+    """
+
+    orm = "orm"
+    adapter = "adapter"
+    construct = "construct"
+
+
+@lru_cache(maxsize=None)
+def _rows_adapter(return_model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[return_model])
+
+
+class _ExplainJson(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON) <statement>`, executed with the statement's bound parameters."""
+
+    inherit_cache = True
+    _traverse_internals = [("statement", InternalTraversal.dp_clauseelement)]
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_ExplainJson, "postgresql")
+def _compile_explain_json(element: _ExplainJson, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def _nullable(key_column: InstrumentedAttribute) -> bool:
+    return getattr(key_column.expression, "nullable", True)
 
 
 class BaseRepo(Generic[DbModel, PydanticModel]):
     __dbmodel__: ClassVar[DbModel]
     __model__: ClassVar[PydanticModel]
+    __materialization__: ClassVar[Materialization] = Materialization.orm
+    # read-only attributes (`query_expression`s) returned next to the table columns,
+    # filled in by `_attach_computed`
+    __computed__: ClassVar[tuple[str, ...]] = ()
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, identity_map: Optional[IdentityMap] = None):
         self.session = session
+        self.identity_map = identity_map
 
     @property
     def _model(self) -> PydanticModel:
@@ -41,6 +93,63 @@ class BaseRepo(Generic[DbModel, PydanticModel]):
     def _dbmodel(self) -> DbModel:
         return self.__dbmodel__
 
+    def _selects_columns(self, options: Optional[list[_AbstractLoad]] = None) -> bool:
+        # loader options need entities to populate relationships, computed attributes
+        # are attached to entities
+        return (
+            not options
+            and not self.__computed__
+            and self.__materialization__ is not Materialization.orm
+        )
+
+    def _select(self, *extra: Any, options: Optional[list[_AbstractLoad]] = None) -> Select:
+        if self._selects_columns(options):
+            return select(*self._dbmodel.__table__.columns, *extra)
+        return select(self._dbmodel, *extra)
+
+    async def _attach_computed(self, entities: Sequence[DbModel]) -> None:
+        """
+        Fills in the computed attributes of loaded entities (and of their loaded relations)
+        that the return models read. A no-op unless a repository overrides it.
+        """
+
+    async def _from_entities(
+        self, entities: Sequence[DbModel], return_model: type[PydanticModel]
+    ) -> list[PydanticModel]:
+        """`return_model` of each entity's table columns and `__computed__` attributes."""
+        await self._attach_computed(entities)
+        return [
+            return_model(
+                **entity.dict(), **{key: getattr(entity, key) for key in self.__computed__}
+            )
+            for entity in entities
+        ]
+
+    async def _materialize(
+        self,
+        items: Sequence[Any],
+        return_model: type[PydanticModel],
+        options: Optional[list[_AbstractLoad]] = None,
+    ) -> list[PydanticModel]:
+        """Turns what a query built by `_select` returned into a list of `return_model`."""
+        if options:
+            await self._attach_computed(items)
+            return [
+                return_model.model_validate(item, from_attributes=True)
+                for item in items
+            ]
+
+        if self.__materialization__ is Materialization.construct:
+            return [return_model.model_construct(**item._mapping) for item in items]
+
+        if self.__materialization__ is Materialization.adapter:
+            # plain dicts, validating `Row`s with from_attributes goes through their slow getattr
+            return _rows_adapter(return_model).validate_python(
+                [item._asdict() for item in items]
+            )
+
+        return await self._from_entities(items, return_model)
+
     async def create(
         self,
         data: BaseModel,
@@ -70,7 +179,8 @@ class BaseRepo(Generic[DbModel, PydanticModel]):
         if not return_model:
             return_model = self._model
 
-        return return_model(**created_db_model.dict())
+        [created] = await self._from_entities([created_db_model], return_model)
+        return created
 
     async def create_many(
         self,
@@ -129,7 +239,7 @@ class BaseRepo(Generic[DbModel, PydanticModel]):
             if commit:
                 await session.commit()
 
-            return [return_model(**record.dict()) for record in all_created_records]
+            return await self._from_entities(all_created_records, return_model)
 
         except IntegrityError as e:
             await session.rollback()
@@ -137,6 +247,47 @@ class BaseRepo(Generic[DbModel, PydanticModel]):
                 f"One or more records violate unique constraints: {str(e)}"
             ) from e
 
+    async def insert_many_rows(
+        self,
+        rows: list[dict[str, Any]],
+        return_model: Optional[BaseModel | PydanticModel] = None,
+    ) -> list[PydanticModel]:
+        """
+        Inserts many rows given as column dictionaries and returns them in the order they were passed.
+
+        Rows are sent as batched multi-row `INSERT ... VALUES (...), (...) RETURNING` statements,
+        so a large list costs a handful of round trips instead of one per row. Unlike `create_many`,
+        rows are plain dictionaries (no Pydantic dump) and the transaction is left to the caller.
+
+        Args:
+            rows: Column name to value mappings, one per row. All rows should have the same keys.
+            return_model: Optional model class for return type
+
+        Returns:
+            The inserted records as Pydantic models, in the same order as `rows`.
+
+        Raises:
+            AlreadyExistException: If any row violates a unique constraint.
+        """
+        if not rows:
+            return []
+
+        try:
+            created_records = await self.session.scalars(
+                insert(self._dbmodel).returning(
+                    self._dbmodel, sort_by_parameter_order=True
+                ),
+                rows,
+            )
+        except IntegrityError as e:
+            raise AlreadyExistException(
+                f"One or more records violate unique constraints: {str(e.orig)}"
+            ) from e
+
+        return_model = return_model or self._model
+
+        return await self._from_entities(created_records.all(), return_model)
+
     async def upsert_one(
         self,
         data: BaseModel,
@@ -219,7 +370,8 @@ class BaseRepo(Generic[DbModel, PydanticModel]):
             await session.commit()
 
             return_model = return_model or self._model
-            return return_model(**result.dict())
+            [upserted] = await self._from_entities([result], return_model)
+            return upserted
 
         except Exception as e:
             await session.rollback()
@@ -317,7 +469,7 @@ class BaseRepo(Generic[DbModel, PydanticModel]):
 
             result = updated_or_created_data.all()
 
-            return [return_model(**item.dict()) for item in result]
+            return await self._from_entities(result, return_model)
         except ProgrammingError:
             raise ValueError(
                 "there is no unique or exclusion constraint matching the ON CONFLICT specification. Background on this error at: https://sqlalche.me/e/20/f405)"
@@ -342,6 +494,7 @@ class BaseRepo(Generic[DbModel, PydanticModel]):
 
         Returns:
             A PydanticModel instance representing the found record.
+            When the repository has an `identity_map`, repeating the same lookup within the session is served from it.
 
         Raises:
             NotFoundException: If no matching record is found.
@@ -359,22 +512,35 @@ class BaseRepo(Generic[DbModel, PydanticModel]):
         if where_clause:
             where_cond.extend(where_clause)
 
-        stmt = select(self._dbmodel).where(*where_cond)
+        stmt = self._select(options=options).where(*where_cond)
 
         if options:
             stmt = stmt.options(*options)
 
-        result = await session.scalar(stmt)
+        return_model = return_model or self._model
+
+        identity_key = None
+        if self.identity_map is not None:
+            identity_key = IdentityMap.key_for(self._dbmodel, return_model, stmt)
+            if identity_key is not None:
+                found = self.identity_map.get(identity_key)
+                if found is not None:
+                    return found
+
+        if self._selects_columns(options):
+            result = (await session.execute(stmt)).first()
+        else:
+            result = await session.scalar(stmt)
 
         if result is None:
             raise NotFoundException
 
-        return_model = return_model or self._model
+        [found] = await self._materialize([result], return_model, options)
 
-        if options:
-            return return_model.model_validate(result, from_attributes=True)
-        else:
-            return return_model(**result.dict())
+        if identity_key is not None:
+            self.identity_map.set(identity_key, found)
+
+        return found
 
         # return return_model(**result.dict())
 
@@ -387,26 +553,102 @@ class BaseRepo(Generic[DbModel, PydanticModel]):
     ):
         session = self.session
 
-        stmt = select(self._dbmodel)
+        stmt = self._select(options=options)
 
         stmt = stmt.where(*where_clause).order_by(*order_clause)
 
         if options:
             stmt = stmt.options(*options)
 
-        result = await session.scalars(stmt)
+        if self._selects_columns(options):
+            result = await session.execute(stmt)
+        else:
+            result = await session.scalars(stmt)
 
         return_model = return_model or self._model
 
+        return await self._materialize(result.all(), return_model, options)
+
+    async def stream_all(
+        self,
+        where_clause: list[ColumnElement[bool]] = [],
+        order_clause: list[InstrumentedAttribute] = [],
+        options: list[_AbstractLoad] = None,
+        return_model: Optional[BaseModel | PydanticModel] = None,
+        chunk_size: int = 500,
+    ) -> AsyncIterator[list[PydanticModel]]:
+        """
+        Streaming counterpart of `get_all`: rows are read through a server-side cursor and
+        yielded in chunks of at most `chunk_size` models, so only one chunk (and its
+        `selectinload`-ed relations) is held in memory at a time.
+
+        The query only runs once iteration starts, on this repository's session; whoever
+        consumes the iterator outside of the request (e.g. a `StreamingResponse`) owns
+        closing that session afterwards.
+
+        Example:
+            async for chunk in repo.stream_all(where_clause=[WorkoutSession.user_id == user_id]):
+                ...
+        """
+        session = self.session
+
+        stmt = self._select(options=options)
+
+        stmt = stmt.where(*where_clause).order_by(*order_clause)
+
         if options:
-            item_list = [
-                return_model.model_validate(item, from_attributes=True)
-                for item in result.all()
-            ]
+            stmt = stmt.options(*options)
+
+        execution_options = {"yield_per": chunk_size}
+
+        if self._selects_columns(options):
+            result = await session.stream(stmt, execution_options=execution_options)
         else:
-            item_list = [return_model(**item.dict()) for item in result.all()]
+            result = await session.stream_scalars(stmt, execution_options=execution_options)
+
+        return_model = return_model or self._model
+
+        try:
+            async for partition in result.partitions():
+                yield await self._materialize(partition, return_model, options)
+        finally:
+            await result.close()
+
+    async def _count_exact(self, where_clause: list[ColumnElement[bool]]) -> int:
+        return await self.session.scalar(
+            select(func.count()).select_from(
+                select(self._dbmodel).where(*where_clause).subquery()
+            )
+        )
 
-        return item_list
+    async def _count_estimate(self, where_clause: list[ColumnElement[bool]]) -> int:
+        """
+        Returns the planner's row estimate instead of counting: `pg_class.reltuples` for
+        an unfiltered table, otherwise the top-level row estimate of EXPLAIN. Falls back
+        to an exact count when no estimate is available.
+        """
+        session = self.session
+
+        if not where_clause:
+            reltuples = await session.scalar(
+                select(text("reltuples")).select_from(text("pg_class")).where(
+                    text("oid = CAST(:table_name AS regclass)").bindparams(
+                        table_name=self._dbmodel.__tablename__
+                    )
+                )
+            )
+            # reltuples is -1 for tables that were never vacuumed or analyzed
+            if reltuples is not None and reltuples >= 0:
+                return int(reltuples)
+            return await self._count_exact(where_clause)
+
+        plan = await session.scalar(
+            _ExplainJson(select(self._dbmodel.id).where(*where_clause))
+        )
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        return int(plan[0]["Plan"]["Plan Rows"])
 
     async def get_many(
         self,
@@ -416,12 +658,38 @@ class BaseRepo(Generic[DbModel, PydanticModel]):
         order_clause: list[InstrumentedAttribute] = [],
         relations: list[_AbstractLoad] = None,
         return_model: Optional[BaseModel | PydanticModel] = None,
+        count_mode: CountMode = CountMode.exact,
     ) -> PaginatedResponse[PydanticModel]:
+        """
+        Retrieves a page of records using OFFSET pagination.
+
+        Args:
+            page: The page number, starting at 1.
+            size: The number of records in the page.
+            where_clause: An optional list of SQLAlchemy where clauses to apply.
+            order_clause: An optional list of order by expressions.
+            relations: Optional loader options.
+            return_model: An optional BaseModel or PydanticModel to use for returning the result.
+            count_mode: How `total_count` is computed:
+                - exact: a separate COUNT(*) over the filtered rows.
+                - window: COUNT(*) OVER () in the page query itself, no second query.
+                - estimate: the planner's row estimate (pg_class.reltuples or EXPLAIN).
+                - none: `total_count` is left empty.
+
+        Returns:
+            A PaginatedResponse of the page.
+        """
         session = self.session
 
+        selects_columns = self._selects_columns(relations)
+
+        if count_mode is CountMode.window:
+            stmt = self._select(func.count().over().label("total_count"), options=relations)
+        else:
+            stmt = self._select(options=relations)
+
         stmt = (
-            select(self._dbmodel)
-            .where(*where_clause)
+            stmt.where(*where_clause)
             .order_by(*order_clause)
             .offset((page - 1) * size)
             .limit(size)
@@ -431,25 +699,32 @@ class BaseRepo(Generic[DbModel, PydanticModel]):
             options = relations
             stmt = stmt.options(*options)
 
-        result = await session.scalars(stmt)
-
-        total_count = await session.scalar(
-            select(func.count()).select_from(
-                select(self._dbmodel).where(*where_clause).subquery()
-            )
-        )
+        total_count = None
+
+        if count_mode is CountMode.window:
+            rows = (await session.execute(stmt)).all()
+            items = rows if selects_columns else [row[0] for row in rows]
+            if rows:
+                total_count = rows[0].total_count
+            elif page == 1:
+                total_count = 0
+            else:
+                # a page past the end carries no window row to read the count from
+                total_count = await self._count_exact(where_clause)
+        else:
+            if selects_columns:
+                items = (await session.execute(stmt)).all()
+            else:
+                items = (await session.scalars(stmt)).all()
 
-        # print(f"total_count: {total_count}")
+            if count_mode is CountMode.exact:
+                total_count = await self._count_exact(where_clause)
+            elif count_mode is CountMode.estimate:
+                total_count = await self._count_estimate(where_clause)
 
         return_model = return_model or self._model
 
-        if relations:
-            item_list = [
-                return_model.model_validate(item, from_attributes=True)
-                for item in result.all()
-            ]
-        else:
-            item_list = [return_model(**item.dict()) for item in result.all()]
+        item_list = await self._materialize(items, return_model, relations)
 
         PaginatedResponse.__model__ = return_model
         return PaginatedResponse[PydanticModel](
@@ -459,6 +734,126 @@ class BaseRepo(Generic[DbModel, PydanticModel]):
             size=size,
         )
 
+    def _keyset_where(
+        self,
+        keys: list[tuple[InstrumentedAttribute, bool]],
+        bound_values: list[Any],
+    ) -> ColumnElement[bool]:
+        """
+        Builds the predicate selecting rows that come after `bound_values` in the order of `keys`,
+        with NULLs sorted last in either direction (see `get_many_by_cursor`).
+
+        Uses a row-value comparison when all keys share a direction and none is nullable, so
+        Postgres can serve it from a composite index; otherwise expands into the equivalent
+        OR chain, where NULLs are matched with IS NULL / IS NOT NULL since comparing them
+        with `=`, `<` or `>` is never true.
+        """
+        directions = {is_descending for _, is_descending in keys}
+
+        if len(directions) == 1 and not any(_nullable(key_column) for key_column, _ in keys):
+            columns = tuple_(*[key_column for key_column, _ in keys])
+            bound = tuple_(*bound_values)
+            return columns < bound if directions.pop() else columns > bound
+
+        clauses = []
+        equal_prefix = []
+        for (key_column, is_descending), bound_value in zip(keys, bound_values):
+            if bound_value is None:
+                # NULLs come last: no row comes after a NULL on this key, only ties with it
+                equal_prefix.append(key_column.is_(None))
+                continue
+
+            after = key_column < bound_value if is_descending else key_column > bound_value
+            if _nullable(key_column):
+                after = or_(after, key_column.is_(None))
+            clauses.append(and_(*equal_prefix, after))
+            equal_prefix.append(key_column == bound_value)
+
+        return or_(*clauses)
+
+    async def get_many_by_cursor(
+        self,
+        size: int,
+        cursor: Optional[str] = None,
+        where_clause: list[ColumnElement[bool]] = [],
+        sort_keys: list[tuple[InstrumentedAttribute, bool]] = [],
+        relations: list[_AbstractLoad] = None,
+        return_model: Optional[BaseModel | PydanticModel] = None,
+    ) -> PaginatedResponse[PydanticModel]:
+        """
+        Retrieves a page of records using keyset (cursor) pagination.
+
+        Unlike `get_many`, the page is located with a predicate on the sort keys instead of an
+        OFFSET and no total count is computed, so the cost of a page does not grow with its depth.
+        The primary key is always appended as the final sort key to make the order total, and
+        NULLs are ordered last on every key so a cursor positioned on one stays well defined.
+
+        Args:
+            size: The number of records in the page.
+            cursor: The `next_cursor` of the previous page, or None for the first page.
+            where_clause: An optional list of SQLAlchemy where clauses to apply.
+            sort_keys: A list of (column, is_descending) pairs, see `PaginationQuery.sort_keys`.
+            relations: Optional loader options.
+            return_model: An optional BaseModel or PydanticModel to use for returning the result.
+
+        Returns:
+            A PaginatedResponse whose `next_cursor` is None on the last page.
+
+        Raises:
+            BadRequestException: If the cursor is malformed or was issued for a different sort.
+        """
+        session = self.session
+
+        keys = [(key_column, is_descending) for key_column, is_descending in sort_keys
+                if key_column.key != self._dbmodel.id.key]
+        id_descending = next(
+            (is_descending for key_column, is_descending in sort_keys
+             if key_column.key == self._dbmodel.id.key),
+            False,
+        )
+        keys.append((self._dbmodel.id, id_descending))
+
+        stmt = self._select(options=relations).where(*where_clause)
+
+        if cursor:
+            bound_values = PaginationCursor.decode(cursor, [key_column for key_column, _ in keys])
+            stmt = stmt.where(self._keyset_where(keys, bound_values))
+
+        stmt = stmt.order_by(
+            *[
+                (desc(key_column) if is_descending else asc(key_column)).nulls_last()
+                for key_column, is_descending in keys
+            ]
+        ).limit(size + 1)
+
+        if relations:
+            stmt = stmt.options(*relations)
+
+        if self._selects_columns(relations):
+            result = await session.execute(stmt)
+        else:
+            result = await session.scalars(stmt)
+        items = result.all()
+
+        next_cursor = None
+        if len(items) > size:
+            items = items[:size]
+            last = items[-1]
+            next_cursor = PaginationCursor.encode(
+                [key_column.key for key_column, _ in keys],
+                [getattr(last, key_column.key) for key_column, _ in keys],
+            )
+
+        return_model = return_model or self._model
+
+        item_list = await self._materialize(items, return_model, relations)
+
+        return PaginatedResponse[PydanticModel](
+            result=item_list,
+            size=size,
+            next_cursor=next_cursor,
+        )
+
     async def delete_one(
         self,
         val: Any,
@@ -509,7 +904,8 @@ class BaseRepo(Generic[DbModel, PydanticModel]):
         if not return_model:
             return_model = self._model
 
-        return return_model(**deleted_db_model.dict())
+        [deleted] = await self._from_entities([deleted_db_model], return_model)
+        return deleted
 
     async def delete_many(
         self,
@@ -547,7 +943,7 @@ class BaseRepo(Generic[DbModel, PydanticModel]):
         if not return_model:
             return_model = self._model
 
-        return [return_model(**item.dict()) for item in result]
+        return await self._from_entities(result, return_model)
 
     async def update_one(
         self,
@@ -588,7 +984,8 @@ class BaseRepo(Generic[DbModel, PydanticModel]):
         if not return_model:
             return_model = self._model
 
-        return return_model(**updated_db_model.dict())
+        [updated] = await self._from_entities([updated_db_model], return_model)
+        return updated
 
     async def update_many(
         self,
@@ -650,4 +1047,62 @@ class BaseRepo(Generic[DbModel, PydanticModel]):
 
         return_model = return_model or self._model
 
-        return [return_model(**item.dict()) for item in result.all()]
+        return await self._from_entities(result.all(), return_model)
+
+    async def update_rows(
+        self,
+        rows: list[dict[str, Any]],
+        commit: bool = True,
+    ) -> list[dict[str, Any]]:
+        """
+        Updates many records, each with its own values, in a single
+        `UPDATE ... FROM (VALUES ...) RETURNING` statement.
+
+        Every row holds an `id` plus the columns to change. Rows may change different columns:
+        a column a row leaves out (or sets to None) keeps its current value.
+
+        Example usage:
+            await repo.update_rows(
+            ...     [
+            ...         {"id": 1, "target_sets": 4},
+            ...         {"id": 3, "notes": "Slow eccentric", "position": 2048},
+            ...     ],
+            ... )
+
+        Returns:
+            The updated records as plain dicts of their table columns, computed attributes
+            are left out.
+        """
+        if not rows:
+            return []
+
+        if any("id" not in row for row in rows):
+            raise ValueError("every row passed to update_rows must contain an 'id' key")
+
+        session = self.session
+        table = self._dbmodel.table()
+
+        names = ["id", *sorted({key for row in rows for key in row if key != "id"})]
+        new_values = values(
+            *[column(name, table.c[name].type) for name in names], name="new_values"
+        ).data([tuple(row.get(name) for name in names) for row in rows])
+
+        result = await session.execute(
+            update(self._dbmodel)
+            .where(self._dbmodel.id == new_values.c.id)
+            .values(
+                {
+                    name: func.coalesce(new_values.c[name], table.c[name])
+                    for name in names
+                    if name != "id"
+                }
+            )
+            .returning(*table.c)
+            .execution_options(synchronize_session=False)
+        )
+        updated = [dict(row) for row in result.mappings().all()]
+
+        if commit:
+            await session.commit()
+
+        return updated
@@ -0,0 +1,80 @@
+from typing import Any, Hashable, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.sql import Select
+
+
+class IdentityMap:
+    """
+    A request-scoped memo of `BaseRepo.get_one` results, living as long as the `AsyncSession` it is bound to.
+
+    Entries are keyed by (model, return model, statement fingerprint), where the fingerprint is the
+    SQLAlchemy cache key of the compiled `SELECT` plus its bound values, so two lookups hit the same
+    entry only if they would have run the exact same query (same id, same where clause, same options).
+
+    The map is cleared whenever anything could have changed the rows behind it: any ORM `INSERT`,
+    `UPDATE` or `DELETE` executed through the session (this covers `update_one`/`delete_one` as well
+    as hand-written statements such as the position moves in `order_decorator`), any flush of
+    pending objects, and any rollback.
+
+    Example:
+        identity_map = IdentityMap(session)
+        repo = WorkoutPlanRepository(session=session, identity_map=identity_map)
+
+        await repo.get_one(val=1, where_clause=[WorkoutPlan.user_id == user_id])  # queries
+        await repo.get_one(val=1, where_clause=[WorkoutPlan.user_id == user_id])  # memoized
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._entries: dict[Hashable, BaseModel] = {}
+
+        sync_session = session.sync_session
+        event.listen(sync_session, "do_orm_execute", self._on_orm_execute)
+        event.listen(sync_session, "after_flush", self._on_flush)
+        event.listen(sync_session, "after_soft_rollback", self._on_rollback)
+
+    @staticmethod
+    def key_for(
+        model: Any, return_model: Any, stmt: Select
+    ) -> Optional[Hashable]:
+        """Returns the key of `stmt`, or None if the statement cannot be fingerprinted."""
+        cache_key = stmt._generate_cache_key()
+        if cache_key is None:
+            return None
+
+        try:
+            params = tuple(param.effective_value for param in cache_key.bindparams)
+            hash(params)
+        except TypeError:
+            params = tuple(repr(param.effective_value) for param in cache_key.bindparams)
+
+        return (model, return_model, cache_key.key, params)
+
+    def get(self, key: Hashable) -> Optional[BaseModel]:
+        value = self._entries.get(key)
+        if value is None:
+            return None
+        # callers are free to mutate what they get back (e.g. before an update_one)
+        return value.model_copy(deep=True)
+
+    def set(self, key: Hashable, value: BaseModel) -> None:
+        self._entries[key] = value.model_copy(deep=True)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _on_orm_execute(self, orm_execute_state: ORMExecuteState) -> None:
+        if not orm_execute_state.is_select:
+            self.clear()
+
+    def _on_flush(self, session: Session, flush_context: Any) -> None:
+        self.clear()
+
+    def _on_rollback(self, session: Session, previous_transaction: Any) -> None:
+        self.clear()
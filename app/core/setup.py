@@ -7,6 +7,7 @@ from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import AppSettings
 from app.core.database import engine
+from app.dependencies.password_hasher import password_hasher
 
 
 def lifespan_factory(settings: AppSettings) -> Callable[[FastAPI], _AsyncGeneratorContextManager[Any]]:
@@ -14,6 +15,7 @@ def lifespan_factory(settings: AppSettings) -> Callable[[FastAPI], _AsyncGenerat
     async def lifespan(app: FastAPI) -> AsyncGenerator:
         yield
         await engine.dispose()
+        password_hasher.shutdown()
 
     return lifespan
 
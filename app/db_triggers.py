@@ -1,30 +1,28 @@
 from alembic_utils.pg_trigger import PGTrigger
 from alembic_utils.pg_function import PGFunction
 
+# The validation runs once per statement over the transition table (`new_rows`) of the
+# statement, so a batched insert of N results is checked with a single join instead of
+# two lookups per row.
+
 exercise_plan_id_validation_func = PGFunction(
     schema="public",
     signature="validate_exercise_plan_id()",  # PGFunction will pre-append CREATE FUNCTION DDL
     definition="""
         RETURNS TRIGGER AS $$
-        DECLARE
-            current_plan_id INTEGER;
-            exercise_parent_plan_id INTEGER;
         BEGIN
-            IF NEW.exercise_plan_id IS NOT NULL THEN
-                SELECT workout_plan_id INTO current_plan_id
-                FROM workout_sessions
-                WHERE id = NEW.workout_session_id;
-                
-                SELECT workout_plan_id INTO exercise_parent_plan_id
-                FROM exercise_plans
-                WHERE id = NEW.exercise_plan_id;
-                
-                -- Check if the workout plans are the same
-                IF current_plan_id IS DISTINCT FROM exercise_parent_plan_id THEN
-                    RAISE EXCEPTION 'Exercise result references an exercise plan not associated with the session''s workout plan.';
-                END IF;
+            -- Check if the workout plans of the session and the exercise plan are the same
+            IF EXISTS (
+                SELECT 1
+                FROM new_rows
+                LEFT JOIN workout_sessions ON workout_sessions.id = new_rows.workout_session_id
+                LEFT JOIN exercise_plans ON exercise_plans.id = new_rows.exercise_plan_id
+                WHERE new_rows.exercise_plan_id IS NOT NULL
+                AND workout_sessions.workout_plan_id IS DISTINCT FROM exercise_plans.workout_plan_id
+            ) THEN
+                RAISE EXCEPTION 'Exercise result references an exercise plan not associated with the session''s workout plan.';
             END IF;
-            RETURN NEW;
+            RETURN NULL;
         END
         $$ LANGUAGE plpgsql;
     """,
@@ -35,46 +33,69 @@ exercise_set_plan_id_validation_func = PGFunction(
     signature="validate_exercise_set_plan_id()",
     definition="""
         RETURNS TRIGGER AS $$
-        DECLARE
-            current_ex_plan_id INTEGER;
-            target_ex_plan_id INTEGER;
         BEGIN
-            IF NEW.exercise_set_plan_id IS NOT NULL THEN
-                SELECT exercise_plan_id INTO current_ex_plan_id 
-                FROM exercise_results 
-                WHERE id = NEW.exercise_result_id;
-                
-                SELECT exercise_plan_id INTO target_ex_plan_id
-                FROM exercise_set_plans
-                WHERE id = NEW.exercise_set_plan_id;
-                
-                IF current_ex_plan_id IS DISTINCT FROM target_ex_plan_id THEN
-                    RAISE EXCEPTION 'Exercise set result references a set plan not associated with the session''s workout plan.';
-                END IF;
+            IF EXISTS (
+                SELECT 1
+                FROM new_rows
+                LEFT JOIN exercise_results ON exercise_results.id = new_rows.exercise_result_id
+                LEFT JOIN exercise_set_plans ON exercise_set_plans.id = new_rows.exercise_set_plan_id
+                WHERE new_rows.exercise_set_plan_id IS NOT NULL
+                AND exercise_results.exercise_plan_id IS DISTINCT FROM exercise_set_plans.exercise_plan_id
+            ) THEN
+                RAISE EXCEPTION 'Exercise set result references a set plan not associated with the session''s workout plan.';
             END IF;
-            RETURN NEW;
+            RETURN NULL;
         END
         $$ LANGUAGE plpgsql;
     """,
 )
-exercise_set_plan_id_validation_trigger = PGTrigger(
+
+# Postgres does not allow transition tables on triggers with more than one event,
+# so INSERT and UPDATE each get their own trigger sharing the same function.
+exercise_set_plan_id_insert_validation_trigger = PGTrigger(
     schema="public",
-    signature="check_exercise_set_plan_id_relation",
+    signature="check_exercise_set_plan_id_relation_insert",
     on_entity="public.exercise_set_results",
     definition="""
-        BEFORE INSERT OR UPDATE on public.exercise_set_results
-        FOR EACH ROW
+        AFTER INSERT ON public.exercise_set_results
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT
         EXECUTE FUNCTION validate_exercise_set_plan_id();
     """,
 )
 
-exercise_plan_id_validation_trigger = PGTrigger(
+exercise_set_plan_id_update_validation_trigger = PGTrigger(
     schema="public",
-    signature="check_exercise_plan_id_relation",
+    signature="check_exercise_set_plan_id_relation_update",
+    on_entity="public.exercise_set_results",
+    definition="""
+        AFTER UPDATE ON public.exercise_set_results
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION validate_exercise_set_plan_id();
+    """,
+)
+
+exercise_plan_id_insert_validation_trigger = PGTrigger(
+    schema="public",
+    signature="check_exercise_plan_id_relation_insert",
     on_entity="public.exercise_results",  # PGTrigger will pre-append the CREATE TRIGGER DDL
     definition="""
-        BEFORE INSERT OR UPDATE ON public.exercise_results
-        FOR EACH ROW
+        AFTER INSERT ON public.exercise_results
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION validate_exercise_plan_id();
+    """,
+)
+
+exercise_plan_id_update_validation_trigger = PGTrigger(
+    schema="public",
+    signature="check_exercise_plan_id_relation_update",
+    on_entity="public.exercise_results",
+    definition="""
+        AFTER UPDATE ON public.exercise_results
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT
         EXECUTE FUNCTION validate_exercise_plan_id();
     """,
 )
@@ -0,0 +1,30 @@
+from app.core.auth.principal_cache import PrincipalCache
+from app.core.common.cache import TieredCache
+from app.core.config import settings
+
+catalog_cache = TieredCache(
+    namespace="catalog",
+    max_entries=settings.CATALOG_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CATALOG_CACHE_TTL_SECONDS,
+    redis_url=settings.REDIS_SERVER if settings.CACHE_REDIS_ENABLED else None,
+    enabled=settings.CACHE_ENABLED,
+)
+
+
+def get_catalog_cache() -> TieredCache:
+    return catalog_cache
+
+
+principal_cache = PrincipalCache(
+    TieredCache(
+        namespace="auth",
+        max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+        redis_url=settings.REDIS_SERVER if settings.CACHE_REDIS_ENABLED else None,
+        enabled=settings.CACHE_ENABLED,
+    )
+)
+
+
+def get_principal_cache() -> PrincipalCache:
+    return principal_cache
@@ -0,0 +1,12 @@
+from app.core.auth.password_hasher import PasswordHasher
+from app.core.config import settings
+
+password_hasher = PasswordHasher(
+    rounds=settings.PASSWORD_HASH_ROUNDS,
+    max_workers=settings.PASSWORD_HASH_MAX_WORKERS,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+)
+
+
+def get_password_hasher() -> PasswordHasher:
+    return password_hasher
@@ -24,19 +24,8 @@ def get_exercise_set_plan_repo(session: AsyncSession = Depends(get_async_session
     return ExerciseSetPlanRepository(session)
 
 
-def get_workout_plan_repo(
-    session: AsyncSession = Depends(get_async_session),
-    exercise_plan_repo: ExercisePlanRepository = Depends(
-        get_exercise_plan_repo),
-    exercise_set_plan_repo: ExerciseSetPlanRepository = Depends(
-        get_exercise_set_plan_repo
-    ),
-):
-    return WorkoutPlanRepository(
-        session,
-        exercise_plan_repo,
-        exercise_set_plan_repo,
-    )
+def get_workout_plan_repo(session: AsyncSession = Depends(get_async_session)):
+    return WorkoutPlanRepository(session)
 
 
 def get_workout_session_repo(
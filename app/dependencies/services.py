@@ -11,6 +11,8 @@ from app.api.v1.workouts.services import (
 )
 
 
+from app.core.common.cache import TieredCache
+from app.dependencies.cache import get_catalog_cache
 from app.dependencies.repositories import get_all_repos
 from app.repositories import Repos
 
@@ -39,14 +41,23 @@ def get_schedule_service(
     return WorkoutScheduleService(repos=all_repos)
 
 
-def get_exercise_service(all_repos: Repos = Depends(get_all_repos)):
-    return ExerciseService(repos=all_repos)
+def get_exercise_service(
+    all_repos: Repos = Depends(get_all_repos),
+    cache: TieredCache = Depends(get_catalog_cache),
+):
+    return ExerciseService(repos=all_repos, cache=cache)
 
-def get_muscle_group_service(all_repos: Repos = Depends(get_all_repos)):
-    return MuscleGroupService(repos=all_repos)
+def get_muscle_group_service(
+    all_repos: Repos = Depends(get_all_repos),
+    cache: TieredCache = Depends(get_catalog_cache),
+):
+    return MuscleGroupService(repos=all_repos, cache=cache)
 
-def get_category_service(all_repos: Repos = Depends(get_all_repos)):
-    return CategoryService(repos=all_repos)
+def get_category_service(
+    all_repos: Repos = Depends(get_all_repos),
+    cache: TieredCache = Depends(get_catalog_cache),
+):
+    return CategoryService(repos=all_repos, cache=cache)
 
 def get_session_service(all_repos: Repos = Depends(get_all_repos)):
     return WorkoutSessionService(repos=all_repos)
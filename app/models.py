@@ -1,7 +1,7 @@
 from datetime import datetime
 import enum
-from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, text
+from sqlalchemy.orm import Mapped, mapped_column, query_expression, relationship
 
 from app.core.database.base_model import Base
 
@@ -23,6 +23,11 @@ class ScheduleStatus(str, enum.Enum):
     unset = "unset"
 
 
+# distance between neighbouring `position` values when a list is (re)numbered, leaving room
+# to insert or move rows between them without touching their siblings
+POSITION_GAP = 1024
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -30,6 +35,10 @@ class User(Base):
     email: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
     age: Mapped[int] = mapped_column(Integer, nullable=True)
     hashed_password: Mapped[str] = mapped_column(String, nullable=False)
+    # bumped whenever previously issued tokens must stop being accepted (e.g. password change)
+    token_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
 
     # relationships
     workout_plans: Mapped[list["WorkoutPlan"]] = relationship(back_populates="user")
@@ -145,6 +154,11 @@ class Exercise(Base):
         ForeignKey("users.id"), nullable=True, default=None
     )
 
+    __table_args__ = (
+        # serves `name:startswith:` filters, which the unique index cannot under a non-C collation
+        Index("ix_exercises_name_pattern", "name", postgresql_ops={"name": "varchar_pattern_ops"}),
+    )
+
     # relationships
     exercise_muscle_associations: Mapped[list["ExerciseMuscleGroup"]] = relationship(
         back_populates="exercise"
@@ -180,6 +194,16 @@ class WorkoutPlan(Base):
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
     user: Mapped["User"] = relationship(back_populates="workout_plans")
 
+    __table_args__ = (
+        # serves `title:startswith:` filters on a user's plans
+        Index(
+            "ix_workout_plans_user_id_title_pattern",
+            "user_id",
+            "title",
+            postgresql_ops={"title": "varchar_pattern_ops"},
+        ),
+    )
+
     workout_schedules: Mapped[list["WorkoutPlanSchedule"]] = relationship(
         back_populates="workout_plan",
         cascade="all, delete-orphan",
@@ -220,6 +244,20 @@ class WorkoutPlanSchedule(Base):
         back_populates="workout_schedules"
     )
 
+    __table_args__ = (
+        Index(
+            "ix_workout_plan_schedules_workout_plan_id_start_at",
+            "workout_plan_id",
+            "start_at",
+        ),
+        # only pending reminders are swept, see app/worker/tasks/sweep_reminders.py
+        Index(
+            "ix_workout_plan_schedules_pending_reminder_start_at",
+            "start_at",
+            postgresql_where=text("reminder_status = 'pending'"),
+        ),
+    )
+
 
 class WorkoutSession(Base):
     __tablename__ = "workout_sessions"
@@ -249,6 +287,16 @@ class WorkoutSession(Base):
         back_populates="workout_session"
     )
 
+    __table_args__ = (
+        Index("ix_workout_sessions_user_id_started_at", "user_id", "started_at"),
+        # only scheduled sessions are auto-started, see app/worker/tasks/auto_start_session.py
+        Index(
+            "ix_workout_sessions_scheduled_schedule_id",
+            "schedule_id",
+            postgresql_where=text("status = 'scheduled'"),
+        ),
+    )
+
 
 class ExercisePlan(Base):
     """
@@ -257,7 +305,11 @@ class ExercisePlan(Base):
 
     __tablename__ = "exercise_plans"
 
-    order_in_plan: Mapped[int] = mapped_column(nullable=False)
+    # sparse sort key within the workout plan
+    position: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # dense 1..N rank by `position`, not stored: only the reads that return it fill it in
+    # after loading (see `SparseOrdering.attach_orders` and `BaseRepo._attach_computed`), otherwise None
+    order_in_plan: Mapped[int | None] = query_expression()
     target_sets: Mapped[int] = mapped_column(nullable=False)
     target_duration_minutes: Mapped[float] = mapped_column(nullable=True)
     notes: Mapped[str] = mapped_column(String(500), nullable=True)
@@ -279,6 +331,17 @@ class ExercisePlan(Base):
         back_populates="exercise_plan"
     )
 
+    __table_args__ = (
+        # deferred, so renumbering a whole plan may pass through transient duplicates
+        UniqueConstraint(
+            "workout_plan_id",
+            "position",
+            name="exercise_plan_position_uc",
+            deferrable=True,
+            initially="DEFERRED",
+        ),
+    )
+
 
 class ExerciseSetPlan(Base):
     """
@@ -287,7 +350,10 @@ class ExerciseSetPlan(Base):
 
     __tablename__ = "exercise_set_plans"
 
-    set_number: Mapped[int] = mapped_column(nullable=False)
+    # sparse sort key within the exercise plan
+    position: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # dense 1..N rank by `position`, filled in like `ExercisePlan.order_in_plan`
+    set_number: Mapped[int | None] = query_expression()
     target_reps: Mapped[int] = mapped_column(nullable=False)
     target_weight: Mapped[float] = mapped_column(nullable=False)
     target_duration_seconds: Mapped[int] = mapped_column(nullable=True)
@@ -303,6 +369,16 @@ class ExerciseSetPlan(Base):
         back_populates="exercise_set_plan"
     )
 
+    __table_args__ = (
+        UniqueConstraint(
+            "exercise_plan_id",
+            "position",
+            name="exercise_set_plan_position_uc",
+            deferrable=True,
+            initially="DEFERRED",
+        ),
+    )
+
 
 class ExerciseResult(Base):
     """
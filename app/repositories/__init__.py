@@ -1,6 +1,8 @@
 from functools import cached_property
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database.identity_map import IdentityMap
+
 from app.repositories.exercise_repository import ExerciseRepository
 from .workout_plan_repository import WorkoutPlanRepository
 from .exercise_plan_repository import ExercisePlanRepository
@@ -30,43 +32,46 @@ __all__ = all_repos
 class Repos:
     def __init__(self, session: AsyncSession):
         self.session = session
+        # shared by all repositories of this request, so ownership checks on parent rows
+        # (e.g. the workout plan of an exercise plan) are only queried once
+        self.identity_map = IdentityMap(session)
 
     @cached_property
     def workout_plan(self) -> WorkoutPlanRepository:
-        return WorkoutPlanRepository(session=self.session)
+        return WorkoutPlanRepository(session=self.session, identity_map=self.identity_map)
 
     @cached_property
     def exercise_plan(self) -> ExercisePlanRepository:
-        return ExercisePlanRepository(session=self.session)
+        return ExercisePlanRepository(session=self.session, identity_map=self.identity_map)
 
     @cached_property
     def exercise_set_plan(self) -> ExerciseSetPlanRepository:
-        return ExerciseSetPlanRepository(session=self.session)
+        return ExerciseSetPlanRepository(session=self.session, identity_map=self.identity_map)
 
     @cached_property
     def workout_schedule(self) -> WorkoutScheduleRepository:
-        return WorkoutScheduleRepository(session=self.session)
+        return WorkoutScheduleRepository(session=self.session, identity_map=self.identity_map)
 
     @cached_property
     def exercise(self) -> ExerciseRepository:
-        return ExerciseRepository(session=self.session)
+        return ExerciseRepository(session=self.session, identity_map=self.identity_map)
 
     @cached_property
     def muscle_group(self) -> MuscleGroupRepository:
-        return MuscleGroupRepository(session=self.session)
+        return MuscleGroupRepository(session=self.session, identity_map=self.identity_map)
 
     @cached_property
     def category(self) -> CategoryRepository:
-        return CategoryRepository(session=self.session)
+        return CategoryRepository(session=self.session, identity_map=self.identity_map)
 
     @cached_property
     def workout_session(self) -> WorkoutSessionRepository:
-        return WorkoutSessionRepository(session=self.session)
+        return WorkoutSessionRepository(session=self.session, identity_map=self.identity_map)
 
     @cached_property
     def exercise_result(self) -> ExerciseResultRepository:
-        return ExerciseResultRepository(session=self.session)
+        return ExerciseResultRepository(session=self.session, identity_map=self.identity_map)
 
     @cached_property
     def exercise_set_result(self) -> ExerciseResultSetRepository:
-        return ExerciseResultSetRepository(session=self.session)
+        return ExerciseResultSetRepository(session=self.session, identity_map=self.identity_map)
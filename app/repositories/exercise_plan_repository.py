@@ -1,5 +1,8 @@
+from typing import Sequence
+
 from sqlalchemy.orm import selectinload
 from app.api.v1.workouts.schema import ExercisePlanBase
+from app.api.v1.workouts.utils.ordering import attach_plan_orders
 from app.core.database.base_repo import BaseRepo
 from app.models import ExercisePlan, WorkoutPlan
 
@@ -7,6 +10,10 @@ from app.models import ExercisePlan, WorkoutPlan
 class ExercisePlanRepository(BaseRepo[ExercisePlan, ExercisePlanBase]):
     __dbmodel__ = ExercisePlan
     __model__ = ExercisePlanBase
+    __computed__ = ("order_in_plan",)
+
+    async def _attach_computed(self, entities: Sequence[ExercisePlan]) -> None:
+        await attach_plan_orders(self.session, entities)
 
     async def find_one_exercise_plan(
         self,
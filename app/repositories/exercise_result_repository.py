@@ -1,8 +1,10 @@
-from app.core.database.base_repo import BaseRepo
+from app.core.database.base_repo import BaseRepo, Materialization
 from app.api.v1.schema.workout_session import ExerciseResultBase
 from app.models import ExerciseResult
 
 class ExerciseResultRepository(BaseRepo[ExerciseResult, ExerciseResultBase]):
     __dbmodel__ = ExerciseResult
     __model__ = ExerciseResultBase
+    # result rows are written through validated schemas, so they are trusted as-is
+    __materialization__ = Materialization.construct
 
@@ -1,4 +1,7 @@
+from typing import Sequence
+
 from app.api.v1.workouts.schema import ExerciseSetPlanBase
+from app.api.v1.workouts.utils.ordering import set_plan_ordering
 from app.core.database.base_repo import BaseRepo
 from app.models import ExercisePlan, User, ExerciseSetPlan, WorkoutPlan
 
@@ -6,6 +9,10 @@ from app.models import ExercisePlan, User, ExerciseSetPlan, WorkoutPlan
 class ExerciseSetPlanRepository(BaseRepo[ExerciseSetPlan, ExerciseSetPlanBase]):
     __dbmodel__ = ExerciseSetPlan
     __model__ = ExerciseSetPlanBase
+    __computed__ = ("set_number",)
+
+    async def _attach_computed(self, entities: Sequence[ExerciseSetPlan]) -> None:
+        await set_plan_ordering.attach_orders(self.session, entities)
 
     async def find_one_exercise_set_plan(
         self,
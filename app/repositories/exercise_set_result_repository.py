@@ -1,8 +1,10 @@
-from app.core.database.base_repo import BaseRepo
+from app.core.database.base_repo import BaseRepo, Materialization
 from app.api.v1.schema.workout_session import ExerciseSetResultBase
 from app.models import ExerciseSetResult
 
 class ExerciseResultSetRepository(BaseRepo[ExerciseSetResult, ExerciseSetResultBase]):
     __dbmodel__ = ExerciseSetResult
     __model__ = ExerciseSetResultBase
+    # result rows are written through validated schemas, so they are trusted as-is
+    __materialization__ = Materialization.construct
 
@@ -1,9 +1,14 @@
-from sqlalchemy import func, select
+from typing import Optional, Sequence
+
+from sqlalchemy import distinct, func, inspect, select
+from sqlalchemy.dialects.postgresql import array_agg
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.v1.workouts.schema import (
     WorkoutPlanBase,
 )
+from app.api.v1.workouts.utils.ordering import attach_plan_orders
 from app.core.database.base_repo import BaseRepo
+from app.core.database.identity_map import IdentityMap
 from app.models import (
     ExerciseMuscleGroup,
     ExercisePlan,
@@ -19,8 +24,21 @@ class WorkoutPlanRepository(BaseRepo[WorkoutPlan, WorkoutPlanBase]):
     def __init__(
         self,
         session: AsyncSession,
+        identity_map: Optional[IdentityMap] = None,
     ):
-        super().__init__(session)
+        super().__init__(session, identity_map)
+
+    async def _attach_computed(self, entities: Sequence[WorkoutPlan]) -> None:
+        # only the exercise plans loaded with the workout plans carry computed orders
+        await attach_plan_orders(
+            self.session,
+            [
+                exercise_plan
+                for workout_plan in entities
+                if "exercise_plans" not in inspect(workout_plan).unloaded
+                for exercise_plan in workout_plan.exercise_plans
+            ],
+        )
 
     async def get_muscles_for_workout(self, workout_id: int) -> list[str]:
         muscles_for_plan = await self.session.scalars(
@@ -47,4 +65,48 @@ class WorkoutPlanRepository(BaseRepo[WorkoutPlan, WorkoutPlanBase]):
             .subquery()
         )
 
-        return await self.session.scalar(exercises_count_stmt)
\ No newline at end of file
+        return await self.session.scalar(exercises_count_stmt)
+
+    async def get_summaries_for_workouts(
+        self, workout_ids: list[int]
+    ) -> dict[int, tuple[int, list[str]]]:
+        """
+        Computes the exercise count and the distinct muscle targets for many workout plans
+        in a single grouped query.
+
+        Args:
+            workout_ids: ids of the workout plans to summarize.
+
+        Returns:
+            A mapping of workout plan id to a tuple of (exercises_count, muscle_groups).
+            Plans without exercises are absent from the mapping.
+        """
+        if not workout_ids:
+            return {}
+
+        summaries_stmt = (
+            select(
+                ExercisePlan.workout_plan_id,
+                func.count(distinct(ExercisePlan.id)),
+                array_agg(distinct(MuscleGroup.muscle_target)).filter(
+                    MuscleGroup.muscle_target.is_not(None)
+                ),
+            )
+            .outerjoin(
+                ExerciseMuscleGroup,
+                ExerciseMuscleGroup.exercise_id == ExercisePlan.exercise_id,
+            )
+            .outerjoin(
+                MuscleGroup,
+                ExerciseMuscleGroup.muscle_group_id == MuscleGroup.id,
+            )
+            .where(ExercisePlan.workout_plan_id.in_(workout_ids))
+            .group_by(ExercisePlan.workout_plan_id)
+        )
+
+        result = await self.session.execute(summaries_stmt)
+
+        return {
+            workout_id: (exercises_count, muscles or [])
+            for workout_id, exercises_count, muscles in result.all()
+        }
@@ -1,5 +1,5 @@
 from typing import Any
-from app.models import ExercisePlan
+from app.models import POSITION_GAP, ExercisePlan
 from app.seed.base_seed import BaseSeed
 from app.seed.constants import workout_exercise_plans_data
 
@@ -10,6 +10,9 @@ class WorkoutExercisePlanSeed(BaseSeed):
     def create_workout_exercise_plan(
         self, data: dict[str, Any]
     ) -> ExercisePlan:
+        # the seed data lists dense orders, stored as sparse positions
+        data = {**data}
+        data["position"] = data.pop("order_in_plan") * POSITION_GAP
         return self.create_one(data)
 
     def create_many(self) -> list[ExercisePlan]:
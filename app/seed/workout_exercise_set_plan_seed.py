@@ -1,5 +1,5 @@
 from typing import Any
-from app.models import ExerciseSetPlan
+from app.models import POSITION_GAP, ExerciseSetPlan
 from app.seed.base_seed import BaseSeed
 from app.seed.constants import workout_exercise_set_plans_data
 
@@ -10,6 +10,9 @@ class WorkoutExerciseSetPlanSeed(BaseSeed):
     def create_workout_exercise_set_plan(
         self, data: dict[str, Any]
     ) -> ExerciseSetPlan:
+        # the seed data lists dense orders, stored as sparse positions
+        data = {**data}
+        data["position"] = data.pop("set_number") * POSITION_GAP
         return self.create_one(data)
 
     def create_many(self) -> list[ExerciseSetPlan]:
@@ -0,0 +1,162 @@
+import csv
+import enum
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Exercise, ExerciseResult, ExerciseSetResult, WorkoutSession
+
+
+class ExportFormat(str, enum.Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+# one row per set result; sessions without results and results without sets still get
+# a row, with the missing columns left empty
+HISTORY_COLUMNS = [
+    WorkoutSession.id.label("session_id"),
+    WorkoutSession.title.label("session_title"),
+    WorkoutSession.status.label("session_status"),
+    WorkoutSession.workout_plan_id,
+    WorkoutSession.started_at,
+    WorkoutSession.ended_at,
+    WorkoutSession.duration_minutes,
+    ExerciseResult.id.label("exercise_result_id"),
+    ExerciseResult.exercise_id,
+    Exercise.name.label("exercise_name"),
+    ExerciseResult.exercise_plan_id,
+    ExerciseResult.sets_achieved,
+    ExerciseResult.duration_minutes_achieved,
+    ExerciseSetResult.id.label("set_result_id"),
+    ExerciseSetResult.exercise_set_plan_id,
+    ExerciseSetResult.set_number,
+    ExerciseSetResult.reps_achieved,
+    ExerciseSetResult.weight_achieved,
+    ExerciseSetResult.duration_seconds,
+    ExerciseSetResult.rpe,
+]
+HISTORY_FIELDS = [column.key for column in HISTORY_COLUMNS]
+
+
+def _history_stmt(user_id: int):
+    return (
+        select(*HISTORY_COLUMNS)
+        .select_from(WorkoutSession)
+        .outerjoin(ExerciseResult, ExerciseResult.workout_session_id == WorkoutSession.id)
+        .outerjoin(Exercise, Exercise.id == ExerciseResult.exercise_id)
+        .outerjoin(ExerciseSetResult, ExerciseSetResult.exercise_result_id == ExerciseResult.id)
+        .where(WorkoutSession.user_id == user_id)
+        .order_by(
+            WorkoutSession.started_at.asc().nulls_last(),
+            WorkoutSession.id,
+            ExerciseResult.id,
+            ExerciseSetResult.set_number,
+        )
+    )
+
+
+def _to_text(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+class HistoryExporter:
+    """
+    Exports a user's full training history (session -> exercise result -> set result) as
+    flat rows, read with a single joined query through a server-side cursor and encoded
+    chunk by chunk, so memory stays bounded by `chunk_size` however long the history is.
+
+    Example:
+        exporter = HistoryExporter(session, user_id=1, export_format=ExportFormat.csv)
+        async for data in exporter.stream(compress=True):
+            out.write(data)
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        export_format: ExportFormat = ExportFormat.ndjson,
+        chunk_size: int = 1000,
+    ):
+        self.session = session
+        self.user_id = user_id
+        self.export_format = export_format
+        self.chunk_size = chunk_size
+
+    @property
+    def media_type(self) -> str:
+        return EXPORT_MEDIA_TYPES[self.export_format]
+
+    def filename(self, compress: bool = False) -> str:
+        name = f"training-history-{self.user_id}.{self.export_format.value}"
+        return f"{name}.gz" if compress else name
+
+    async def _partitions(self) -> AsyncIterator[Sequence[RowMapping]]:
+        result = await self.session.stream(
+            _history_stmt(self.user_id),
+            execution_options={"yield_per": self.chunk_size},
+        )
+        try:
+            async for partition in result.mappings().partitions():
+                yield partition
+        finally:
+            await result.close()
+
+    def _encode_ndjson(self, rows: Sequence[RowMapping]) -> bytes:
+        return "".join(
+            json.dumps({key: _to_text(value) for key, value in row.items()}) + "\n"
+            for row in rows
+        ).encode()
+
+    def _encode_csv(self, rows: Sequence[RowMapping], header: bool) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(HISTORY_FIELDS)
+        writer.writerows(
+            [_to_text(row[field]) for field in HISTORY_FIELDS] for row in rows
+        )
+        return buffer.getvalue().encode()
+
+    async def encode(self) -> AsyncIterator[bytes]:
+        """Yields the encoded export, one chunk of rows at a time."""
+        if self.export_format is ExportFormat.csv:
+            # the header is written even for an empty history
+            yield self._encode_csv([], header=True)
+
+        async for rows in self._partitions():
+            if self.export_format is ExportFormat.csv:
+                yield self._encode_csv(rows, header=False)
+            else:
+                yield self._encode_ndjson(rows)
+
+    async def stream(self, compress: bool = False) -> AsyncIterator[bytes]:
+        """Yields the export, gzip-compressed on the fly when `compress` is set."""
+        if not compress:
+            async for data in self.encode():
+                yield data
+            return
+
+        # wbits=31 writes a gzip header and trailer around the deflate stream
+        compressor = zlib.compressobj(wbits=31)
+        async for data in self.encode():
+            compressed = compressor.compress(data)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
@@ -11,7 +11,7 @@ logger = logging.getLogger("uvicorn.warning")
 logger.setLevel(logging.INFO)
 
 celery_app.conf.update(
-    imports=["app.worker.tasks"],
+    imports=["app.worker.runtime", "app.worker.tasks"],
     worker_log_format="[%(asctime)s: %(levelname)s/%(processName)s] %(message)s",
     worker_task_log_format="[%(asctime)s: %(levelname)s/%(processName)s] [%(task_name)s(%(task_id)s)] %(message)s",
 )
@@ -20,3 +20,14 @@ if settings.ENV == "dev":
     celery_app.control.purge()
 
 celery_app.conf.timezone = "UTC"
+
+celery_app.conf.beat_schedule = {
+    "sweep-due-reminders": {
+        "task": "sweep_due_reminders",
+        "schedule": settings.REMINDER_SWEEP_INTERVAL_SECONDS,
+    },
+    "start-due-sessions": {
+        "task": "start_due_sessions",
+        "schedule": settings.AUTO_START_SWEEP_INTERVAL_SECONDS,
+    },
+}
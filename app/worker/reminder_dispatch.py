@@ -0,0 +1,98 @@
+import abc
+import asyncio
+import logging
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def reminder_message(schedule_id: int) -> dict:
+    return {
+        "from": "onboarding@resend.dev",
+        "to": "aftereffectxiii@gmail.com",
+        "subject": "Prepare for your incoming workout",
+        "html": f"<p>This is a reminder of your workout, scheduled id is: {schedule_id}!</p>",
+    }
+
+
+class EmailTransport(abc.ABC):
+    """Sends a batch of emails in one call; a batch either fully succeeds or raises."""
+
+    # the most emails the provider accepts per call
+    max_batch_size: int = 100
+
+    @abc.abstractmethod
+    async def send_batch(self, messages: list[dict]) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+
+class ResendTransport(EmailTransport):
+    """
+    Posts batches to Resend's `/emails/batch` endpoint over a pooled async HTTP client.
+    `base_url` can point at any server speaking the same API, e.g. a local stub for benchmarks.
+    """
+
+    def __init__(self, api_key: str, base_url: str, timeout_seconds: float = 10.0):
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=timeout_seconds,
+        )
+
+    async def send_batch(self, messages: list[dict]) -> None:
+        response = await self._client.post("/emails/batch", json=messages)
+        response.raise_for_status()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class ReminderDispatcher:
+    """
+    Sends the reminders of many schedules as provider batches, with at most `max_concurrency`
+    batches in flight, and reports which schedules were sent so they can be marked in one update.
+
+    Example:
+        async with ReminderDispatcher(transport) as dispatcher:
+            sent_ids = await dispatcher.dispatch([1, 2, 3])
+    """
+
+    def __init__(self, transport: Optional[EmailTransport] = None, max_concurrency: Optional[int] = None):
+        self.transport = transport or ResendTransport(
+            api_key=settings.EMAIL_SERVICE, base_url=settings.EMAIL_API_URL
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency or settings.EMAIL_MAX_CONCURRENCY)
+
+    async def __aenter__(self) -> "ReminderDispatcher":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.transport.aclose()
+
+    async def _send(self, schedule_ids: list[int]) -> list[int]:
+        async with self._semaphore:
+            try:
+                await self.transport.send_batch(
+                    [reminder_message(schedule_id) for schedule_id in schedule_ids]
+                )
+            except Exception as e:
+                # the whole batch stays pending and is retried by the next sweep
+                logger.info(f"Error sending reminder batch for schedule_ids {schedule_ids}: {e}")
+                return []
+            return schedule_ids
+
+    async def dispatch(self, schedule_ids: list[int]) -> list[int]:
+        """Sends the reminders of `schedule_ids` and returns the ids that were sent."""
+        size = self.transport.max_batch_size
+        batches = [schedule_ids[i : i + size] for i in range(0, len(schedule_ids), size)]
+
+        sent = await asyncio.gather(*[self._send(batch) for batch in batches])
+
+        return [schedule_id for batch in sent for schedule_id in batch]
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+from typing import Any, Coroutine, Optional, TypeVar
+
+from celery.signals import worker_process_init, worker_process_shutdown
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.database.url import DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class WorkerRuntime:
+    """
+    One long-lived event loop and pooled async engine per worker process.
+
+    Tasks are synchronous Celery callables, so they submit their coroutines to `run`
+    instead of spinning up a loop (and new connections) each time. The engine is
+    created on this loop, so pooled asyncpg connections are reused across tasks and
+    never cross loops. The API's module-level engine is not used here: a forked
+    worker process would otherwise inherit the parent's pool.
+
+    Example:
+        async def start():
+            async with worker_runtime.session() as session:
+                ...
+
+        worker_runtime.run(start())
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._engine: Optional[AsyncEngine] = None
+        self._session_maker: Optional[async_sessionmaker[AsyncSession]] = None
+
+    @property
+    def started(self) -> bool:
+        return self._loop is not None
+
+    def start(self):
+        if self.started:
+            return
+
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._engine = create_async_engine(
+            DATABASE_URL,
+            echo=False,
+            pool_size=settings.WORKER_DB_POOL_SIZE,
+            pool_pre_ping=True,
+        )
+        self._session_maker = async_sessionmaker(bind=self._engine, expire_on_commit=False)
+        logger.info("Started worker event loop and database engine")
+
+    def shutdown(self):
+        if not self.started:
+            return
+
+        try:
+            self._loop.run_until_complete(self._engine.dispose())
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+        finally:
+            self._loop.close()
+            self._loop = None
+            self._engine = None
+            self._session_maker = None
+            logger.info("Stopped worker event loop and database engine")
+
+    def session(self) -> AsyncSession:
+        # started lazily for pools that never fire worker_process_init (e.g. solo, eager tasks)
+        self.start()
+        return self._session_maker()
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        self.start()
+        return self._loop.run_until_complete(coro)
+
+
+worker_runtime = WorkerRuntime()
+
+
+@worker_process_init.connect
+def _start_worker_runtime(**kwargs):
+    worker_runtime.start()
+
+
+@worker_process_shutdown.connect
+def _shutdown_worker_runtime(**kwargs):
+    worker_runtime.shutdown()
@@ -1,4 +1,6 @@
-from .auto_start_session import start_scheduled_session
+from .auto_start_session import start_due_sessions, start_scheduled_session
+from .export_history import export_training_history
 from .send_email import reminder_email
+from .sweep_reminders import sweep_due_reminders
 
-__all__ = [reminder_email, start_scheduled_session]
+__all__ = [reminder_email, start_scheduled_session, start_due_sessions, export_training_history, sweep_due_reminders]
@@ -1,8 +1,11 @@
-import asyncio
-from sqlalchemy import select
-from app.core.database.async_session_maker import AsyncSessionMaker
-from app.models import WorkoutSession, WorkoutSessionStatus
+import time
+from datetime import datetime
+
+import pytz
+from sqlalchemy import select, update
+from app.models import WorkoutPlanSchedule, WorkoutSession, WorkoutSessionStatus
 from ..celery_app import celery_app
+from ..runtime import worker_runtime
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,7 +16,7 @@ def start_scheduled_session(session_id: int):
     logger.info(f"Attempting to start scheduled session: {session_id}")
 
     async def get_and_start_session():
-        async with AsyncSessionMaker() as session:
+        async with worker_runtime.session() as session:
             try:
                 workout_session = await session.scalar(
                     select(WorkoutSession).where(WorkoutSession.id == session_id)
@@ -32,6 +35,37 @@ def start_scheduled_session(session_id: int):
             finally:
                 await session.close()
 
-    running_loop = asyncio.get_event_loop()
-    running_loop.run_until_complete(get_and_start_session())    
+    worker_runtime.run(get_and_start_session())
     return f"Executed starting session with id: {session_id}"
+
+
+@celery_app.task(name="start_due_sessions")
+def start_due_sessions():
+    """
+    Moves every scheduled session whose auto-start schedule has begun to in_progress,
+    in one `UPDATE ... FROM workout_plan_schedules ... RETURNING` statement.
+    """
+
+    async def start_sessions() -> list[int]:
+        async with worker_runtime.session() as session:
+            async with session.begin():
+                started_ids = await session.scalars(
+                    update(WorkoutSession)
+                    .where(
+                        WorkoutSession.schedule_id == WorkoutPlanSchedule.id,
+                        WorkoutSession.status == WorkoutSessionStatus.scheduled,
+                        WorkoutPlanSchedule.auto_start_session.is_(True),
+                        WorkoutPlanSchedule.start_at <= datetime.now(pytz.UTC),
+                    )
+                    .values(status=WorkoutSessionStatus.in_progress)
+                    .returning(WorkoutSession.id)
+                    .execution_options(synchronize_session=False)
+                )
+                return started_ids.all()
+
+    started_at = time.perf_counter()
+    started_ids = worker_runtime.run(start_sessions())
+    elapsed_ms = (time.perf_counter() - started_at) * 1000
+
+    logger.info(f"Auto-started {len(started_ids)} sessions in {elapsed_ms:.1f}ms: {started_ids}")
+    return {"started": len(started_ids), "elapsed_ms": round(elapsed_ms, 1)}
@@ -0,0 +1,50 @@
+import logging
+import os
+from datetime import datetime
+
+from app.utils.history_export import ExportFormat, HistoryExporter
+from app.core.config import settings
+from ..celery_app import celery_app
+from ..runtime import worker_runtime
+
+logger = logging.getLogger(__name__)
+
+
+def export_path(user_id: int, filename: str) -> str:
+    """Where the export `filename` of `user_id` is written, under the EXPORT_DIR shared with the API."""
+    return os.path.join(settings.EXPORT_DIR, str(user_id), os.path.basename(filename))
+
+
+@celery_app.task(name="export_training_history")
+def export_training_history(user_id: int, export_format: str = ExportFormat.ndjson.value) -> dict:
+    """
+    Writes the gzipped export of `user_id` under EXPORT_DIR and returns its owner and file name,
+    which `GET /sessions/export/{task_id}/download` serves it from.
+    """
+    logger.info(f"Exporting training history of user: {user_id} as {export_format}")
+
+    async def write_export() -> str:
+        async with worker_runtime.session() as session:
+            exporter = HistoryExporter(
+                session=session, user_id=user_id, export_format=ExportFormat(export_format)
+            )
+            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+            path = export_path(user_id, f"{timestamp}-{exporter.filename(compress=True)}")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                with open(path, "wb") as out:
+                    async for data in exporter.stream(compress=True):
+                        out.write(data)
+            except Exception:
+                # never leave a truncated export behind
+                if os.path.exists(path):
+                    os.remove(path)
+                raise
+            finally:
+                await session.close()
+
+            return path
+
+    path = worker_runtime.run(write_export())
+    logger.info(f"Exported training history of user: {user_id} to {path}")
+    return {"user_id": user_id, "filename": os.path.basename(path)}
@@ -1,57 +1,61 @@
-import asyncio
 import logging
 import resend
 from datetime import datetime
 
 from sqlalchemy import select
 
-from app.core.database.async_session_maker import AsyncSessionMaker
 from app.models import ScheduleStatus, WorkoutPlanSchedule
 from ..celery_app import celery_app
+from ..reminder_dispatch import reminder_message
+from ..runtime import worker_runtime
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+def send_reminder(schedule_id: int):
+    resend.api_key = settings.EMAIL_SERVICE
+
+    resend.Emails.send(reminder_message(schedule_id))
+
+
 @celery_app.task(name="send_workout_reminder_email")
 def reminder_email(schedule_id: int | None = None):
+    """
+    Sends the reminder of one schedule. Reminders are sent by `sweep_due_reminders` now; this
+    task only serves the ETA tasks queued before, so it sends nothing unless the schedule's
+    reminder is still pending, and holds the row locked (skipped by a concurrent sweep) until
+    it is marked sent.
+    """
     logger.info(f"{datetime.now().isoformat()}")
     logger.info(f"Running reminder email for schedule_id: {schedule_id}")
 
-    resend.api_key = settings.EMAIL_SERVICE
-
-    try:
-        # Run the synchronous resend call in a separate thread to not block the event loop
-
-        resend.Emails.send(
-            {
-                "from": "onboarding@resend.dev",
-                "to": "aftereffectxiii@gmail.com",
-                "subject": "Prepare for your incoming workout",
-                "html": f"<p>This is a reminder of your workout, scheduled id is: {schedule_id}!</p>",
-            }
-        )
-        logger.info(f"Email sent successfully for schedule_id: {schedule_id}")
-
-    except Exception as e:
-        logger.info(f"Error sending email for schedule_id {schedule_id}: {e}")
-        return f"Email Reminder Failed: Error sending email. {e}"
-
-    async def get_and_update_schedule():
-        async with AsyncSessionMaker() as session:
+    async def send_and_update_schedule():
+        async with worker_runtime.session() as session:
             try:
                 workout_schedule = await session.scalar(
-                    select(WorkoutPlanSchedule).where(
-                        WorkoutPlanSchedule.id == schedule_id
+                    select(WorkoutPlanSchedule)
+                    .where(
+                        WorkoutPlanSchedule.id == schedule_id,
+                        WorkoutPlanSchedule.reminder_status == ScheduleStatus.pending,
                     )
+                    # like `_due_reminders_stmt`: a sweep holding the row is sending it already
+                    .with_for_update(skip_locked=True)
                 )
 
                 if not workout_schedule:
-                    logger.info(f"Workout schedule with id {schedule_id} not found.")
-                    # You might want to retry this task later or handle it differently
-                    return f"Email Reminder Failed: Workout schedule {schedule_id} not found."
+                    logger.info(
+                        f"No pending reminder for schedule_id {schedule_id}, nothing to send."
+                    )
+                    return f"Email Reminder Skipped: schedule {schedule_id} has no pending reminder."
 
-                logger.info(f"Fetched schedule entity: {workout_schedule}")
+                try:
+                    send_reminder(schedule_id)
+                    logger.info(f"Email sent successfully for schedule_id: {schedule_id}")
+                except Exception as e:
+                    await session.rollback()
+                    logger.info(f"Error sending email for schedule_id {schedule_id}: {e}")
+                    return f"Email Reminder Failed: Error sending email. {e}"
 
                 workout_schedule.reminder_send_time = datetime.now()
                 workout_schedule.reminder_status = ScheduleStatus.sent
@@ -66,7 +70,6 @@ def reminder_email(schedule_id: int | None = None):
             finally:
                 await session.close()
 
-    running_loop = asyncio.get_event_loop()
-    running_loop.run_until_complete(get_and_update_schedule())
+        return f"Email Reminder for schedule_id: {schedule_id} Sent!"
 
-    return f"Email Reminder for schedule_id: {schedule_id} Sent!"
+    return worker_runtime.run(send_and_update_schedule())
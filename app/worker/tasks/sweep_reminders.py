@@ -0,0 +1,78 @@
+import logging
+from datetime import datetime, timedelta
+
+import pytz
+from sqlalchemy import Integer, Interval, any_, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.core.config import settings
+from app.models import ScheduleStatus, WorkoutPlanSchedule
+from ..celery_app import celery_app
+from ..reminder_dispatch import ReminderDispatcher
+from ..runtime import worker_runtime
+
+logger = logging.getLogger(__name__)
+
+# no reminder is sent earlier than this before its workout (see TimeValidation.REMINDER_LIMITS),
+# which bounds the `start_at` range scanned on the pending-reminder partial index
+MAX_REMINDER_LEAD = timedelta(minutes=43200)
+
+
+def _due_reminders_stmt(now: datetime, batch_size: int):
+    send_at = WorkoutPlanSchedule.start_at - (
+        WorkoutPlanSchedule.remind_before_minutes * literal(timedelta(minutes=1), Interval)
+    )
+    return (
+        select(WorkoutPlanSchedule.id)
+        .where(
+            WorkoutPlanSchedule.reminder_status == ScheduleStatus.pending,
+            WorkoutPlanSchedule.start_at <= now + MAX_REMINDER_LEAD,
+            send_at <= now,
+        )
+        .order_by(WorkoutPlanSchedule.start_at)
+        .limit(batch_size)
+        # concurrent sweeps (e.g. an overlapping beat tick) take disjoint batches
+        .with_for_update(skip_locked=True)
+    )
+
+
+@celery_app.task(name="sweep_due_reminders")
+def sweep_due_reminders(batch_size: int | None = None):
+    batch_size = batch_size or settings.REMINDER_SWEEP_BATCH_SIZE
+
+    async def sweep() -> tuple[int, int]:
+        sent, failed = 0, 0
+
+        async with ReminderDispatcher() as dispatcher:
+            while True:
+                async with worker_runtime.session() as session:
+                    async with session.begin():
+                        now = datetime.now(pytz.UTC)
+                        due_ids = (
+                            await session.scalars(_due_reminders_stmt(now, batch_size))
+                        ).all()
+
+                        # unsent reminders are left pending, so the next sweep retries them
+                        sent_ids = await dispatcher.dispatch(list(due_ids))
+
+                        if sent_ids:
+                            await session.execute(
+                                update(WorkoutPlanSchedule)
+                                .where(
+                                    WorkoutPlanSchedule.id
+                                    == any_(literal(sent_ids, ARRAY(Integer)))
+                                )
+                                .values(
+                                    reminder_status=ScheduleStatus.sent,
+                                    reminder_send_time=now.replace(tzinfo=None),
+                                )
+                            )
+                        sent += len(sent_ids)
+                        failed += len(due_ids) - len(sent_ids)
+
+                if len(due_ids) < batch_size or not sent_ids:
+                    return sent, failed
+
+    sent, failed = worker_runtime.run(sweep())
+    logger.info(f"Reminder sweep sent: {sent}, failed: {failed}")
+    return f"Reminder sweep sent: {sent}, failed: {failed}"
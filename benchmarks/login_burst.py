@@ -0,0 +1,88 @@
+"""
+Event loop lag during a burst of concurrent logins: a 1ms ticker stands in for unrelated
+requests served by the same worker while 20 bcrypt verifications (cost 12) run, once on the
+event loop itself and once through `PasswordHasher`. The lag of a tick is how late it woke
+up, i.e. the latency any other request on that worker would have gained.
+
+No database is involved. Run from the repository root with the app settings available
+(`.env`, read for the hasher's pool sizes):
+
+    python -m benchmarks.login_burst --logins 20 --rounds 12
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable
+
+from app.core.auth.password_hasher import PasswordHasher
+from app.core.config import settings
+
+TICK_SECONDS = 0.001
+PASSWORD = "correct horse battery staple"
+
+
+async def _tick(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        expected = time.perf_counter() + TICK_SECONDS
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(max(time.perf_counter() - expected, 0.0))
+
+
+async def _burst(verify: Callable[[], Awaitable[bool]], logins: int) -> tuple[float, list[float]]:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_tick(lags, stop))
+    # let the ticker settle before the burst starts
+    await asyncio.sleep(0.05)
+
+    started = time.perf_counter()
+    assert all(await asyncio.gather(*[verify() for _ in range(logins)]))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await ticker
+    return elapsed, lags
+
+
+async def main(logins: int, rounds: int) -> None:
+    hasher = PasswordHasher(
+        rounds=rounds,
+        max_workers=settings.PASSWORD_HASH_MAX_WORKERS,
+        max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+    )
+    hashed_password = hasher.context.hash(PASSWORD)
+
+    async def on_loop() -> bool:
+        # yield once so the verifications interleave with the ticker like separate requests
+        await asyncio.sleep(0)
+        return hasher.context.verify(PASSWORD, hashed_password)
+
+    async def on_pool() -> bool:
+        return await hasher.verify(PASSWORD, hashed_password)
+
+    print(
+        f"{logins} concurrent verifications, cost {rounds}, "
+        f"{settings.PASSWORD_HASH_MAX_WORKERS} hasher threads\n"
+        f"{'verify':<10} {'burst ms':>9} {'lag p50 ms':>11} {'lag p99 ms':>11} {'lag max ms':>11}"
+    )
+    try:
+        for name, verify in (("on loop", on_loop), ("hasher", on_pool)):
+            elapsed, lags = await _burst(verify, logins)
+            p99 = statistics.quantiles(lags, n=100, method="inclusive")[98]
+            print(
+                f"{name:<10} {elapsed * 1000:>9.0f} {statistics.median(lags) * 1000:>11.2f} "
+                f"{p99 * 1000:>11.2f} {max(lags) * 1000:>11.2f}"
+            )
+    finally:
+        hasher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=12)
+    arguments = parser.parse_args()
+
+    asyncio.run(main(arguments.logins, arguments.rounds))
@@ -0,0 +1,101 @@
+"""
+CPU time and peak allocations of reading 10k `exercise_set_results` rows through
+`ExerciseResultSetRepository.get_all` with each `Materialization` mode.
+
+Rows live in an in-memory SQLite database, so the query costs the same for every mode and
+the difference is the materialization itself. Run from the repository root with the app
+settings available (`.env`); ENV=prod skips the Celery queue purge done on import in dev:
+
+    ENV=prod python -m benchmarks.materialization --rows 10000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+
+import app.main  # noqa: F401  (imports the routers before the repositories they depend on)
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.database.base_model import Base
+from app.core.database.base_repo import Materialization
+from app.models import ExerciseSetResult
+from app.repositories.exercise_set_result_repository import ExerciseResultSetRepository
+
+
+async def _seed(session_maker: async_sessionmaker, rows: int) -> None:
+    async with session_maker() as session:
+        await session.execute(
+            insert(ExerciseSetResult),
+            [
+                {
+                    "set_number": index % 5 + 1,
+                    "reps_achieved": 8,
+                    "weight_achieved": 62.5,
+                    "duration_seconds": 45,
+                    "rpe": 7,
+                    "exercise_result_id": index // 5 + 1,
+                    "exercise_set_plan_id": index + 1,
+                }
+                for index in range(rows)
+            ],
+        )
+        await session.commit()
+
+
+async def _measure(
+    session_maker: async_sessionmaker, mode: Materialization, repeat: int
+) -> tuple[int, float, int]:
+    repo_class = type(
+        f"{mode.name.title()}SetResultRepository",
+        (ExerciseResultSetRepository,),
+        {"__materialization__": mode},
+    )
+
+    # a fresh session per run, so the orm mode never reads from a warm identity map
+    timings = []
+    for _ in range(repeat):
+        async with session_maker() as session:
+            started = time.process_time()
+            result = await repo_class(session).get_all()
+            timings.append(time.process_time() - started)
+
+    # allocations are traced in a separate run, tracing slows everything down
+    async with session_maker() as session:
+        tracemalloc.start()
+        await repo_class(session).get_all()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return len(result), statistics.median(timings), peak
+
+
+async def main(rows: int, repeat: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(
+                Base.metadata.create_all, tables=[ExerciseSetResult.__table__]
+            )
+        await _seed(session_maker, rows)
+
+        print(f"{'mode':<10} {'rows':>7} {'cpu ms (median)':>16} {'peak MiB':>9}")
+        for mode in Materialization:
+            count, cpu_seconds, peak = await _measure(session_maker, mode, repeat)
+            print(f"{mode.value:<10} {count:>7} {cpu_seconds * 1000:>16.1f} {peak / 2**20:>9.1f}")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+
+    asyncio.run(main(arguments.rows, arguments.repeat))
@@ -0,0 +1,59 @@
+"""
+Cost of parsing a paginated request's `filter_by`/`sort_by` (4 filters, 2 sort keys) on
+`WorkoutSessionPagination`: building the query model and reading its filter and sort
+expressions, with the `PaginationPlan` caches warm and with them cleared before every request.
+
+No database is involved. Run from the repository root with the app settings available
+(`.env`); ENV=prod skips the Celery queue purge done on import in dev:
+
+    ENV=prod python -m benchmarks.pagination_parse --number 20000
+"""
+
+import argparse
+import timeit
+
+import app.main  # noqa: F401  (imports the routers before the modules they depend on)
+
+from app.api.v1.sessions.schema import WorkoutSessionPagination
+from app.core.common.pagination_factory import PaginationPlan
+
+QUERY = {
+    "page": 1,
+    "size": 20,
+    "filter_by": (
+        "status=completed,"
+        "started_at>=2026-01-01T00:00:00+00:00,"
+        "workout_plan_id:in:1|2|3,"
+        "title:startswith:Leg"
+    ),
+    "sort_by": "-started_at,id",
+}
+
+
+def parse() -> None:
+    pagination = WorkoutSessionPagination(**QUERY)
+    pagination.filter_fields
+    pagination.sort_fields
+    pagination.sort_keys
+
+
+def parse_cold() -> None:
+    PaginationPlan.compile_filters.cache_clear()
+    PaginationPlan.compile_sort_keys.cache_clear()
+    PaginationPlan.compile_sort_fields.cache_clear()
+    parse()
+
+
+def main(number: int) -> None:
+    print(f"4 filters + 2 sort keys, best of 5 x {number} requests")
+    for name, run in (("cached", parse), ("cold", parse_cold)):
+        seconds = min(timeit.repeat(run, number=number, repeat=5)) / number
+        print(f"{name:<8} {seconds * 1e6:>8.1f} us/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20_000)
+    arguments = parser.parse_args()
+
+    main(arguments.number)
@@ -0,0 +1,102 @@
+"""
+Time of converting a 30-exercise / 150-set workout plan between its schema and ORM entities
+with `AppBaseModel.create_entity` and `update_entity`, with the cached conversion plans
+(`entity_conversion_plan`) and with the cache cleared before every conversion.
+
+No database is involved. Run from the repository root with the app settings available
+(`.env`); ENV=prod skips the Celery queue purge done on import in dev:
+
+    ENV=prod python -m benchmarks.plan_conversion --exercises 30 --sets 5 --number 200
+"""
+
+import argparse
+import timeit
+
+import app.main  # noqa: F401  (imports the routers before the modules they depend on)
+
+from app.api.v1.schema.workout_plan import (
+    ExercisePlanBase,
+    ExerciseSetPlanBase,
+    WorkoutPlanBase,
+)
+from app.core.common.app_response import entity_conversion_plan
+from app.models import WorkoutPlan
+
+
+def _workout_plan(exercises: int, sets: int, with_ids: bool) -> WorkoutPlanBase:
+    return WorkoutPlanBase(
+        id=1 if with_ids else None,
+        title="Benchmark plan",
+        description="30 exercises of 5 sets",
+        user_id=1,
+        exercise_plans=[
+            ExercisePlanBase(
+                id=exercise_index + 1 if with_ids else None,
+                exercise_id=exercise_index + 1,
+                order_in_plan=exercise_index + 1,
+                target_sets=sets,
+                notes=f"exercise {exercise_index + 1}",
+                exercise_set_plans=[
+                    ExerciseSetPlanBase(
+                        id=exercise_index * sets + set_index + 1 if with_ids else None,
+                        set_number=set_index + 1,
+                        target_reps=8 + set_index,
+                        target_weight=60.0 + set_index * 2.5,
+                    )
+                    for set_index in range(sets)
+                ],
+            )
+            for exercise_index in range(exercises)
+        ],
+    )
+
+
+def _existing_entity(schema: WorkoutPlanBase) -> WorkoutPlan:
+    # `create_entity` leaves ids to the database, set them as a loaded plan would have them
+    entity = WorkoutPlanBase.create_entity(schema)
+    entity.id = schema.id
+    for exercise_plan, exercise_schema in zip(entity.exercise_plans, schema.exercise_plans):
+        exercise_plan.id = exercise_schema.id
+        for set_plan, set_schema in zip(
+            exercise_plan.exercise_set_plans, exercise_schema.exercise_set_plans
+        ):
+            set_plan.id = set_schema.id
+    return entity
+
+
+def main(exercises: int, sets: int, number: int) -> None:
+    create_payload = _workout_plan(exercises, sets, with_ids=False)
+    update_payload = _workout_plan(exercises, sets, with_ids=True)
+    entity = _existing_entity(update_payload)
+
+    def create() -> None:
+        WorkoutPlanBase.create_entity(create_payload)
+
+    def update() -> None:
+        WorkoutPlanBase.update_entity(update_payload, entity=entity)
+
+    def cold(convert):
+        def run() -> None:
+            entity_conversion_plan.cache_clear()
+            convert()
+
+        return run
+
+    print(
+        f"{exercises} exercises x {sets} sets, best of 5 x {number} conversions\n"
+        f"{'conversion':<12} {'cached us':>10} {'cold us':>10}"
+    )
+    for name, convert in (("create", create), ("update", update)):
+        cached = min(timeit.repeat(convert, number=number, repeat=5)) / number
+        uncached = min(timeit.repeat(cold(convert), number=number, repeat=5)) / number
+        print(f"{name:<12} {cached * 1e6:>10.0f} {uncached * 1e6:>10.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--exercises", type=int, default=30)
+    parser.add_argument("--sets", type=int, default=5)
+    parser.add_argument("--number", type=int, default=200)
+    arguments = parser.parse_args()
+
+    main(arguments.exercises, arguments.sets, arguments.number)
@@ -0,0 +1,138 @@
+"""
+Throughput of inserting 1k and 10k `exercise_set_results` rows the way the session results
+endpoint does (`insert_many_rows`), plan consistency triggers included.
+
+Needs a Postgres database migrated to head: the app's database by default, or an async URL
+passed with --database-url. Every run happens in a transaction that is rolled back, so
+nothing is left behind. To compare with the row-level triggers that migration 8d41e6b0a9f3
+replaced, run it once at `alembic downgrade 3f9a2c7d1b64` and once at head.
+
+Run from the repository root with the app settings available (`.env`); ENV=prod skips the
+Celery queue purge done on import in dev:
+
+    ENV=prod python -m benchmarks.set_result_inserts --rows 1000 10000 --repeat 3
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import app.main  # noqa: F401  (imports the routers before the repositories they depend on)
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.workouts.utils.ordering import POSITION_GAP
+from app.core.database import DATABASE_URL
+from app.models import (
+    Exercise,
+    ExercisePlan,
+    ExerciseResult,
+    ExerciseSetPlan,
+    User,
+    WorkoutPlan,
+    WorkoutSession,
+)
+from app.repositories.exercise_set_result_repository import ExerciseResultSetRepository
+
+
+async def _exercise_result(session: AsyncSession, rows: int) -> tuple[int, list[int]]:
+    """An exercise result and `rows` set plans of its exercise plan, the rows to insert refer to."""
+    user = User(
+        full_name="Insert benchmark",
+        email="insert-benchmark@example.com",
+        hashed_password="-",
+    )
+    exercise = Exercise(name="insert-benchmark", description="-")
+    session.add_all([user, exercise])
+    await session.flush()
+
+    workout_plan = WorkoutPlan(title="Insert benchmark", description="-", user_id=user.id)
+    session.add(workout_plan)
+    await session.flush()
+
+    exercise_plan = ExercisePlan(
+        exercise_id=exercise.id,
+        workout_plan_id=workout_plan.id,
+        position=POSITION_GAP,
+        target_sets=rows,
+    )
+    workout_session = WorkoutSession(user_id=user.id, workout_plan_id=workout_plan.id)
+    session.add_all([exercise_plan, workout_session])
+    await session.flush()
+
+    set_plan_ids = list(
+        await session.scalars(
+            insert(ExerciseSetPlan).returning(ExerciseSetPlan.id),
+            [
+                {
+                    "exercise_plan_id": exercise_plan.id,
+                    "position": (index + 1) * POSITION_GAP,
+                    "target_reps": 8,
+                    "target_weight": 60.0,
+                }
+                for index in range(rows)
+            ],
+        )
+    )
+
+    exercise_result = ExerciseResult(
+        sets_achieved=rows,
+        exercise_plan_id=exercise_plan.id,
+        exercise_id=exercise.id,
+        workout_session_id=workout_session.id,
+    )
+    session.add(exercise_result)
+    await session.flush()
+
+    return exercise_result.id, set_plan_ids
+
+
+async def _measure(session_maker: async_sessionmaker, rows: int) -> float:
+    async with session_maker() as session:
+        try:
+            exercise_result_id, set_plan_ids = await _exercise_result(session, rows)
+            set_rows = [
+                {
+                    "set_number": index + 1,
+                    "reps_achieved": 8,
+                    "weight_achieved": 60.0,
+                    "duration_seconds": 40,
+                    "rpe": 8,
+                    "exercise_set_plan_id": set_plan_id,
+                    "exercise_result_id": exercise_result_id,
+                }
+                for index, set_plan_id in enumerate(set_plan_ids)
+            ]
+
+            started = time.perf_counter()
+            # the statement-level triggers run before the INSERT returns
+            await ExerciseResultSetRepository(session).insert_many_rows(set_rows)
+            return time.perf_counter() - started
+        finally:
+            await session.rollback()
+
+
+async def main(database_url: str, row_counts: list[int], repeat: int) -> None:
+    engine = create_async_engine(database_url)
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    try:
+        print(f"{'rows':>7} {'ms (median)':>12} {'rows/s':>10}")
+        for rows in row_counts:
+            seconds = statistics.median(
+                [await _measure(session_maker, rows) for _ in range(repeat)]
+            )
+            print(f"{rows:>7} {seconds * 1000:>12.1f} {rows / seconds:>10.0f}")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args()
+
+    asyncio.run(main(arguments.database_url, arguments.rows, arguments.repeat))